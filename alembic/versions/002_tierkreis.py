@@ -0,0 +1,24 @@
+"""Tierkreis-Modus pro Bestellung (siderisch / konstellationen)
+
+Revision ID: 002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "bestellungen",
+        sa.Column("tierkreis", sa.String(20), server_default="siderisch"),
+    )
+
+
+def downgrade():
+    op.drop_column("bestellungen", "tierkreis")
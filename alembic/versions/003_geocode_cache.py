@@ -0,0 +1,30 @@
+"""Persistenter Geocoding-Cache (geocode_cache)
+
+Revision ID: 003
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "geocode_cache",
+        sa.Column("schluessel", sa.String(300), primary_key=True),
+        sa.Column("ort", sa.String(300), nullable=False),
+        sa.Column("lat", sa.Float, nullable=False),
+        sa.Column("lon", sa.Float, nullable=False),
+        sa.Column("timezone", sa.String(64), nullable=False),
+        sa.Column("ort_vollstaendig", sa.String(500), nullable=False),
+        sa.Column("erstellt_am", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+
+
+def downgrade():
+    op.drop_table("geocode_cache")
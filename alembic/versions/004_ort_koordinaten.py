@@ -0,0 +1,27 @@
+"""Aufgelöster Geburtsort pro Bestellung (Orts-ID, lat/lon, Zeitzone)
+
+Revision ID: 004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("bestellungen", sa.Column("ort_id", sa.String(320), nullable=True))
+    op.add_column("bestellungen", sa.Column("lat", sa.Float, nullable=True))
+    op.add_column("bestellungen", sa.Column("lon", sa.Float, nullable=True))
+    op.add_column("bestellungen", sa.Column("timezone", sa.String(64), nullable=True))
+
+
+def downgrade():
+    op.drop_column("bestellungen", "timezone")
+    op.drop_column("bestellungen", "lon")
+    op.drop_column("bestellungen", "lat")
+    op.drop_column("bestellungen", "ort_id")
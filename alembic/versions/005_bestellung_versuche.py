@@ -0,0 +1,29 @@
+"""Berechnungsversuche pro Bestellung (Zähler, Termin des nächsten Versuchs)
+
+Revision ID: 005
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "bestellungen",
+        sa.Column("versuche", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "bestellungen",
+        sa.Column("naechster_versuch", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("bestellungen", "naechster_versuch")
+    op.drop_column("bestellungen", "versuche")
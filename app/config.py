@@ -25,6 +25,68 @@ class Settings(BaseSettings):
     # PDF Output
     PDF_OUTPUT_DIR: str = "./output"
 
+    # Chart-Berechnung: "swisseph" (schlanke Engine) oder "kerykeion" (Referenz)
+    CHART_ENGINE: str = "swisseph"
+
+    # Ephemeride: "moshier" (analytisch, ohne Dateien) oder "files" (.se1)
+    EPHEMERIS_MODE: str = "moshier"
+    # Verzeichnis mit sepl_18.se1 / semo_18.se1 (leer = kerykeions sweph-Ordner)
+    EPHEMERIS_PATH: str = ""
+    # Dateien vorladen und Caches beim Start aufwärmen
+    EPHEMERIS_WARMUP: bool = True
+    # Chebyshev-Ephemeride (data/chebyshev.bin): Abstand zu einer Zeichen-/
+    # Gate-Grenze in Grad, unterhalb dessen swisseph entscheidet
+    CHEBYSHEV_TOLERANZ: float = 0.001
+    # Ephemeriden-Pool: Worker-Prozesse (0 = alle Kerne, -1 = ohne Pool im
+    # API-Prozess rechnen), wartende Aufgaben zusätzlich zu den laufenden,
+    # Sekunden Wartezeit auf einen freien Platz (danach 503)
+    EPHEMERIS_POOL_WORKERS: int = 0
+    EPHEMERIS_POOL_QUEUE: int = 64
+    EPHEMERIS_POOL_TIMEOUT: float = 30.0
+    # Bestellungen: Module (Tropisch, Siderisch, Sternbilder, Human Design)
+    # als gleichzeitige Pool-Aufgaben statt einer Aufgabe pro Bestellung
+    MODULE_PARALLEL: bool = False
+    # Gesamtfrist einer Bestellungs-Berechnung in Sekunden (Budgets je
+    # Modul: master_calculator.MODUL_BUDGETS)
+    BERECHNUNG_FRIST: float = 30.0
+    # Bestellungen: so viele Berechnungsversuche, solange nur Fristen/
+    # Budgets verpasst werden oder der Pool ausgelastet ist; Sekunden Pause
+    # (Status "wartend"); Threads für Bestellungen (nicht der Thread-Pool
+    # der Endpoints)
+    BESTELLUNG_VERSUCHE: int = 3
+    BESTELLUNG_PAUSE: float = 10.0
+    BESTELLUNG_WORKER: int = 4
+    # Zulassungskontrolle Gratis-Check: parallele Berechnungen (0 = so viele
+    # wie Pool-Worker), wartende Anfragen (darüber 429), Sekunden bis 503
+    GRATIS_PARALLEL: int = 0
+    GRATIS_WARTESCHLANGE: int = 100
+    GRATIS_WARTEZEIT: float = 2.0
+
+    # Geocoding: Offline-Ortsverzeichnis (leer = data/gazetteer.sqlite),
+    # Nominatim nur für Orte, die dort fehlen (False = nie online fragen)
+    GAZETTEER_PATH: str = ""
+    GEOCODING_NOMINATIM: bool = True
+    # LRU-Cache pro Prozess vor der Tabelle geocode_cache: maximale Anzahl
+    # Orte und MB; Sekunden bis zum Ablauf gefundener bzw. nicht gefundener
+    # Orte (0 = "nicht gefunden" nie cachen). Beim Start die so vielen
+    # häufigsten Geburtsorte der Bestellungen vorladen
+    GEOCODE_CACHE_GROESSE: int = 10000
+    GEOCODE_CACHE_MB: float = 16
+    GEOCODE_TTL: float = 30 * 86400
+    GEOCODE_TTL_NEGATIV: float = 3600
+    GEOCODE_VORLADEN: int = 2000
+    # Nominatim-Anfragen pro Sekunde und Prozess (Nutzungsrichtlinie: max. 1
+    # für alle zusammen), Burst, maximale Sekunden in der Warteschlange
+    NOMINATIM_RATE: float = 1.0
+    NOMINATIM_BURST: int = 1
+    NOMINATIM_WARTEZEIT: float = 10.0
+    # Bestellungen (Hintergrund, ohne Latenzanforderung) warten länger
+    BESTELLUNG_NOMINATIM_WARTEZEIT: float = 600.0
+    # Ortssuche (/api/orte/suggest): Präfix-Index beim Start aufbauen, dazu
+    # die so vielen häufigsten Geburtsorte der Bestellungen
+    ORTE_INDEX: bool = True
+    ORTE_INDEX_BESTELLUNGEN: int = 5000
+
     # App
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
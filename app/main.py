@@ -1,6 +1,7 @@
 """AstroMaster Backend — FastAPI Application."""
 
 import logging
+import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,7 +11,23 @@ from slowapi.errors import RateLimitExceeded
 from app.config import settings
 from app.database import Base, engine
 from app.dependencies import limiter
-from app.routers import admin, bestellung, checkout, gratis_check, health, stripe_webhook
+from app.modules.chart_context import set_default_engine
+from app.modules.chebyshev import configure_chebyshev, get_cache
+from app.modules.ephemeris import configure_ephemeris, preload_ephemeris_files, warm_up
+from app.modules.gazetteer import configure_gazetteer, get_gazetteer
+from app.modules.geocoding import configure_geocoding
+from app.modules.ingress_index import get_index
+from app.modules.timezones import preload_zones
+from app.modules.zodiac_index import get_zodiac_index
+from app.routers import admin, bestellung, checkout, gratis_check, health, orte, stripe_webhook
+from app.routers.bestellung import offene_bestellungen_einreihen
+from app.services.admission import configure_admission
+from app.services.auftraege import start_auftraege, stop_auftraege
+from app.services.calculation import DEFAULT_TZ
+from app.services.ephemeris_pool import get_pool, start_pool, stop_pool
+from app.services.geocode_cache import DatenbankSpeicher, geocode_cache_vorladen
+from app.services.gratis_table import get_table
+from app.services.orte import ort_index_laden
 
 # Logging
 logging.basicConfig(
@@ -47,9 +64,70 @@ app.include_router(bestellung.router)
 app.include_router(checkout.router)
 app.include_router(stripe_webhook.router)
 app.include_router(admin.router)
+app.include_router(orte.router)
 
 
 @app.on_event("startup")
 def on_startup():
-    """Erstellt DB-Tabellen beim Start (falls nicht vorhanden)."""
+    """Erstellt DB-Tabellen beim Start (falls nicht vorhanden), wärmt Ephemeride auf, startet Ephemeriden-Pool und Bestellungs-Threads."""
     Base.metadata.create_all(bind=engine)
+    set_default_engine(settings.CHART_ENGINE)
+    get_zodiac_index()
+
+    configure_ephemeris(settings.EPHEMERIS_MODE, settings.EPHEMERIS_PATH or None)
+    configure_chebyshev(settings.CHEBYSHEV_TOLERANZ)
+    configure_gazetteer(settings.GAZETTEER_PATH or None)
+    configure_geocoding(
+        settings.GEOCODING_NOMINATIM,
+        settings.GEOCODE_CACHE_GROESSE,
+        DatenbankSpeicher(),
+        cache_mb=settings.GEOCODE_CACHE_MB,
+        ttl=settings.GEOCODE_TTL,
+        ttl_negativ=settings.GEOCODE_TTL_NEGATIV,
+        nominatim_rate=settings.NOMINATIM_RATE,
+        nominatim_burst=settings.NOMINATIM_BURST,
+        nominatim_wartezeit=settings.NOMINATIM_WARTEZEIT,
+    )
+    get_gazetteer()
+    geocode_cache_vorladen(min(settings.GEOCODE_VORLADEN, settings.GEOCODE_CACHE_GROESSE))
+    if settings.ORTE_INDEX:
+        ort_index_laden(settings.ORTE_INDEX_BESTELLUNGEN)
+    if settings.EPHEMERIS_WARMUP:
+        preload_ephemeris_files()
+        warm_up()
+        get_index()
+        get_cache()
+        get_table()
+        preload_zones([DEFAULT_TZ])
+
+    if settings.EPHEMERIS_POOL_WORKERS >= 0:
+        start_pool(
+            settings.EPHEMERIS_POOL_WORKERS,
+            settings.EPHEMERIS_POOL_QUEUE,
+            settings.EPHEMERIS_POOL_TIMEOUT,
+            {
+                "engine": settings.CHART_ENGINE,
+                "ephemeris_modus": settings.EPHEMERIS_MODE,
+                "ephemeris_pfad": settings.EPHEMERIS_PATH or None,
+                "chebyshev_toleranz": settings.CHEBYSHEV_TOLERANZ,
+                "aufwaermen": settings.EPHEMERIS_WARMUP,
+                "log_level": logging.DEBUG if settings.DEBUG else logging.INFO,
+            },
+        )
+
+    pool = get_pool()
+    configure_admission(
+        settings.GRATIS_PARALLEL or (pool.worker if pool else os.cpu_count() or 1),
+        settings.GRATIS_WARTESCHLANGE,
+        settings.GRATIS_WARTEZEIT,
+    )
+
+    start_auftraege(max(settings.BESTELLUNG_WORKER, 1))
+    offene_bestellungen_einreihen()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Beendet Bestellungs-Threads und die Worker-Prozesse des Ephemeriden-Pools."""
+    stop_auftraege()
+    stop_pool()
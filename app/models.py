@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Float, String, Text, text
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,7 +21,14 @@ class Bestellung(Base):
     geburtsdatum: Mapped[str] = mapped_column(String(10), nullable=False)  # DD.MM.YYYY
     geburtszeit: Mapped[str] = mapped_column(String(5), nullable=False)  # HH:MM
     geburtsort: Mapped[str] = mapped_column(String(300), nullable=False)
+    # Bereits aufgelöster Ort (Orts-ID / Koordinaten aus dem Formular) — dann ohne Geocoding
+    ort_id: Mapped[str | None] = mapped_column(String(320), nullable=True)
+    lat: Mapped[float | None] = mapped_column(Float, nullable=True)
+    lon: Mapped[float | None] = mapped_column(Float, nullable=True)
+    timezone: Mapped[str | None] = mapped_column(String(64), nullable=True)
     version: Mapped[str] = mapped_column(String(20), default="normal")
+    tierkreis: Mapped[str] = mapped_column(String(20), default="siderisch")  # oder "konstellationen"
+    # neu → berechne → fertig | fehler; wartend = nächster Versuch geplant
     status: Mapped[str] = mapped_column(String(20), default="neu")
     preis: Mapped[float] = mapped_column(Float, default=39.0)
 
@@ -34,6 +41,8 @@ class Bestellung(Base):
     pdf_pfad: Mapped[str | None] = mapped_column(String(500), nullable=True)
     email_gesendet: Mapped[bool] = mapped_column(Boolean, default=False)
     fehler_nachricht: Mapped[str | None] = mapped_column(Text, nullable=True)
+    versuche: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    naechster_versuch: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Timestamps
     erstellt_am: Mapped[datetime] = mapped_column(
@@ -67,3 +76,22 @@ class GratisCheck(Base):
         default=lambda: datetime.now(timezone.utc),
         server_default=text("now()"),
     )
+
+
+class GeocodeCache(Base):
+    """Geocoding-Ergebnisse (Nominatim), geteilt von allen Workern und Deployments."""
+
+    __tablename__ = "geocode_cache"
+
+    schluessel: Mapped[str] = mapped_column(String(300), primary_key=True)  # cache_schluessel()
+    ort: Mapped[str] = mapped_column(String(300), nullable=False)  # erste Eingabe
+    lat: Mapped[float] = mapped_column(Float, nullable=False)
+    lon: Mapped[float] = mapped_column(Float, nullable=False)
+    timezone: Mapped[str] = mapped_column(String(64), nullable=False)
+    ort_vollstaendig: Mapped[str] = mapped_column(String(500), nullable=False)
+
+    erstellt_am: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=text("now()"),
+    )
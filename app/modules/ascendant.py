@@ -0,0 +1,115 @@
+"""
+SyncMaster — Aszendent (geschlossene Formel, vektorisierbar)
+
+Der Aszendent ist der einzige häuserabhängige Wert in Normal-Report und
+Gratis-Check. Er folgt direkt aus lokaler Sternzeit (RAMC), Schiefe der
+Ekliptik und geographischer Breite — ohne Häusersystem-Berechnung:
+
+    ASC = atan2(cos RAMC, −(sin RAMC · cos ε + tan φ · sin ε))
+
+Sternzeit: IAU-1982-GMST + Gleichung der Äquinoktien.
+Schiefe: mittlere Schiefe (IAU) + Nutation (vier Hauptterme, ~0.5″).
+Abweichung gegenüber swisseph/kerykeion: < 0.002° bis 65° Breite.
+
+Polwärts davon wird die Formel instabil (der Aszendent läuft nahe dem
+Polarkreis beliebig schnell), und jenseits der Polarkreise liefert sie
+für einen Teil der Zeitpunkte den Deszendenten (um 180° gedreht). Dort
+rechnet swisseph (swe.houses_ex, gleichmäßige Häuser — der Aszendent
+hängt nicht vom Häusersystem ab, Placidus ist am Pol nicht definiert).
+kerykeion begrenzt die Breite auf 66° und weicht dort von beiden ab.
+
+ascendant() rechnet Skalare mit math (schneller als swe.houses_ex),
+ascendant_batch() dieselbe Formel auf NumPy-Arrays.
+"""
+
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import swisseph as swe
+
+_J2000 = 2451545.0
+_JAHRHUNDERT = 36525.0
+_ARCSEC = 1.0 / 3600.0
+
+# Ab dieser Breite (Betrag) rechnet swisseph statt der geschlossenen Formel
+_MAX_BREITE = 65.0
+
+# Gleiche Formeln für Skalare (math) und Arrays (NumPy)
+_NP = SimpleNamespace(
+    sin=np.sin, cos=np.cos, tan=np.tan, atan2=np.arctan2,
+    radians=np.radians, degrees=np.degrees,
+)
+
+
+def _nutation(t, xp):
+    """Nutation in Länge und Schiefe (Grad) aus den vier Haupttermen."""
+    omega = xp.radians(125.04452 - 1934.136261 * t)
+    l_sonne = xp.radians(280.4665 + 36000.7698 * t)
+    l_mond = xp.radians(218.3165 + 481267.8813 * t)
+
+    dpsi = (
+        -17.20 * xp.sin(omega) - 1.32 * xp.sin(2 * l_sonne)
+        - 0.23 * xp.sin(2 * l_mond) + 0.21 * xp.sin(2 * omega)
+    ) * _ARCSEC
+    deps = (
+        9.20 * xp.cos(omega) + 0.57 * xp.cos(2 * l_sonne)
+        + 0.10 * xp.cos(2 * l_mond) - 0.09 * xp.cos(2 * omega)
+    ) * _ARCSEC
+    return dpsi, deps
+
+
+def _ramc_und_schiefe(jd, lon, xp):
+    """Lokale scheinbare Sternzeit (RAMC) und wahre Schiefe, beide in Grad."""
+    d = jd - _J2000
+    t = d / _JAHRHUNDERT
+    dpsi, deps = _nutation(t, xp)
+
+    eps = (84381.448 - 46.8150 * t - 0.00059 * t**2 + 0.001813 * t**3) * _ARCSEC + deps
+    gmst = 280.46061837 + 360.98564736629 * d + 0.000387933 * t**2 - t**3 / 38710000.0
+    gast = gmst + dpsi * xp.cos(xp.radians(eps))
+    return (gast + lon) % 360.0, eps
+
+
+def _ascendant(jd, lat, lon, xp):
+    ramc, eps = _ramc_und_schiefe(jd, lon, xp)
+    ramc, eps, phi = xp.radians(ramc), xp.radians(eps), xp.radians(lat)
+    asc = xp.atan2(
+        xp.cos(ramc),
+        -(xp.sin(ramc) * xp.cos(eps) + xp.tan(phi) * xp.sin(eps)),
+    )
+    return xp.degrees(asc) % 360.0
+
+
+def _ascendant_swisseph(julian_day: float, lat: float, lon: float) -> float:
+    return swe.houses_ex(julian_day, lat, lon, b"E")[1][0]
+
+
+def ascendant(julian_day: float, lat: float, lon: float) -> float:
+    """
+    Tropischer Aszendent (ekliptische Länge 0–360°) für einen Zeitpunkt.
+    Über 65° Breite aus swisseph.
+
+    Args:
+        julian_day: Julianischer Tag (UT)
+        lat, lon: Geographische Breite/Länge in Grad
+    """
+    if abs(lat) > _MAX_BREITE:
+        return _ascendant_swisseph(julian_day, lat, lon)
+    return _ascendant(julian_day, lat, lon, math)
+
+
+def ascendant_batch(julian_days, lats, lons) -> np.ndarray:
+    """Tropischer Aszendent für viele Zeitpunkte/Orte (Arrays oder Skalare)."""
+    jd, lat, lon = np.broadcast_arrays(
+        np.asarray(julian_days, dtype="f8"),
+        np.asarray(lats, dtype="f8"),
+        np.asarray(lons, dtype="f8"),
+    )
+    asc = np.asarray(_ascendant(jd, lat, lon, _NP))
+    polar = np.abs(lat) > _MAX_BREITE
+    if polar.any():
+        asc = asc.copy()
+        for i in map(tuple, np.argwhere(polar)):
+            asc[i] = _ascendant_swisseph(float(jd[i]), float(lat[i]), float(lon[i]))
+    return asc
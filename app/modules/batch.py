@@ -0,0 +1,211 @@
+"""
+SyncMaster — Batch-Berechnung (NumPy)
+
+Berechnet viele Geburtsmomente auf einmal, z.B. für Backfills, Auswertungen
+über die gratis_checks-Tabelle oder Partner-Massenanfragen.
+
+swisseph selbst kennt keine Vektor-API — die Ephemeriden-Aufrufe laufen
+in einer engen Schleife ohne Objekt-Erzeugung. Der Aszendent (geschlossene
+Formel, ascendant.py) und alles danach (Zeichen, Element, Dekan,
+Ophiuchus) sind vektorisierte Array-Operationen.
+
+Ergebnis ist ein strukturiertes NumPy-Array (eine Zeile pro Eingabe);
+die Codes lassen sich über ZEICHEN_NAMEN / ELEMENT_NAMEN zurückübersetzen.
+"""
+
+import logging
+
+import numpy as np
+import swisseph as swe
+
+from .ascendant import ascendant_batch
+from .elements import ELEMENTS
+from .ephemeris import SIDEREAL_MODES, ensure_ephe_path, get_flags
+from .sidereal import get_standard_ayanamsa
+from .zodiac_index import ZEICHEN, get_zodiac_index
+
+logger = logging.getLogger(__name__)
+
+# Code → Name (Zeichen 0–11 in Tierkreis-Reihenfolge, Elemente wie in ELEMENTS)
+ZEICHEN_NAMEN = np.array(ZEICHEN)
+ELEMENT_NAMEN = np.array(list(ELEMENTS))
+
+SIDEREAL_DTYPE = np.dtype([
+    ("julian_day", "f8"),
+    ("ayanamsa", "f8"),
+    ("sonne", "f8"),
+    ("mond", "f8"),
+    ("aszendent", "f8"),
+    ("sonne_zeichen", "i1"),
+    ("mond_zeichen", "i1"),
+    ("aszendent_zeichen", "i1"),
+    ("sonne_ophiuchus", "?"),
+    ("mond_ophiuchus", "?"),
+    ("aszendent_ophiuchus", "?"),
+    ("element", "i1"),
+    ("dekan", "i1"),
+])
+
+TROPICAL_DTYPE = np.dtype([
+    ("julian_day", "f8"),
+    ("sonne", "f8"),
+    ("mond", "f8"),
+    ("aszendent", "f8"),
+    ("sonne_zeichen", "i1"),
+    ("mond_zeichen", "i1"),
+    ("aszendent_zeichen", "i1"),
+])
+
+_UNIX_EPOCH_JD = 2440587.5
+
+
+def julian_days_from_utc(utc) -> np.ndarray:
+    """
+    Wandelt UTC-Zeitpunkte (datetime64-Array, z.B. aus einer DB-Spalte) in
+    Julianische Tage um — vektorisiert.
+    """
+    sekunden = np.asarray(utc, dtype="datetime64[s]").astype("i8")
+    return sekunden / 86400.0 + _UNIX_EPOCH_JD
+
+
+def _grad360(lon: np.ndarray) -> np.ndarray:
+    """Länge auf [0, 360) normieren (np.mod(-1e-14, 360.0) == 360.0)."""
+    lon = np.mod(lon, 360.0)
+    return np.where(lon >= 360.0, 0.0, lon)
+
+
+def zeichen_code(longitudes: np.ndarray) -> np.ndarray:
+    """Ekliptische Länge → Zeichen-Code 0–11 (NaN → -1)."""
+    lon = np.asarray(longitudes, dtype="f8")
+    codes = np.floor(_grad360(lon) / 30.0)
+    return np.where(np.isnan(lon), -1, codes).astype(np.int8)
+
+
+def ophiuchus_maske(longitudes: np.ndarray) -> np.ndarray:
+    """True für siderische Längen in der Ophiuchus-Zone (config/ophiuchus.yaml)."""
+    return get_zodiac_index().ophiuchus_maske(longitudes)
+
+
+def dekan_nummer(longitudes: np.ndarray) -> np.ndarray:
+    """Siderische Länge → absolute Dekan-Nummer 1–36 (wie get_dekan, 12 Zeichen)."""
+    return get_zodiac_index().dekan_nummern(longitudes)
+
+
+def _broadcast(julian_days, lats, lons):
+    """Zeitpunkte und Koordinaten gemeinsam broadcasten (z.B. ein Zeitpunkt, viele Orte)."""
+    jd = np.atleast_1d(np.asarray(julian_days, dtype="f8"))
+    if lats is None or lons is None:
+        return jd, None, None
+    try:
+        jd, lat, lon = np.broadcast_arrays(
+            jd, np.asarray(lats, dtype="f8"), np.asarray(lons, dtype="f8"),
+        )
+    except ValueError:
+        raise ValueError(
+            f"julian_days {jd.shape}, lats {np.shape(lats)} und lons {np.shape(lons)} "
+            "passen nicht zusammen"
+        ) from None
+    if jd.ndim != 1:
+        raise ValueError(f"Batch erwartet eindimensionale Arrays, nicht {jd.shape}")
+    return jd, lat, lon
+
+
+def _tropical_longitudes(jd, lat, lon):
+    """Tropische Sonne, Mond, Aszendent (NaN ohne Koordinaten) als Arrays."""
+    ensure_ephe_path()
+    n = jd.shape[0]
+    sonne = np.empty(n)
+    mond = np.empty(n)
+
+    calc_ut, flags = swe.calc_ut, get_flags()
+    for i in range(n):
+        t = jd[i]
+        sonne[i] = calc_ut(t, swe.SUN, flags)[0][0]
+        mond[i] = calc_ut(t, swe.MOON, flags)[0][0]
+
+    if lat is None:
+        aszendent = np.full(n, np.nan)
+    else:
+        aszendent = _grad360(ascendant_batch(jd, lat, lon))
+
+    return sonne, mond, aszendent
+
+
+def ayanamsa_batch(julian_days, sidereal_mode: str | None = None) -> np.ndarray:
+    """Ayanamsa (inkl. Nutation) für viele Zeitpunkte."""
+    jd = np.atleast_1d(np.asarray(julian_days, dtype="f8"))
+    ensure_ephe_path()
+    swe.set_sid_mode(SIDEREAL_MODES[sidereal_mode or get_standard_ayanamsa()])
+    get_ayanamsa, flags = swe.get_ayanamsa_ex_ut, get_flags()
+    return np.fromiter((get_ayanamsa(t, flags)[1] for t in jd), dtype="f8", count=jd.shape[0])
+
+
+def calculate_tropical_batch(julian_days, lats=None, lons=None) -> np.ndarray:
+    """
+    Tropische Positionen für viele Geburtsmomente.
+
+    Args:
+        julian_days: Array Julianischer Tage (UT) oder Skalar (ein Zeitpunkt, viele Orte)
+        lats, lons: Arrays oder Skalare; None = ohne Aszendent (NaN, Zeichen -1)
+
+    Returns:
+        Strukturiertes Array mit TROPICAL_DTYPE
+    """
+    jd, lat, lon = _broadcast(julian_days, lats, lons)
+    sonne, mond, aszendent = _tropical_longitudes(jd, lat, lon)
+
+    result = np.empty(jd.shape[0], dtype=TROPICAL_DTYPE)
+    result["julian_day"] = jd
+    result["sonne"] = sonne
+    result["mond"] = mond
+    result["aszendent"] = aszendent
+    result["sonne_zeichen"] = zeichen_code(sonne)
+    result["mond_zeichen"] = zeichen_code(mond)
+    result["aszendent_zeichen"] = zeichen_code(aszendent)
+    return result
+
+
+def calculate_sidereal_batch(
+    julian_days,
+    lats=None,
+    lons=None,
+    sidereal_mode: str | None = None,
+) -> np.ndarray:
+    """
+    Siderische Positionen (tropisch − Ayanamsa) für viele Geburtsmomente.
+
+    Args:
+        julian_days: Array Julianischer Tage (UT) oder Skalar (ein Zeitpunkt, viele Orte)
+        lats, lons: Arrays oder Skalare; None = ohne Aszendent (NaN, Zeichen -1)
+        sidereal_mode: z.B. "LAHIRI"; None = config/ayanamsa.yaml
+
+    Returns:
+        Strukturiertes Array mit SIDEREAL_DTYPE (Element und Dekan
+        basierend auf der siderischen Sonne, wie in calculate_all)
+    """
+    jd, lat, lon = _broadcast(julian_days, lats, lons)
+    sonne, mond, aszendent = _tropical_longitudes(jd, lat, lon)
+    ayanamsa = ayanamsa_batch(jd, sidereal_mode)
+
+    sonne = _grad360(sonne - ayanamsa)
+    mond = _grad360(mond - ayanamsa)
+    aszendent = _grad360(aszendent - ayanamsa)
+
+    result = np.empty(jd.shape[0], dtype=SIDEREAL_DTYPE)
+    result["julian_day"] = jd
+    result["ayanamsa"] = ayanamsa
+    result["sonne"] = sonne
+    result["mond"] = mond
+    result["aszendent"] = aszendent
+    result["sonne_zeichen"] = zeichen_code(sonne)
+    result["mond_zeichen"] = zeichen_code(mond)
+    result["aszendent_zeichen"] = zeichen_code(aszendent)
+    index = get_zodiac_index()
+    result["sonne_ophiuchus"] = index.ophiuchus_maske(sonne)
+    result["mond_ophiuchus"] = index.ophiuchus_maske(mond)
+    result["aszendent_ophiuchus"] = index.ophiuchus_maske(aszendent)
+    result["element"] = index.element_codes(sonne)
+    result["dekan"] = index.dekan_nummern(sonne)
+
+    logger.info("Siderisch (Batch): %d Geburtsmomente berechnet", jd.shape[0])
+    return result
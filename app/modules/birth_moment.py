@@ -0,0 +1,121 @@
+"""
+SyncMaster — Geburtsmoment (kanonisches Wertobjekt)
+
+Datum, Uhrzeit, Ort und Zeitzone werden einmal pro Request geparst und
+aufgelöst (UTC-Zeitpunkt, Julianischer Tag). Alle Module bekommen danach
+denselben BirthMoment statt der Strings "DD.MM.YYYY" / "HH:MM".
+
+BirthMoment ist unveränderlich und hashbar — er taugt als Schlüssel für
+jeden Cache im Berechnungs-Stack.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from .timezones import local_to_utc, utc_seconds_to_julian_day
+
+
+def parse_datum(geburtsdatum: str) -> date:
+    """
+    "DD.MM.YYYY" → date.
+
+    Raises:
+        ValueError: Bei falschem Format oder ungültigem Datum.
+    """
+    parts = geburtsdatum.split(".")
+    if len(parts) != 3 or len(parts[0]) != 2 or len(parts[1]) != 2 or len(parts[2]) != 4:
+        raise ValueError("Format muss DD.MM.YYYY sein")
+    if not all(p.isdigit() for p in parts):
+        raise ValueError("Format muss DD.MM.YYYY sein")
+    try:
+        return date(int(parts[2]), int(parts[1]), int(parts[0]))
+    except ValueError:
+        raise ValueError("Ungültiges Datum")
+
+
+def parse_zeit(geburtszeit: str) -> time:
+    """
+    "HH:MM" → time.
+
+    Raises:
+        ValueError: Bei falschem Format oder ungültiger Uhrzeit.
+    """
+    parts = geburtszeit.split(":")
+    if len(parts) != 2 or not parts[0].isdigit() or not parts[1].isdigit():
+        raise ValueError("Format muss HH:MM sein")
+    h, m = int(parts[0]), int(parts[1])
+    if not (0 <= h <= 23 and 0 <= m <= 59):
+        raise ValueError("Ungültige Uhrzeit")
+    return time(h, m)
+
+
+@dataclass(frozen=True, slots=True)
+class BirthMoment:
+    """Ein aufgelöster Geburtsmoment (Ortszeit, Ort, UTC, Julianischer Tag)."""
+
+    jahr: int
+    monat: int
+    tag: int
+    stunde: int
+    minute: int
+    lat: float
+    lon: float
+    timezone: str
+    utc: datetime
+    julian_day: float
+
+    @classmethod
+    def create(
+        cls,
+        datum: date,
+        zeit: time,
+        lat: float,
+        lon: float,
+        timezone: str,
+    ) -> "BirthMoment":
+        """
+        Löst Ortszeit + Zone einmal nach UTC auf.
+
+        Raises:
+            ValueError: Bei mehrdeutiger oder nicht existierender Ortszeit.
+        """
+        utc_sekunden = local_to_utc(
+            datum.year, datum.month, datum.day, zeit.hour, zeit.minute, timezone,
+        )
+        return cls(
+            jahr=datum.year,
+            monat=datum.month,
+            tag=datum.day,
+            stunde=zeit.hour,
+            minute=zeit.minute,
+            lat=lat,
+            lon=lon,
+            timezone=timezone,
+            utc=datetime.fromtimestamp(utc_sekunden, dt_timezone.utc),
+            julian_day=utc_seconds_to_julian_day(utc_sekunden),
+        )
+
+    @classmethod
+    def from_strings(
+        cls,
+        geburtsdatum: str,
+        geburtszeit: str,
+        lat: float,
+        lon: float,
+        timezone: str,
+    ) -> "BirthMoment":
+        """Wie create(), aus "DD.MM.YYYY" und "HH:MM"."""
+        return cls.create(parse_datum(geburtsdatum), parse_zeit(geburtszeit), lat, lon, timezone)
+
+    @property
+    def datum(self) -> date:
+        return date(self.jahr, self.monat, self.tag)
+
+    @property
+    def zeit(self) -> time:
+        return time(self.stunde, self.minute)
+
+    @property
+    def geburtsdatum(self) -> str:
+        """Datum im API-Format DD.MM.YYYY."""
+        return f"{self.tag:02d}.{self.monat:02d}.{self.jahr:04d}"
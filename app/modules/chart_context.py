@@ -0,0 +1,179 @@
+"""
+SyncMaster — Chart-Kontext
+
+Gemeinsamer Chart-Speicher für alle Module einer Berechnung.
+Jedes eindeutige Chart wird pro Berechnung nur einmal erstellt.
+
+Schlüssel: (UTC-Zeitpunkt, lat, lon, Zodiak-Modus). Tropisch, Siderisch
+und Human Design fordern ihre Charts über denselben Kontext an. Dadurch
+werden identische tropische Charts nicht mehrfach berechnet.
+
+Ein Kontext lebt nur für eine Berechnung (calculate_all oder Gratis-Check)
+und wird danach verworfen — kein globaler Zustand.
+
+Backends:
+    "swisseph"  — schlanke Engine aus ephemeris.py (Standard)
+    "kerykeion" — AstrologicalSubjectFactory (Referenz-Implementierung)
+"""
+
+import logging
+
+from kerykeion import AstrologicalSubjectFactory
+
+from .birth_moment import BirthMoment
+from .ephemeris import compute_chart, invalidate_ephe_path, julian_day_to_utc, local_to_julian_day
+
+logger = logging.getLogger(__name__)
+
+ENGINE_SWISSEPH = "swisseph"
+ENGINE_KERYKEION = "kerykeion"
+ENGINES = (ENGINE_SWISSEPH, ENGINE_KERYKEION)
+
+_default_engine = ENGINE_SWISSEPH
+
+
+def set_default_engine(engine: str) -> None:
+    """Setzt das Standard-Backend für neue Kontexte (z.B. aus Settings)."""
+    global _default_engine
+    if engine not in ENGINES:
+        raise ValueError(f"Unbekannte Chart-Engine: '{engine}'. Erlaubt: {ENGINES}")
+    _default_engine = engine
+
+
+class ChartContext:
+    """Cache für Charts innerhalb einer einzelnen Berechnung."""
+
+    def __init__(self, engine: str | None = None):
+        self.engine = engine or _default_engine
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unbekannte Chart-Engine: '{self.engine}'")
+        self._charts: dict[tuple, object] = {}
+        self._mondknoten: dict[float, float] = {}
+        self.erstellt = 0
+        self.wiederverwendet = 0
+
+    def chart(
+        self,
+        jahr: int,
+        monat: int,
+        tag: int,
+        stunde: int,
+        minute: int,
+        lat: float,
+        lon: float,
+        timezone: str,
+        zodiac_type: str = "Tropical",
+        sidereal_mode: str | None = None,
+    ):
+        """
+        Gibt das Chart für Zeitpunkt, Ort und Zodiak-Modus zurück.
+
+        Args:
+            jahr, monat, tag, stunde, minute: Lokale Geburtszeit
+            lat, lon: Koordinaten
+            timezone: IANA Timezone
+            zodiac_type: "Tropical" oder "Sidereal"
+            sidereal_mode: z.B. "LAHIRI" (nur bei Sidereal)
+
+        Returns:
+            EphemerisChart oder kerykeion AstrologicalSubjectModel
+            (gleiche Attribute: sun, moon, ascendant, ...)
+        """
+        julian_day = local_to_julian_day(jahr, monat, tag, stunde, minute, timezone)
+        kerykeion_zeit = (jahr, monat, tag, stunde, minute, 0, timezone)
+        return self._chart(julian_day, lat, lon, zodiac_type, sidereal_mode, kerykeion_zeit)
+
+    def chart_for(
+        self,
+        moment: BirthMoment,
+        zodiac_type: str = "Tropical",
+        sidereal_mode: str | None = None,
+    ):
+        """Wie chart(), für einen bereits aufgelösten Geburtsmoment."""
+        kerykeion_zeit = (
+            moment.jahr, moment.monat, moment.tag, moment.stunde, moment.minute, 0,
+            moment.timezone,
+        )
+        return self._chart(
+            moment.julian_day, moment.lat, moment.lon, zodiac_type, sidereal_mode, kerykeion_zeit,
+        )
+
+    def chart_at(
+        self,
+        julian_day: float,
+        lat: float,
+        lon: float,
+        zodiac_type: str = "Tropical",
+        sidereal_mode: str | None = None,
+    ):
+        """
+        Wie chart(), aber für einen Julianischen Tag (UT) — z.B. den
+        exakten Design-Moment im Human Design.
+        """
+        utc = julian_day_to_utc(julian_day)
+        kerykeion_zeit = (utc.year, utc.month, utc.day, utc.hour, utc.minute, utc.second, "UTC")
+        return self._chart(julian_day, lat, lon, zodiac_type, sidereal_mode, kerykeion_zeit)
+
+    def mondknoten(self, julian_day: float) -> float:
+        """
+        Mittlerer Mondknoten (tropische Länge) zu einem Julianischen Tag.
+
+        Nicht in den Standard-Punkten der Charts (kerykeion liefert nur den
+        wahren Knoten); der mittlere Knoten ist eine reine Formel und für
+        beide Engines identisch — daher immer aus swisseph.
+        """
+        knoten = self._mondknoten.get(julian_day)
+        if knoten is None:
+            chart = compute_chart(julian_day, bodies=("mean_north_lunar_node",), ascendant=False)
+            knoten = self._mondknoten[julian_day] = chart.mean_north_lunar_node.abs_pos
+        return knoten
+
+    def _chart(self, julian_day, lat, lon, zodiac_type, sidereal_mode, kerykeion_zeit):
+        key = (julian_day, lat, lon, zodiac_type, sidereal_mode)
+
+        subject = self._charts.get(key)
+        if subject is not None:
+            self.wiederverwendet += 1
+            return subject
+
+        if self.engine == ENGINE_SWISSEPH:
+            subject = compute_chart(
+                julian_day, lat, lon,
+                sidereal_mode=sidereal_mode if zodiac_type == "Sidereal" else None,
+            )
+        else:
+            subject = self._kerykeion_chart(
+                *kerykeion_zeit, lat, lon, zodiac_type, sidereal_mode,
+            )
+            invalidate_ephe_path()
+
+        self._charts[key] = subject
+        self.erstellt += 1
+        logger.debug("Chart erstellt (%s): %s", self.engine, key)
+        return subject
+
+    @staticmethod
+    def _kerykeion_chart(
+        jahr, monat, tag, stunde, minute, sekunde, timezone, lat, lon,
+        zodiac_type, sidereal_mode,
+    ):
+        """Referenz-Chart über kerykeion."""
+        kwargs = {}
+        if sidereal_mode is not None:
+            kwargs["sidereal_mode"] = sidereal_mode
+
+        return AstrologicalSubjectFactory.from_birth_data(
+            name="Chart",
+            year=jahr,
+            month=monat,
+            day=tag,
+            hour=stunde,
+            minute=minute,
+            seconds=sekunde,
+            lng=lon,
+            lat=lat,
+            tz_str=timezone,
+            zodiac_type=zodiac_type,
+            online=False,
+            **kwargs,
+        )
@@ -0,0 +1,269 @@
+"""
+SyncMaster — Chebyshev-Ephemeride für Sonne, Mond und Ayanamsa (1900–2030)
+
+Die tropischen Längen von Sonne und Mond sowie das Lahiri-Ayanamsa werden
+abschnittsweise als Chebyshev-Polynome gespeichert (Sonne/Ayanamsa: 16 Tage,
+Mond: 4 Tage; ~1.5 MB). Eine Auswertung sind ein Dutzend Multiplikationen
+(Clenshaw) — ohne swisseph-Aufruf und ohne dessen globalen Zustand
+(Ephemeriden-Pfad, Sidereal-Modus). Abweichung zu swisseph: < 0.01″.
+
+Liegt ein Wert näher als die Toleranz an einer Grenze (Zeichen, Gate,
+Ophiuchus), entscheidet der Aufrufer per nahe_grenze()/nahe_raster()
+und fällt für diesen Fall auf swisseph zurück.
+
+Erzeugen (einmalig, z.B. beim Docker-Build):
+    python -m app.modules.chebyshev [pfad]
+
+Dateiformat (little-endian, per mmap geladen):
+    Header: b"AMCB" | u32 version | u32 anzahl_serien
+    Serie:  16s name | f64 start_jd | f64 intervall | u32 grad | u32 n | u64 offset
+    Daten:  f64 koeffizienten[n][grad + 1]
+"""
+
+import bisect
+import logging
+import math
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import swisseph as swe
+
+from .ephemeris import SIDEREAL_MODES, ensure_ephe_path, get_flags
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "chebyshev.bin"
+
+# Abgedeckter Zeitraum (wie ingress_index), mit Rand
+START_JD = swe.julday(1899, 12, 1, 0.0)
+END_JD = swe.julday(2031, 2, 1, 0.0)
+
+SERIE_SONNE = "sun"
+SERIE_MOND = "moon"
+SERIE_AYANAMSA = "ayanamsa_lahiri"
+
+# Serie → (Intervall in Tagen, Polynomgrad)
+_SERIEN = {
+    SERIE_SONNE: (16.0, 8),
+    SERIE_MOND: (4.0, 10),
+    SERIE_AYANAMSA: (16.0, 8),
+}
+
+# Standard-Toleranz für den swisseph-Fallback an Grenzen (Grad, ~3.6″)
+TOLERANZ = 1e-3
+
+_MAGIC = b"AMCB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+_SERIE = struct.Struct("<16sddIIQ")
+
+_toleranz = TOLERANZ
+
+
+def configure_chebyshev(toleranz: float) -> None:
+    """Setzt die Grenz-Toleranz (Grad), ab der auf swisseph zurückgefallen wird."""
+    global _toleranz
+    if toleranz < 0:
+        raise ValueError(f"Toleranz muss >= 0 sein: {toleranz}")
+    _toleranz = toleranz
+
+
+def get_toleranz() -> float:
+    """Aktuelle Grenz-Toleranz in Grad."""
+    return _toleranz
+
+
+# ─── Erzeugen ───
+
+def _funktion(serie: str):
+    """swisseph-Referenz einer Serie (JD → Grad)."""
+    flags = get_flags()
+    if serie == SERIE_SONNE:
+        return lambda jd: swe.calc_ut(jd, swe.SUN, flags)[0][0]
+    if serie == SERIE_MOND:
+        return lambda jd: swe.calc_ut(jd, swe.MOON, flags)[0][0]
+    swe.set_sid_mode(SIDEREAL_MODES["LAHIRI"])
+    return lambda jd: swe.get_ayanamsa_ex_ut(jd, flags)[1]
+
+
+def _fit(funktion, start: float, intervall: float, grad: int) -> np.ndarray:
+    """Chebyshev-Interpolation an den Gauss-Knoten eines Abschnitts."""
+    n = grad + 1
+    theta = np.pi * (np.arange(n) + 0.5) / n
+    jds = start + (np.cos(theta) + 1.0) * 0.5 * intervall
+    werte = np.degrees(np.unwrap(np.radians([funktion(jd) for jd in jds])))
+    koeffizienten = 2.0 / n * np.cos(np.outer(np.arange(n), theta)) @ werte
+    koeffizienten[0] *= 0.5
+    return koeffizienten
+
+
+def build_cache(path: Path = CACHE_PATH) -> Path:
+    """Erzeugt die Koeffizienten-Datei für alle Serien aus swisseph."""
+    ensure_ephe_path()
+    serien = []
+    for name, (intervall, grad) in _SERIEN.items():
+        funktion = _funktion(name)
+        n = math.ceil((END_JD - START_JD) / intervall)
+        koeffizienten = np.array(
+            [_fit(funktion, START_JD + i * intervall, intervall, grad) for i in range(n)]
+        )
+        serien.append((name, intervall, grad, koeffizienten))
+        logger.info("Chebyshev: %s → %d Abschnitte à %.0f Tage, Grad %d", name, n, intervall, grad)
+
+    offset = _HEADER.size + _SERIE.size * len(serien)
+    kopf = [_HEADER.pack(_MAGIC, _VERSION, len(serien))]
+    daten = []
+    for name, intervall, grad, koeffizienten in serien:
+        kopf.append(_SERIE.pack(
+            name.encode(), START_JD, intervall, grad, len(koeffizienten), offset,
+        ))
+        block = koeffizienten.astype("<f8").tobytes()
+        daten.append(block)
+        offset += len(block)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"".join(kopf + daten))
+
+    logger.info("Chebyshev-Datei gespeichert: %s (%d Bytes)", path, offset)
+    return path
+
+
+# ─── Auswerten ───
+
+class ChebyshevSerie:
+    """Koeffizienten einer Serie (read-only Sicht auf die mmap)."""
+
+    __slots__ = ("name", "start", "intervall", "grad", "koeffizienten")
+
+    def __init__(self, name: str, start: float, intervall: float, koeffizienten: np.ndarray):
+        self.name = name
+        self.start = start
+        self.intervall = intervall
+        self.grad = koeffizienten.shape[1] - 1
+        self.koeffizienten = koeffizienten
+
+    @property
+    def ende(self) -> float:
+        return self.start + self.intervall * len(self.koeffizienten)
+
+    def wert(self, jd: float) -> float:
+        """Skalar: Clenshaw-Rekursion in Python-Floats (kein NumPy-Overhead)."""
+        i, rest = divmod(jd - self.start, self.intervall)
+        koeffizienten = self.koeffizienten[int(i)].tolist()
+        x = 2.0 * rest / self.intervall - 1.0
+        x2 = 2.0 * x
+        b1 = b2 = 0.0
+        for c in reversed(koeffizienten[1:]):
+            b1, b2 = x2 * b1 - b2 + c, b1
+        return x * b1 - b2 + koeffizienten[0]
+
+    def werte(self, jds) -> np.ndarray:
+        """Vektorisiert: Clenshaw über alle Zeitpunkte gleichzeitig."""
+        jds = np.asarray(jds, dtype="f8")
+        i = np.floor((jds - self.start) / self.intervall).astype(np.intp)
+        x = 2.0 * (jds - self.start - i * self.intervall) / self.intervall - 1.0
+        zeilen = self.koeffizienten[i]
+        x2 = 2.0 * x
+        b1 = np.zeros_like(x)
+        b2 = np.zeros_like(x)
+        for k in range(self.grad, 0, -1):
+            b1, b2 = x2 * b1 - b2 + zeilen[:, k], b1
+        return x * b1 - b2 + zeilen[:, 0]
+
+
+class ChebyshevCache:
+    """Per mmap geladene Koeffizienten-Datei (read-only, threadsicher)."""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, anzahl = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Ungültige Chebyshev-Datei: {path}")
+
+        self._serien: dict[str, ChebyshevSerie] = {}
+        for i in range(anzahl):
+            name, start, intervall, grad, n, offset = _SERIE.unpack_from(
+                self._mmap, _HEADER.size + i * _SERIE.size
+            )
+            name = name.rstrip(b"\0").decode()
+            koeffizienten = np.frombuffer(
+                self._mmap, dtype="<f8", count=n * (grad + 1), offset=offset,
+            ).reshape(n, grad + 1)
+            self._serien[name] = ChebyshevSerie(name, start, intervall, koeffizienten)
+
+        self.start = max(s.start for s in self._serien.values())
+        self.ende = min(s.ende for s in self._serien.values())
+
+    def deckt(self, jd: float) -> bool:
+        """Liegt der Zeitpunkt im gespeicherten Zeitraum (alle Serien)?"""
+        return self.start <= jd < self.ende
+
+    def longitude(self, body: str, jd: float) -> float:
+        """Tropische Länge von "sun" / "moon" (0–360°)."""
+        return self._serien[body].wert(jd) % 360.0
+
+    def longitudes(self, body: str, jds) -> np.ndarray:
+        """Vektorisiert: tropische Längen (0–360°)."""
+        return np.mod(self._serien[body].werte(jds), 360.0)
+
+    def ayanamsa(self, jd: float) -> float:
+        """Lahiri-Ayanamsa inkl. Nutation (wie ephemeris.ayanamsa(jd, "LAHIRI"))."""
+        return self._serien[SERIE_AYANAMSA].wert(jd)
+
+    def ayanamsas(self, jds) -> np.ndarray:
+        """Vektorisiert: Lahiri-Ayanamsa."""
+        return self._serien[SERIE_AYANAMSA].werte(jds)
+
+
+def nahe_raster(lon: float, breite: float, toleranz: float | None = None, versatz: float = 0.0) -> bool:
+    """
+    True wenn lon näher als die Toleranz an einer Rastergrenze liegt
+    (z.B. Zeichen: breite=30; Gates: breite=5.625 mit Versatz).
+    """
+    toleranz = _toleranz if toleranz is None else toleranz
+    rest = (lon - versatz) % breite
+    return rest < toleranz or breite - rest < toleranz
+
+
+def nahe_grenze(lon: float, grenzen: tuple[float, ...], toleranz: float | None = None) -> bool:
+    """True wenn lon näher als die Toleranz an einer der sortierten Grenzen (0–360°) liegt."""
+    toleranz = _toleranz if toleranz is None else toleranz
+    lon %= 360.0
+    i = bisect.bisect_left(grenzen, lon)
+    nachbarn = (grenzen[i % len(grenzen)], grenzen[i - 1])
+    return any(abs((lon - g + 180.0) % 360.0 - 180.0) < toleranz for g in nachbarn)
+
+
+_cache: ChebyshevCache | None = None
+_geladen = False
+
+
+def get_cache() -> ChebyshevCache | None:
+    """Lädt die Datei einmalig; None wenn sie (noch) nicht erzeugt wurde."""
+    global _cache, _geladen
+    if _geladen:
+        return _cache
+
+    _geladen = True
+    if not CACHE_PATH.exists():
+        logger.warning("Chebyshev-Datei fehlt (%s) — Sonne/Mond kommen aus swisseph", CACHE_PATH)
+        return None
+
+    try:
+        _cache = ChebyshevCache(CACHE_PATH)
+    except ValueError as e:
+        logger.warning("%s — bitte neu erzeugen; Sonne/Mond kommen aus swisseph", e)
+        return None
+    logger.info("Chebyshev-Datei geladen: %s", CACHE_PATH)
+    return _cache
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    build_cache(Path(sys.argv[1]) if len(sys.argv) > 1 else CACHE_PATH)
@@ -0,0 +1,240 @@
+"""
+SyncMaster — Astronomische Sternbilder (IAU-Grenzen, 13 Zeichen)
+
+Optionaler Tierkreis-Modus: Zeichen = Sternbild, das die Ekliptik an der
+Position tatsächlich durchläuft (IAU-Grenzen) — Ophiuchus ist ein echtes
+Zeichen statt eines Zusatz-Flags, und die Sternbilder sind unterschiedlich
+breit (Skorpion ~7°, Jungfrau ~44°).
+
+Die Grenzen liegen einmal als sortiertes Array in der Epoche J2000 vor
+(config/konstellationen.yaml). Eine tropische Position wird per Präzession
+auf J2000 zurückgerechnet und per binärer Suche zugeordnet — genauso
+schnell wie der Band-Check in sidereal.py.
+
+Zusätzlich gibt es pro Jahr einen vorberechneten Sonnen-Kalender: wann die
+Sonne in welches Sternbild eintritt (Grenzfälle ±1 Tag ohne Ephemeride).
+
+Mond und Aszendent werden über ihre ekliptikale Länge zugeordnet
+(Projektion auf die Ekliptik, wie im 13-Zeichen-Tierkreis üblich).
+"""
+
+import bisect
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import swisseph as swe
+import yaml
+
+from .birth_moment import BirthMoment
+from .chart_context import ChartContext
+from .ephemeris import ensure_ephe_path, get_flags, julian_day_to_utc
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "konstellationen.yaml"
+
+# Tierkreis-Modi (pro Request / Bestellung wählbar)
+TIERKREIS_SIDERISCH = "siderisch"
+TIERKREIS_KONSTELLATIONEN = "konstellationen"
+TIERKREISE = (TIERKREIS_SIDERISCH, TIERKREIS_KONSTELLATIONEN)
+
+OPHIUCHUS = "Ophiuchus"
+
+_J2000 = 2451545.0
+
+# Grenzfall-Fenster in Tagen (wie ingress_index.GRENZFALL_FENSTER)
+GRENZFALL_FENSTER = 1.0
+
+# Sonnen-Kalender: Newton-Suche auf der Sonnenlänge (wie solar_arc_julian_day)
+_KALENDER_TOLERANZ = 1e-6
+_KALENDER_MAX_SCHRITTE = 8
+_SONNE_GRAD_PRO_TAG = 0.9856474
+
+
+def praezession(julian_day: float) -> float:
+    """
+    Allgemeine Präzession in Länge seit J2000 (Grad, Lieske 1977).
+    Tropische Länge − praezession() = Länge bezogen auf J2000.
+    """
+    t = (julian_day - _J2000) / 36525.0
+    return (5029.0966 * t + 1.11113 * t * t - 0.000006 * t * t * t) / 3600.0
+
+
+class ConstellationBoundaries:
+    """Sortierte J2000-Grenzen: grenzen[i] ist der Beginn von namen[i]."""
+
+    __slots__ = ("grenzen", "namen", "beginne", "eintritte")
+
+    def __init__(self, config: dict):
+        eintraege = sorted(
+            (float(e["ab"]) % 360.0, e["sternbild"]) for e in config["grenzen"]
+        )
+        if len(eintraege) < 2:
+            raise ValueError("Sternbild-Konfiguration braucht mindestens zwei Grenzen")
+
+        # Eintritte (J2000-Länge, Sternbild) für den Sonnen-Kalender
+        self.eintritte: tuple[tuple[float, str], ...] = tuple(eintraege)
+
+        # Segment [0°, erste Grenze) gehört zum letzten Sternbild (über 0° hinweg)
+        grenzen = [lon for lon, _ in eintraege]
+        namen = [name for _, name in eintraege]
+        beginne = list(grenzen)
+        if grenzen[0] > 0.0:
+            grenzen.insert(0, 0.0)
+            namen.insert(0, namen[-1])
+            beginne.insert(0, beginne[-1])
+        self.grenzen: tuple[float, ...] = tuple(grenzen)
+        self.namen: tuple[str, ...] = tuple(namen)
+        self.beginne: tuple[float, ...] = tuple(beginne)
+
+    def sternbild_j2000(self, lon_j2000: float) -> tuple[str, float]:
+        """J2000-Länge → (Sternbild, Grad seit Eintritt)."""
+        lon = lon_j2000 % 360.0
+        if lon >= 360.0:  # -1e-17 % 360 == 360.0
+            lon = 0.0
+        i = bisect.bisect_right(self.grenzen, lon) - 1
+        return self.namen[i], (lon - self.beginne[i]) % 360.0
+
+
+_grenzen: ConstellationBoundaries | None = None
+_lock = threading.Lock()
+
+
+def get_boundaries() -> ConstellationBoundaries:
+    """Grenzen aus config/konstellationen.yaml (lazy, einmalig)."""
+    global _grenzen
+    if _grenzen is None:
+        with _lock:
+            if _grenzen is None:
+                with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                    _grenzen = ConstellationBoundaries(yaml.safe_load(f))
+                logger.info("Sternbild-Grenzen geladen: %d Sternbilder", len(_grenzen.eintritte))
+    return _grenzen
+
+
+def sternbild(lon_tropisch: float, julian_day: float) -> tuple[str, float]:
+    """
+    Tropische Länge (Äquinoktium des Datums) → (Sternbild, Grad seit Eintritt).
+    """
+    return get_boundaries().sternbild_j2000(lon_tropisch - praezession(julian_day))
+
+
+def _sonnen_eintritt(lon_j2000: float, jd_start: float) -> float:
+    """Erster Zeitpunkt ab jd_start, zu dem die Sonne die J2000-Länge erreicht."""
+    flags = get_flags() | swe.FLG_SPEED
+    sonne = swe.calc_ut(jd_start, swe.SUN, flags)[0][0] - praezession(jd_start)
+    jd = jd_start + ((lon_j2000 - sonne) % 360.0) / _SONNE_GRAD_PRO_TAG
+
+    for _ in range(_KALENDER_MAX_SCHRITTE):
+        pos = swe.calc_ut(jd, swe.SUN, flags)[0]
+        fehler = (pos[0] - praezession(jd) - lon_j2000 + 180.0) % 360.0 - 180.0
+        if abs(fehler) < _KALENDER_TOLERANZ:
+            return jd
+        jd -= fehler / pos[3]
+
+    raise ValueError(f"Sternbild-Eintritt der Sonne konvergiert nicht: {lon_j2000}° ab JD {jd_start}")
+
+
+@lru_cache(maxsize=256)
+def sonnen_kalender(jahr: int) -> tuple[tuple[float, str], ...]:
+    """
+    Eintritte der Sonne in die Sternbilder eines Jahres (UT).
+
+    Returns:
+        Nach Zeitpunkt sortierte (julian_day, sternbild)-Paare
+    """
+    ensure_ephe_path()
+    start = swe.julday(jahr, 1, 1, 0.0)
+    ende = swe.julday(jahr + 1, 1, 1, 0.0)
+    kalender = []
+    for lon, name in get_boundaries().eintritte:
+        jd = _sonnen_eintritt(lon, start)
+        if jd < ende:
+            kalender.append((jd, name))
+    kalender.sort()
+    return tuple(kalender)
+
+
+def sonnen_kalender_utc(jahr: int) -> list[dict]:
+    """Sonnen-Kalender mit UTC-Zeitpunkten (für Anzeige / API)."""
+    return [
+        {"sternbild": name, "eintritt": julian_day_to_utc(jd).isoformat()}
+        for jd, name in sonnen_kalender(jahr)
+    ]
+
+
+def ist_sonnen_grenzfall(julian_day: float, fenster: float = GRENZFALL_FENSTER) -> bool:
+    """True wenn die Sonne innerhalb von ±fenster Tagen das Sternbild wechselt."""
+    jahr = int(swe.revjul(julian_day)[0])
+    eintritte = [jd for j in (jahr - 1, jahr, jahr + 1) for jd, _ in sonnen_kalender(j)]
+    i = bisect.bisect_left(eintritte, julian_day - fenster)
+    return i < len(eintritte) and eintritte[i] <= julian_day + fenster
+
+
+def _grenze_im_bogen(von: float, bis: float) -> bool:
+    """Liegt eine J2000-Grenze im (direktläufigen) Bogen von → bis?"""
+    bogen = (bis - von) % 360.0
+    return any((g - von) % 360.0 <= bogen for g, _ in get_boundaries().eintritte)
+
+
+def ist_mond_grenzfall(julian_day: float, fenster: float = GRENZFALL_FENSTER) -> bool:
+    """True wenn der Mond innerhalb von ±fenster Tagen das Sternbild wechselt."""
+    ensure_ephe_path()
+    flags = get_flags()
+    von, bis = (
+        swe.calc_ut(jd, swe.MOON, flags)[0][0] - praezession(jd)
+        for jd in (julian_day - fenster, julian_day + fenster)
+    )
+    return _grenze_im_bogen(von, bis)
+
+
+def calculate_constellations(
+    name: str,
+    moment: BirthMoment,
+    ctx: ChartContext | None = None,
+) -> dict:
+    """
+    Ordnet Sonne, Mond und Aszendent den IAU-Sternbildern zu.
+
+    Args:
+        name: Name der Person
+        moment: Geburtsmoment (Ortszeit, Koordinaten, Zeitzone)
+        ctx: Geteilter Chart-Kontext (optional, sonst eigener)
+
+    Returns:
+        dict mit sonne, mond, aszendent — jeweils zeichen (Sternbild), grad
+        (seit Eintritt ins Sternbild), ist_ophiuchus; sonne/mond mit ist_grenzfall
+    """
+    if ctx is None:
+        ctx = ChartContext()
+
+    # Dasselbe tropische Chart wie tropisch/siderisch
+    subject = ctx.chart_for(moment)
+    jd = moment.julian_day
+
+    result = {"grenzen": "IAU (J2000)"}
+    for key, point in (
+        ("sonne", subject.sun),
+        ("mond", subject.moon),
+        ("aszendent", subject.ascendant),
+    ):
+        zeichen, grad = sternbild(point.abs_pos, jd)
+        result[key] = {
+            "zeichen": zeichen,
+            "grad": round(grad, 2),
+            "ist_ophiuchus": zeichen == OPHIUCHUS,
+        }
+    result["sonne"]["ist_grenzfall"] = ist_sonnen_grenzfall(jd)
+    result["mond"]["ist_grenzfall"] = ist_mond_grenzfall(jd)
+
+    logger.info(
+        "Sternbilder: %s → Sonne=%s, Mond=%s, ASC=%s",
+        name,
+        result["sonne"]["zeichen"],
+        result["mond"]["zeichen"],
+        result["aszendent"]["zeichen"],
+    )
+
+    return result
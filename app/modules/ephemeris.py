@@ -0,0 +1,338 @@
+"""
+SyncMaster — Ephemeriden-Engine (direkt auf pyswisseph)
+
+Schlanke Alternative zu kerykeions AstrologicalSubjectFactory.
+Berechnet nur die Punkte, die ein Aufrufer wirklich braucht
+(Sonne, Mond, Planeten, mittlerer Mondknoten, Aszendent) — keine
+Häuser-Objekte, keine Mondphase, kein pydantic-Modell.
+
+Das Ergebnis (EphemerisChart) bietet dieselben Attribute wie ein
+kerykeion-Subject (sun.abs_pos, sun.sign, sun.position, ...), damit
+tropical.py, sidereal.py und human_design.py unverändert damit arbeiten.
+kerykeion bleibt die Referenz-Implementierung (ENGINE_KERYKEION).
+"""
+
+import logging
+import mmap
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from pathlib import Path
+
+import swisseph as swe
+
+from .ascendant import ascendant as closed_form_ascendant
+from .timezones import local_to_utc, utc_seconds_to_julian_day
+
+logger = logging.getLogger(__name__)
+
+# Kerykeion 3-Letter-Codes in Tierkreis-Reihenfolge (0° = Widder)
+SIGN_CODES = (
+    "Ari", "Tau", "Gem", "Can", "Leo", "Vir",
+    "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis",
+)
+
+# Attributname (wie bei kerykeion) → swisseph-Körper
+BODIES = {
+    "sun": swe.SUN,
+    "moon": swe.MOON,
+    "mercury": swe.MERCURY,
+    "venus": swe.VENUS,
+    "mars": swe.MARS,
+    "jupiter": swe.JUPITER,
+    "saturn": swe.SATURN,
+    "uranus": swe.URANUS,
+    "neptune": swe.NEPTUNE,
+    "pluto": swe.PLUTO,
+    "mean_north_lunar_node": swe.MEAN_NODE,
+}
+
+ALL_BODIES = tuple(BODIES)
+
+# Standard-Auswahl wie kerykeions Default-Punkte (ohne mittleren Mondknoten)
+DEFAULT_BODIES = ALL_BODIES[:-1]
+
+# Sidereal-Modi (kerykeion-Namen → swisseph-Konstanten)
+SIDEREAL_MODES = {
+    "LAHIRI": swe.SIDM_LAHIRI,
+    "FAGAN_BRADLEY": swe.SIDM_FAGAN_BRADLEY,
+    "RAMAN": swe.SIDM_RAMAN,
+    "KRISHNAMURTI": swe.SIDM_KRISHNAMURTI,
+}
+
+# Gleiche Ephemeriden-Dateien wie kerykeion, damit beide Backends übereinstimmen
+try:
+    import kerykeion
+    EPHE_PATH = str(Path(kerykeion.__file__).resolve().parent / "sweph")
+except ImportError:  # pragma: no cover
+    EPHE_PATH = ""
+
+# Ephemeriden-Modus (Settings.EPHEMERIS_MODE):
+#   "moshier" — analytische Moshier-Ephemeride, keine Dateien (Standard;
+#               entspricht dem bisherigen Verhalten, da kerykeions sweph-
+#               Verzeichnis keine Planeten-Dateien enthält)
+#   "files"   — Swiss-Ephemeris-Dateien (.se1) aus EPHEMERIS_PATH
+EPHEMERIS_MOSHIER = "moshier"
+EPHEMERIS_FILES = "files"
+EPHEMERIS_MODES = (EPHEMERIS_MOSHIER, EPHEMERIS_FILES)
+
+# Dateien für 1800–2399 (deckt 1900–2030 ab): Planeten, Mond
+EPHEMERIS_DATEIEN = ("sepl_18.se1", "semo_18.se1")
+
+_modus = EPHEMERIS_MOSHIER
+_ephe_path = EPHE_PATH
+_FLAGS = swe.FLG_MOSEPH
+
+# set_ephe_path setzt swissephs Datei-Cache zurück (~50 µs) — nur einmal setzen
+_ephe_path_gesetzt = False
+
+# Vorgeladene Dateien (mmap bleibt offen, damit die Seiten im Cache bleiben)
+_vorgeladen: dict[str, mmap.mmap] = {}
+
+
+def configure_ephemeris(modus: str, pfad: str | None = None) -> None:
+    """
+    Wählt Ephemeriden-Modus und -Pfad (einmal beim Start, aus Settings).
+
+    Raises:
+        ValueError: Bei unbekanntem Modus.
+    """
+    global _modus, _ephe_path, _FLAGS, _ephe_path_gesetzt
+    if modus not in EPHEMERIS_MODES:
+        raise ValueError(f"Unbekannter Ephemeriden-Modus: '{modus}'. Erlaubt: {EPHEMERIS_MODES}")
+
+    _modus = modus
+    _ephe_path = pfad or EPHE_PATH
+    _FLAGS = swe.FLG_SWIEPH if modus == EPHEMERIS_FILES else swe.FLG_MOSEPH
+    _ephe_path_gesetzt = False
+    logger.info("Ephemeride: %s (%s)", _modus, _ephe_path)
+
+
+def get_flags() -> int:
+    """swisseph-Flags des konfigurierten Modus (für direkte calc_ut-Aufrufe)."""
+    return _FLAGS
+
+
+def ensure_ephe_path() -> None:
+    """Setzt den Ephemeriden-Pfad einmalig pro Prozess."""
+    global _ephe_path_gesetzt
+    if not _ephe_path_gesetzt:
+        swe.set_ephe_path(_ephe_path)
+        _ephe_path_gesetzt = True
+
+
+def invalidate_ephe_path() -> None:
+    """Markiert den Pfad als neu zu setzen (kerykeion setzt bei jedem Chart seinen eigenen)."""
+    global _ephe_path_gesetzt
+    _ephe_path_gesetzt = False
+
+
+def preload_ephemeris_files() -> list[str]:
+    """
+    Lädt die .se1-Dateien für 1900–2030 per mmap in den Page-Cache
+    (nur im Modus "files").
+
+    Returns:
+        Liste der vorgeladenen Dateinamen.
+    """
+    if _modus != EPHEMERIS_FILES:
+        return []
+
+    fehlend = []
+    for name in EPHEMERIS_DATEIEN:
+        pfad = Path(_ephe_path) / name
+        if name in _vorgeladen:
+            continue
+        if not pfad.exists():
+            fehlend.append(name)
+            continue
+        with open(pfad, "rb") as f:
+            daten = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(daten, "madvise"):
+            daten.madvise(mmap.MADV_WILLNEED)
+        _vorgeladen[name] = daten
+
+    if fehlend:
+        logger.warning(
+            "Ephemeriden-Dateien fehlen in %s: %s — swisseph fällt auf Moshier zurück",
+            _ephe_path, ", ".join(fehlend),
+        )
+    return sorted(_vorgeladen)
+
+
+# Zeitpunkte für den Warm-up (über den ganzen Zeitraum verteilt)
+_WARMUP_JDS = tuple(swe.julday(jahr, 6, 1, 12.0) for jahr in (1900, 1950, 2000, 2030))
+
+
+def warm_up() -> bool:
+    """
+    Füllt Datei-Handles und swisseph-interne Caches, damit der erste
+    Request so schnell ist wie jeder weitere: alle Körper, Aszendent,
+    Ayanamsas und Sonnenbogen-Suche einmal durchrechnen.
+
+    Returns:
+        False, wenn im Modus "files" stillschweigend Moshier benutzt wird.
+    """
+    ensure_ephe_path()
+    for jd in _WARMUP_JDS:
+        compute_chart(jd, 52.5, 13.4, bodies=ALL_BODIES)
+        for mode in SIDEREAL_MODES:
+            ayanamsa(jd, mode)
+    solar_arc_julian_day.__wrapped__(_WARMUP_JDS[-1], 88.0)
+
+    retflag = swe.calc_ut(_WARMUP_JDS[0], swe.MOON, _FLAGS)[1]
+    if _modus == EPHEMERIS_FILES and retflag & swe.FLG_MOSEPH:
+        logger.warning("Ephemeride: Modus 'files', aber swisseph rechnet mit Moshier")
+        return False
+
+    logger.info("Ephemeride aufgewärmt (%s)", _modus)
+    return True
+
+
+class Point:
+    """Eine ekliptische Position (kompatibel zu kerykeions AstrologicalPoint)."""
+
+    __slots__ = ("abs_pos",)
+
+    def __init__(self, abs_pos: float):
+        self.abs_pos = abs_pos
+
+    @property
+    def sign(self) -> str:
+        return SIGN_CODES[int(self.abs_pos // 30.0) % 12]
+
+    @property
+    def position(self) -> float:
+        return self.abs_pos % 30.0
+
+    def __repr__(self) -> str:
+        return f"Point({self.abs_pos:.4f})"
+
+
+class EphemerisChart:
+    """Kompaktes Chart-Ergebnis; nicht angeforderte Punkte sind None."""
+
+    __slots__ = ("julian_day", "ascendant") + ALL_BODIES
+
+    def __init__(self, julian_day: float):
+        self.julian_day = julian_day
+        self.ascendant = None
+        for body in ALL_BODIES:
+            setattr(self, body, None)
+
+
+def local_to_julian_day(
+    jahr: int, monat: int, tag: int, stunde: int, minute: int, timezone: str,
+) -> float:
+    """
+    Wandelt lokale Zeit + IANA-Zone in einen Julianischen Tag (UT) um
+    (über die gecachten Offset-Tabellen aus timezones.py).
+
+    Raises:
+        ValueError: Bei mehrdeutiger oder nicht existierender Ortszeit
+            (Zeitumstellung) — wie kerykeion.
+    """
+    utc = local_to_utc(jahr, monat, tag, stunde, minute, timezone)
+    return utc_seconds_to_julian_day(utc)
+
+
+def utc_to_julian_day(utc: datetime) -> float:
+    """Julianischer Tag (UT) für einen UTC-Zeitpunkt."""
+    stunden = utc.hour + utc.minute / 60.0 + utc.second / 3600.0
+    return swe.julday(utc.year, utc.month, utc.day, stunden)
+
+
+def julian_day_to_utc(julian_day: float) -> datetime:
+    """UTC-Zeitpunkt (auf die Sekunde gerundet) für einen Julianischen Tag (UT)."""
+    jahr, monat, tag, stunden = swe.revjul(julian_day)
+    mitternacht = datetime(jahr, monat, tag, tzinfo=dt_timezone.utc)
+    return mitternacht + timedelta(seconds=round(stunden * 3600.0))
+
+
+# Abbruch der Sonnenbogen-Suche: 1e-6° ≈ 0.1 s Sonnenbewegung
+_BOGEN_TOLERANZ = 1e-6
+_BOGEN_MAX_SCHRITTE = 8
+
+
+@lru_cache(maxsize=4096)
+def solar_arc_julian_day(julian_day: float, bogen: float) -> float:
+    """
+    Zeitpunkt, an dem die Sonne genau `bogen` Grad vor ihrer Position zu
+    `julian_day` stand (z.B. 88° für das Human-Design-Design-Chart).
+
+    Newton-Verfahren auf der Sonnenlänge: jede Iteration ist ein einzelner
+    calc_ut-Aufruf für die Sonne (inkl. Geschwindigkeit), nach 2–3 Schritten
+    liegt der Fehler unter 0.1 Sekunden. Ergebnisse werden pro Zeitpunkt gecacht.
+
+    Raises:
+        ValueError: Wenn die Suche nicht konvergiert.
+    """
+    ensure_ephe_path()
+    flags = _FLAGS | swe.FLG_SPEED
+    ziel = (swe.calc_ut(julian_day, swe.SUN, _FLAGS)[0][0] - bogen) % 360.0
+
+    # Startwert über die mittlere Sonnengeschwindigkeit (~0.9856°/Tag)
+    jd = julian_day - bogen / 0.9856474
+    for _ in range(_BOGEN_MAX_SCHRITTE):
+        pos = swe.calc_ut(jd, swe.SUN, flags)[0]
+        fehler = (pos[0] - ziel + 180.0) % 360.0 - 180.0
+        if abs(fehler) < _BOGEN_TOLERANZ:
+            return jd
+        jd -= fehler / pos[3]
+
+    raise ValueError(f"Sonnenbogen-Suche konvergiert nicht: JD {julian_day}, {bogen}°")
+
+
+def ayanamsa(julian_day: float, sidereal_mode: str) -> float:
+    """
+    Ayanamsa (inkl. Nutation) für einen Zeitpunkt.
+
+    tropische Länge − ayanamsa() entspricht exakt der Position,
+    die swisseph mit FLG_SIDEREAL liefert.
+    """
+    ensure_ephe_path()
+    swe.set_sid_mode(SIDEREAL_MODES[sidereal_mode])
+    return swe.get_ayanamsa_ex_ut(julian_day, _FLAGS)[1]
+
+
+def compute_chart(
+    julian_day: float,
+    lat: float | None = None,
+    lon: float | None = None,
+    bodies: tuple[str, ...] = DEFAULT_BODIES,
+    ascendant: bool = True,
+    sidereal_mode: str | None = None,
+) -> EphemerisChart:
+    """
+    Berechnet nur die angeforderten Punkte für einen Zeitpunkt.
+
+    Args:
+        julian_day: Julianischer Tag (UT)
+        lat, lon: Koordinaten (nur für den Aszendenten nötig)
+        bodies: Attributnamen aus BODIES
+        ascendant: Aszendent berechnen (benötigt lat/lon; geschlossene
+            Formel aus ascendant.py statt Häuserberechnung)
+        sidereal_mode: z.B. "LAHIRI" für siderische Positionen, None = tropisch
+
+    Returns:
+        EphemerisChart
+    """
+    flags = _FLAGS
+    ensure_ephe_path()
+    if sidereal_mode is not None:
+        swe.set_sid_mode(SIDEREAL_MODES[sidereal_mode])
+        flags |= swe.FLG_SIDEREAL
+
+    chart = EphemerisChart(julian_day)
+    for body in bodies:
+        pos = swe.calc_ut(julian_day, BODIES[body], flags)[0]
+        setattr(chart, body, Point(pos[0]))
+
+    if ascendant:
+        if lat is None or lon is None:
+            raise ValueError("Aszendent benötigt lat/lon")
+        asc = closed_form_ascendant(julian_day, lat, lon)
+        if sidereal_mode is not None:
+            asc = (asc - ayanamsa(julian_day, sidereal_mode)) % 360.0
+        chart.ascendant = Point(asc)
+
+    return chart
@@ -0,0 +1,153 @@
+"""
+SyncMaster — Benchmark der Ephemeriden-Modi (Moshier vs. .se1-Dateien)
+
+Misst beide Modi auf unserer typischen Last:
+    kaltstart  — erster Chart in einem frischen Prozess (ohne / mit Warm-up)
+    gratis     — Sonne, Mond, Aszendent, Ayanamsa (Gratis-Check mit Uhrzeit)
+    bestellung — alle Körper + Aszendent, Sonnenbogen-Suche, Design-Chart
+und die maximale Abweichung zwischen den Modi (Bogensekunden).
+
+Aufruf:
+    python -m app.modules.ephemeris_benchmark [anzahl] [ephemeris_pfad]
+"""
+
+import logging
+import random
+import subprocess
+import sys
+import time
+
+import swisseph as swe
+
+from .ephemeris import (
+    ALL_BODIES,
+    EPHEMERIS_FILES,
+    EPHEMERIS_MODES,
+    compute_chart,
+    configure_ephemeris,
+    preload_ephemeris_files,
+    solar_arc_julian_day,
+    warm_up,
+)
+
+logger = logging.getLogger(__name__)
+
+# 1900–2030, wie GratisCheckRequest
+_JD_MIN = swe.julday(1900, 1, 1, 0.0)
+_JD_MAX = swe.julday(2030, 12, 31, 24.0)
+
+_KALTSTART_SKRIPT = """
+import time
+from app.modules.ephemeris import compute_chart, configure_ephemeris, preload_ephemeris_files, warm_up
+configure_ephemeris({modus!r}, {pfad!r})
+if {aufwaermen}:
+    preload_ephemeris_files()
+    warm_up()
+t = time.perf_counter()
+compute_chart(2447000.3, 52.5, 13.4)
+print(time.perf_counter() - t)
+"""
+
+
+def _stichprobe(anzahl: int, seed: int = 42) -> list[tuple[float, float, float]]:
+    rng = random.Random(seed)
+    return [
+        (rng.uniform(_JD_MIN, _JD_MAX), rng.uniform(-60.0, 65.0), rng.uniform(-180.0, 180.0))
+        for _ in range(anzahl)
+    ]
+
+
+def _kaltstart(modus: str, pfad: str | None, aufwaermen: bool) -> float:
+    """Erster Chart in einem frischen Python-Prozess (Sekunden)."""
+    skript = _KALTSTART_SKRIPT.format(modus=modus, pfad=pfad, aufwaermen=aufwaermen)
+    ausgabe = subprocess.run(
+        [sys.executable, "-c", skript], capture_output=True, text=True, check=True,
+    ).stdout
+    return float(ausgabe.strip().splitlines()[-1])
+
+
+def _gratis(stichprobe) -> None:
+    for jd, lat, lon in stichprobe:
+        compute_chart(jd, lat, lon, bodies=("sun", "moon"), sidereal_mode="LAHIRI")
+
+
+def _bestellung(stichprobe) -> None:
+    for jd, lat, lon in stichprobe:
+        compute_chart(jd, lat, lon)
+        design_jd = solar_arc_julian_day.__wrapped__(jd, 88.0)
+        compute_chart(design_jd, lat, lon, bodies=ALL_BODIES, ascendant=False)
+
+
+def _positionen(stichprobe) -> list[tuple[float, ...]]:
+    result = []
+    for jd, lat, lon in stichprobe:
+        chart = compute_chart(jd, lat, lon, bodies=ALL_BODIES)
+        result.append(tuple(getattr(chart, body).abs_pos for body in ALL_BODIES))
+    return result
+
+
+def _messen(funktion, stichprobe) -> float:
+    """Mikrosekunden pro Geburtsmoment."""
+    t = time.perf_counter()
+    funktion(stichprobe)
+    return (time.perf_counter() - t) / len(stichprobe) * 1e6
+
+
+def run_benchmark(anzahl: int = 2000, pfad: str | None = None) -> dict:
+    """
+    Führt den Benchmark für alle Modi aus.
+
+    Returns:
+        {modus: {kaltstart_ms, kaltstart_warm_ms, gratis_us, bestellung_us,
+                 dateien, fallback}} plus "abweichung_bogensekunden"
+    """
+    stichprobe = _stichprobe(anzahl)
+    ergebnis: dict = {}
+    positionen = {}
+
+    for modus in EPHEMERIS_MODES:
+        configure_ephemeris(modus, pfad)
+        dateien = preload_ephemeris_files()
+        fallback = not warm_up()
+
+        ergebnis[modus] = {
+            "kaltstart_ms": _kaltstart(modus, pfad, False) * 1e3,
+            "kaltstart_warm_ms": _kaltstart(modus, pfad, True) * 1e3,
+            "gratis_us": _messen(_gratis, stichprobe),
+            "bestellung_us": _messen(_bestellung, stichprobe),
+            "dateien": dateien,
+            "fallback": fallback,
+        }
+        positionen[modus] = _positionen(stichprobe)
+
+    a, b = (positionen[m] for m in EPHEMERIS_MODES)
+    ergebnis["abweichung_bogensekunden"] = max(
+        abs((x - y + 180.0) % 360.0 - 180.0) * 3600.0
+        for zeile_a, zeile_b in zip(a, b)
+        for x, y in zip(zeile_a, zeile_b)
+    )
+    return ergebnis
+
+
+def _ausgeben(ergebnis: dict, anzahl: int) -> None:
+    print(f"Ephemeriden-Benchmark ({anzahl} Geburtsmomente, 1900–2030)\n")
+    print(f"{'Modus':<10}{'Kalt':>10}{'Kalt+Warm':>12}{'Gratis':>12}{'Bestellung':>14}")
+    for modus in EPHEMERIS_MODES:
+        r = ergebnis[modus]
+        print(
+            f"{modus:<10}{r['kaltstart_ms']:>8.2f}ms{r['kaltstart_warm_ms']:>10.2f}ms"
+            f"{r['gratis_us']:>10.1f}µs{r['bestellung_us']:>12.1f}µs"
+        )
+    dateien = ergebnis[EPHEMERIS_FILES]
+    if dateien["fallback"]:
+        print("\nHinweis: .se1-Dateien fehlen — Modus 'files' rechnet mit Moshier.")
+    else:
+        print(f"\nDateien: {', '.join(dateien['dateien'])}")
+    print(f"Max. Abweichung zwischen den Modi: {ergebnis['abweichung_bogensekunden']:.3f}″")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ephe_pfad = sys.argv[2] if len(sys.argv) > 2 else None
+    _ausgeben(run_benchmark(n, ephe_pfad), n)
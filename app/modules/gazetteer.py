@@ -0,0 +1,474 @@
+"""
+SyncMaster — Offline-Geocoder (GeoNames-Ortsverzeichnis in SQLite)
+
+Statt für jeden neuen Geburtsort Nominatim zu fragen (Netzwerk, 10s
+Timeout, 1 Anfrage/s), kommen Koordinaten und Zeitzone aus einem lokalen
+Ortsverzeichnis: alle Orte eines GeoNames-Städte-Dumps (cities1000 ≈ 150k
+Orte) mit allen Namensvarianten als normierte Schlüssel. Eine Anfrage ist
+ein Index-Lookup in SQLite (deutlich unter 1 ms); bei gleichnamigen Orten
+gewinnt der einwohnerstärkste, ein Länder-Suffix ("…, Deutschland",
+"…, Austria", "…, CH") schränkt auf das Land ein.
+
+Erzeugen (einmalig, z.B. beim Docker-Build):
+    python -m app.modules.gazetteer --download [--ohne-alternativ]
+    python -m app.modules.gazetteer cities1000.txt --laender countryInfo.txt \\
+        --regionen admin1CodesASCII.txt [--alternativ alternateNamesV2.txt]
+
+Deutsche Ländernamen und Aliase: config/laender.yaml. Mit der
+alternateNames-Datei (bei --download Standard) werden auch Orte und
+Regionen deutsch angezeigt ("München, Bayern") und auf Deutsch gefunden;
+ohne sie sind sie englisch benannt ("Munich, Bavaria").
+"""
+
+import argparse
+import io
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import unicodedata
+import urllib.request
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+_BASE_DIR = Path(__file__).resolve().parent.parent.parent
+GAZETTEER_PATH = _BASE_DIR / "data" / "gazetteer.sqlite"
+LAENDER_PATH = _BASE_DIR / "config" / "laender.yaml"
+
+GEONAMES_URL = "https://download.geonames.org/export/dump/"
+STANDARD_DUMP = "cities1000"
+
+# Sprachen der alternateNames, die als Anzeigename bzw. Schlüssel dienen
+ANZEIGE_SPRACHE = "de"
+SPRACHEN = ("de", "en")
+
+# Historische / verlassene Orte nicht aufnehmen
+_AUSGESCHLOSSEN = {"PPLH", "PPLQ", "PPLW"}
+
+_VERSION = "1"
+
+_UMLAUTE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+_NICHT_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def _ohne_akzente(text: str) -> str:
+    if text.isascii():
+        return text
+    zerlegt = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in zerlegt if not unicodedata.combining(c))
+
+
+def normalisiere_ort(text: str) -> str:
+    """
+    Normierter Schlüssel eines Ortsnamens: Kleinschreibung, Umlaute als
+    ae/oe/ue, ß als ss, ohne Akzente und Satzzeichen, einfache Leerzeichen.
+    "  Frankfurt/Main " → "frankfurt main", "München" → "muenchen".
+    """
+    text = _ohne_akzente(text.casefold().translate(_UMLAUTE))
+    return _NICHT_ALNUM.sub(" ", text).strip()
+
+
+def namens_schluessel(name: str) -> set[str]:
+    """Schlüssel eines Namens — mit und ohne Umlaut-Auflösung ("muenchen", "munchen")."""
+    varianten = {normalisiere_ort(name), _NICHT_ALNUM.sub(" ", _ohne_akzente(name.casefold())).strip()}
+    return {v for v in varianten if v and not v.isdigit()}
+
+
+# ─── Erzeugen ───
+
+_SCHEMA = """
+CREATE TABLE meta (schluessel TEXT PRIMARY KEY, wert TEXT NOT NULL);
+CREATE TABLE orte (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    land TEXT NOT NULL,
+    region TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    timezone TEXT NOT NULL,
+    einwohner INTEGER NOT NULL
+);
+CREATE TABLE namen (
+    schluessel TEXT NOT NULL,
+    ort_id INTEGER NOT NULL,
+    PRIMARY KEY (schluessel, ort_id)
+) WITHOUT ROWID;
+CREATE TABLE laender (land TEXT PRIMARY KEY, name TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE land_namen (schluessel TEXT PRIMARY KEY, land TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE regionen (code TEXT PRIMARY KEY, name TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE region_namen (
+    schluessel TEXT NOT NULL,
+    code TEXT NOT NULL,
+    PRIMARY KEY (schluessel, code)
+) WITHOUT ROWID;
+"""
+
+
+def _zeilen(path: Path):
+    """Tab-getrennte Zeilen einer GeoNames-Datei (.txt oder .zip), ohne Kommentare."""
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archiv:
+            # alternateNamesV2.zip enthält zusätzlich iso-languagecodes.txt
+            namen = archiv.namelist()
+            innen = f"{path.stem}.txt" if f"{path.stem}.txt" in namen else next(n for n in namen if n.endswith(".txt"))
+            with archiv.open(innen) as f:
+                for zeile in io.TextIOWrapper(f, encoding="utf-8"):
+                    if zeile.strip() and not zeile.startswith("#"):
+                        yield zeile.rstrip("\n").split("\t")
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for zeile in f:
+            if zeile.strip() and not zeile.startswith("#"):
+                yield zeile.rstrip("\n").split("\t")
+
+
+def _alternativ_namen(path: Path, ids: set[int]) -> tuple[dict[int, str], dict[int, set[str]]]:
+    """
+    Deutsche Anzeigenamen und de/en-Namen aus alternateNamesV2 für die
+    gegebenen geonameids (Orte, Regionen, Länder).
+    """
+    anzeige: dict[int, tuple[bool, str]] = {}
+    namen: dict[int, set[str]] = {}
+    for spalten in _zeilen(path):
+        geonameid, sprache, name = int(spalten[1]), spalten[2], spalten[3]
+        if geonameid not in ids or sprache not in SPRACHEN:
+            continue
+        historisch = len(spalten) > 7 and spalten[7] == "1"
+        if historisch:
+            continue
+        namen.setdefault(geonameid, set()).add(name)
+        if sprache == ANZEIGE_SPRACHE:
+            bevorzugt = spalten[4] == "1"
+            if geonameid not in anzeige or (bevorzugt and not anzeige[geonameid][0]):
+                anzeige[geonameid] = (bevorzugt, name)
+    return {k: name for k, (_, name) in anzeige.items()}, namen
+
+
+def build_gazetteer(
+    staedte: Path,
+    laender_info: Path | None = None,
+    regionen: Path | None = None,
+    alternativ: Path | None = None,
+    path: Path = GAZETTEER_PATH,
+) -> Path:
+    """
+    Importiert einen GeoNames-Städte-Dump (+ optionale Zusatzdateien) in
+    eine SQLite-Datei. Schreibt erst in eine temporäre Datei und ersetzt
+    dann atomar — ein laufender Server liest nie eine halbe Datei.
+    """
+    with open(LAENDER_PATH, "r", encoding="utf-8") as f:
+        laender_config = yaml.safe_load(f)["laender"]
+
+    orte = []
+    ort_namen: dict[int, set[str]] = {}
+    for s in _zeilen(staedte):
+        if s[6] != "P" or s[7] in _AUSGESCHLOSSEN or not s[17]:
+            continue
+        geonameid = int(s[0])
+        region = f"{s[8]}.{s[10]}" if s[10] else None
+        orte.append([geonameid, s[1], s[8], region, float(s[4]), float(s[5]), s[17], int(s[14] or 0)])
+        ort_namen[geonameid] = {s[1], s[2], *filter(None, s[3].split(","))}
+
+    laender: dict[str, str] = {}
+    land_namen: dict[str, set[str]] = {}
+    land_ids: dict[int, str] = {}
+    if laender_info:
+        for s in _zeilen(laender_info):
+            iso, iso3, name = s[0], s[1], s[4]
+            laender[iso] = name
+            land_namen.setdefault(iso, set()).update({iso, iso3, name})
+            if len(s) > 16 and s[16]:
+                land_ids[int(s[16])] = iso
+
+    regionen_namen: dict[str, str] = {}
+    region_alle: dict[str, set[str]] = {}
+    region_ids: dict[int, str] = {}
+    if regionen:
+        for s in _zeilen(regionen):
+            regionen_namen[s[0]] = s[1]
+            region_alle[s[0]] = {s[1], s[2]}
+            if len(s) > 3 and s[3]:
+                region_ids[int(s[3])] = s[0]
+
+    if alternativ:
+        ids = set(ort_namen) | set(land_ids) | set(region_ids)
+        anzeige, namen = _alternativ_namen(alternativ, ids)
+        for ort in orte:
+            ort[1] = anzeige.get(ort[0], ort[1])
+            ort_namen[ort[0]] |= namen.get(ort[0], set())
+        for geonameid, iso in land_ids.items():
+            land_namen.setdefault(iso, set()).update(namen.get(geonameid, set()))
+            if geonameid in anzeige:
+                laender[iso] = anzeige[geonameid]
+        for geonameid, code in region_ids.items():
+            region_alle[code] |= namen.get(geonameid, set())
+            if geonameid in anzeige:
+                regionen_namen[code] = anzeige[geonameid]
+
+    # config/laender.yaml hat Vorrang (deutsche Anzeige, Aliase wie "BRD")
+    for iso, eintrag in laender_config.items():
+        laender[iso] = eintrag["name"]
+        land_namen.setdefault(iso, set()).update({iso, eintrag["name"], *eintrag.get("aliase", [])})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".sqlite")
+    os.close(fd)
+    try:
+        con = sqlite3.connect(tmp)
+        con.executescript(_SCHEMA)
+        con.execute("INSERT INTO meta VALUES ('version', ?)", (_VERSION,))
+        con.execute("INSERT INTO meta VALUES ('quelle', ?)", (staedte.name,))
+        con.executemany("INSERT INTO orte VALUES (?, ?, ?, ?, ?, ?, ?, ?)", orte)
+        con.executemany(
+            "INSERT OR IGNORE INTO namen VALUES (?, ?)",
+            ((key, geonameid) for geonameid, namen in ort_namen.items() for name in namen for key in namens_schluessel(name)),
+        )
+        con.executemany("INSERT INTO laender VALUES (?, ?)", laender.items())
+        con.executemany(
+            "INSERT OR IGNORE INTO land_namen VALUES (?, ?)",
+            ((key, iso) for iso, namen in land_namen.items() for name in namen for key in namens_schluessel(name)),
+        )
+        con.executemany("INSERT INTO regionen VALUES (?, ?)", regionen_namen.items())
+        con.executemany(
+            "INSERT OR IGNORE INTO region_namen VALUES (?, ?)",
+            ((key, code) for code, namen in region_alle.items() for name in namen for key in namens_schluessel(name)),
+        )
+        con.commit()
+        con.execute("VACUUM")
+        con.close()
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+    logger.info(
+        "Ortsverzeichnis gespeichert: %s (%d Orte, %d Länder, %d Regionen)",
+        path, len(orte), len(laender), len(regionen_namen),
+    )
+    return path
+
+
+def download_und_build(dump: str = STANDARD_DUMP, path: Path = GAZETTEER_PATH, alternativ: bool = True) -> Path:
+    """
+    Lädt Städte-Dump, countryInfo, admin1-Codes und (für deutsche Anzeige-
+    namen wie "München, Bayern") alternateNamesV2 von GeoNames und erzeugt
+    die Datei. Ohne alternateNames (≈ 180 MB Download) sind Orte und
+    Regionen englisch benannt ("Munich, Bavaria"), nur die Länder deutsch.
+    """
+    namen = [f"{dump}.zip", "countryInfo.txt", "admin1CodesASCII.txt"]
+    if alternativ:
+        namen.append("alternateNamesV2.zip")
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        dateien = {}
+        for name in namen:
+            ziel = Path(verzeichnis) / name
+            logger.info("Lade %s%s …", GEONAMES_URL, name)
+            urllib.request.urlretrieve(GEONAMES_URL + name, ziel)
+            dateien[name] = ziel
+        return build_gazetteer(
+            dateien[f"{dump}.zip"],
+            laender_info=dateien["countryInfo.txt"],
+            regionen=dateien["admin1CodesASCII.txt"],
+            alternativ=dateien.get("alternateNamesV2.zip"),
+            path=path,
+        )
+
+
+# ─── Abfragen ───
+
+_SUCHE = """
+    SELECT o.id, o.name, o.land, o.region, o.lat, o.lon, o.timezone
+    FROM namen n JOIN orte o ON o.id = n.ort_id
+    WHERE n.schluessel = ? {bedingung}
+    ORDER BY o.einwohner DESC, o.id
+    LIMIT 1
+"""
+
+
+class Gazetteer:
+    """Read-only Ortsverzeichnis (eine SQLite-Verbindung pro Thread)."""
+
+    def __init__(self, path: Path = GAZETTEER_PATH):
+        self.path = path
+        self._lokal = threading.local()
+        try:
+            version = self._verbindung().execute(
+                "SELECT wert FROM meta WHERE schluessel = 'version'"
+            ).fetchone()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Ungültiges Ortsverzeichnis: {path} ({e})")
+        if version is None or version[0] != _VERSION:
+            raise ValueError(f"Ungültiges Ortsverzeichnis: {path}")
+
+        con = self._verbindung()
+        self.laender: dict[str, str] = dict(con.execute("SELECT land, name FROM laender"))
+        self.regionen: dict[str, str] = dict(con.execute("SELECT code, name FROM regionen"))
+        self._land_namen: dict[str, str] = dict(con.execute("SELECT schluessel, land FROM land_namen"))
+        self._region_namen: dict[str, list[str]] = {}
+        for key, code in con.execute("SELECT schluessel, code FROM region_namen"):
+            self._region_namen.setdefault(key, []).append(code)
+
+    def _verbindung(self) -> sqlite3.Connection:
+        con = getattr(self._lokal, "con", None)
+        if con is None:
+            con = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True)
+            self._lokal.con = con
+        return con
+
+    def _abfrage(self, bedingung: str, *parameter) -> tuple | None:
+        return self._verbindung().execute(_SUCHE.format(bedingung=bedingung), parameter).fetchone()
+
+    def land(self, text: str) -> str | None:
+        """Ländername / ISO-Code / Alias → ISO-Code (oder None)."""
+        return self._land_namen.get(normalisiere_ort(text))
+
+    def suche(self, ort: str) -> dict | None:
+        """
+        "Ort[, Region][, Land]" → dict mit lat, lon, timezone, ort_vollstaendig
+        (wie get_coordinates) oder None, wenn kein Ort passt. Ein Zusatz,
+        der weder Region noch Land ist, zählt zum Namen ("Frankfurt, Oder"
+        → "frankfurt oder").
+        """
+        treffer = self.suche_mit_id(ort)
+        return treffer[1] if treffer else None
+
+    def suche_mit_id(self, ort: str) -> tuple[int, dict] | None:
+        """Wie suche(), zusätzlich mit der geonameid des Treffers."""
+        teile = [t for t in (normalisiere_ort(t) for t in ort.split(",")) if t]
+        if not teile:
+            return None
+
+        land = self._land_namen.get(teile[-1]) if len(teile) > 1 else None
+        zusatz = teile[1:-1] if land else teile[1:]
+        if any(t not in self._region_namen and t not in self._land_namen for t in zusatz):
+            # Unbekannter Zusatz ("Frankfurt, Oder") gehört zum Namen — nie
+            # stillschweigend weglassen, sonst gewinnt der größte Namensvetter
+            name = " ".join([teile[0], *zusatz])
+            zeile = self._abfrage("AND o.land = ?", name, land) if land else self._abfrage("", name)
+            return (zeile[0], self._ergebnis(*zeile[1:])) if zeile else None
+
+        regionen = [code for t in zusatz for code in self._region_namen.get(t, ())]
+        if land:
+            regionen = [code for code in regionen if code.startswith(f"{land}.")]
+
+        zeile = None
+        if regionen:
+            # Region angegeben ("Neustadt, Hessen") → dort zuerst suchen
+            platzhalter = ", ".join("?" * len(regionen))
+            zeile = self._abfrage(f"AND o.region IN ({platzhalter})", teile[0], *regionen)
+        if zeile is None:
+            zeile = self._abfrage("AND o.land = ?", teile[0], land) if land else self._abfrage("", teile[0])
+        if zeile is None:
+            return None
+        return zeile[0], self._ergebnis(*zeile[1:])
+
+    def _ergebnis(self, name: str, iso: str, region: str | None, lat: float, lon: float, timezone: str) -> dict:
+        anzeige = [name, self.regionen.get(region), self.laender.get(iso, iso)]
+        return {
+            "lat": round(lat, 4),
+            "lon": round(lon, 4),
+            "timezone": timezone,
+            "ort_vollstaendig": ", ".join(t for t in anzeige if t),
+        }
+
+    def ort(self, geonameid: int) -> dict | None:
+        """Ort per geonameid (wie suche()) oder None."""
+        zeile = self._verbindung().execute(
+            "SELECT name, land, region, lat, lon, timezone FROM orte WHERE id = ?", (geonameid,)
+        ).fetchone()
+        return self._ergebnis(*zeile) if zeile else None
+
+    def alle_orte(self):
+        """Alle Orte: (geonameid, name, einwohner, dict wie suche()) — für den Präfix-Index."""
+        for geonameid, einwohner, *zeile in self._verbindung().execute(
+            "SELECT id, einwohner, name, land, region, lat, lon, timezone FROM orte"
+        ):
+            yield geonameid, zeile[0], einwohner, self._ergebnis(*zeile)
+
+
+_pfad = GAZETTEER_PATH
+_gazetteer: Gazetteer | None = None
+_geladen = False
+_lock = threading.Lock()
+
+
+def configure_gazetteer(pfad: str | None = None) -> None:
+    """Setzt den Pfad der SQLite-Datei (leer = data/gazetteer.sqlite); lädt beim nächsten Zugriff neu."""
+    global _pfad, _gazetteer, _geladen
+    with _lock:
+        _pfad = Path(pfad) if pfad else GAZETTEER_PATH
+        _gazetteer = None
+        _geladen = False
+
+
+def get_gazetteer() -> Gazetteer | None:
+    """Lädt das Verzeichnis einmalig; None wenn die Datei (noch) nicht erzeugt wurde."""
+    global _gazetteer, _geladen
+    if _geladen:
+        return _gazetteer
+
+    with _lock:
+        if _geladen:
+            return _gazetteer
+        _geladen = True
+        if not _pfad.exists():
+            logger.warning("Ortsverzeichnis fehlt (%s) — Geocoding nur über Nominatim", _pfad)
+            return None
+        try:
+            _gazetteer = Gazetteer(_pfad)
+        except ValueError as e:
+            logger.warning("%s — bitte neu erzeugen; Geocoding nur über Nominatim", e)
+            return None
+        logger.info("Ortsverzeichnis geladen: %s (%d Länder)", _pfad, len(_gazetteer.laender))
+        return _gazetteer
+
+
+@lru_cache(maxsize=1)
+def _laender_aus_config() -> dict[str, str]:
+    """Normierter Name/Alias → ISO-Code nur aus config/laender.yaml (ohne Ortsverzeichnis)."""
+    with open(LAENDER_PATH, "r", encoding="utf-8") as f:
+        laender_config = yaml.safe_load(f)["laender"]
+    return {
+        key: iso
+        for iso, eintrag in laender_config.items()
+        for name in (iso, eintrag["name"], *eintrag.get("aliase", []))
+        for key in namens_schluessel(name)
+    }
+
+
+def land_code(text: str) -> str | None:
+    """
+    Ländername / ISO-Code / Alias → ISO-Code (oder None) — aus dem
+    Ortsverzeichnis, sonst aus config/laender.yaml.
+    """
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        return gazetteer.land(text)
+    return _laender_aus_config().get(normalisiere_ort(text))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Offline-Ortsverzeichnis aus GeoNames erzeugen")
+    parser.add_argument("staedte", nargs="?", type=Path, help="citiesXXXX.txt/.zip (fehlt: --download)")
+    parser.add_argument("--download", action="store_true", help=f"{STANDARD_DUMP} & Co. von GeoNames laden")
+    parser.add_argument("--laender", type=Path, help="countryInfo.txt")
+    parser.add_argument("--regionen", type=Path, help="admin1CodesASCII.txt")
+    parser.add_argument("--alternativ", type=Path, help="alternateNamesV2.txt/.zip (deutsche Anzeigenamen)")
+    parser.add_argument("--ohne-alternativ", action="store_true", help="--download ohne alternateNames (englische Anzeige)")
+    parser.add_argument("--ziel", type=Path, default=GAZETTEER_PATH)
+    args = parser.parse_args()
+
+    if args.download:
+        download_und_build(path=args.ziel, alternativ=not args.ohne_alternativ)
+    elif args.staedte:
+        build_gazetteer(args.staedte, args.laender, args.regionen, args.alternativ, args.ziel)
+    else:
+        parser.error("Städte-Datei oder --download angeben")
@@ -2,45 +2,279 @@
 SyncMaster — Geocoding-Modul
 
 Wandelt Ortsnamen in Koordinaten (lat/lon) und Zeitzone um.
-Nutzt geopy (Nominatim) und timezonefinder.
+Zuerst aus dem Offline-Ortsverzeichnis (gazetteer.py, ohne Netzwerk);
+nur Orte, die dort fehlen, über geopy (Nominatim) und timezonefinder —
+dieser Fallback ist abschaltbar (configure_geocoding).
+
+Ergebnisse liegen in einem begrenzten LRU-Cache pro Prozess (Schlüssel:
+cache_schluessel, ttl_cache.TTLCache) — auch "Ort nicht gefunden", mit
+kürzerer TTL, damit Tippfehler nicht bei jedem Retry online landen.
+Optional speichert ein persistenter Speicher (z.B. die Tabelle
+geocode_cache, app/services/geocode_cache.py) Nominatim-Ergebnisse
+prozess- und deploymentübergreifend — ein Ort wird so nur einmal online
+nachgeschlagen.
+
+Fragen viele Anfragen gleichzeitig nach demselben, noch nicht gecachten
+Ort (Kampagnen-Link mit vorausgefülltem Ort), sucht nur eine davon
+(single flight), die anderen warten auf ihr Ergebnis. Alle Nominatim-
+Aufrufe laufen durch einen Token-Bucket (token_bucket.py) mit der
+erlaubten Rate des Anbieters.
 """
 
 import logging
-from typing import Optional
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Protocol
 
 from geopy.geocoders import Nominatim
 from timezonefinder import TimezoneFinder
 
+from .gazetteer import get_gazetteer, land_code, normalisiere_ort
+from .token_bucket import Gedrosselt, TokenBucket
+from .ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
-# Einfacher In-Memory-Cache
-_cache: dict[str, dict] = {}
+
+class GeocodeSpeicher(Protocol):
+    """Persistenter Cache für Geocoding-Ergebnisse (Schlüssel: cache_schluessel)."""
+
+    def laden(self, schluessel: list[str]) -> dict[str, dict]: ...
+
+    def speichern(self, schluessel: str, ort: str, ergebnis: dict) -> None: ...
+
+
+# LRU-Cache pro Prozess: cache_schluessel → Ergebnis bzw. Fehlermeldung
+_cache = TTLCache(
+    max_eintraege=10_000, max_bytes=16 * 1024 * 1024, ttl=30 * 86400, ttl_negativ=3600,
+)
 
 # Einmalig initialisieren
 _geolocator = Nominatim(user_agent="syncmaster_astro_v1", timeout=10)
 _timezone_finder = TimezoneFinder()
 
+# Nominatim für Orte, die das Ortsverzeichnis nicht kennt — höchstens
+# 1 Anfrage/s (Nutzungsrichtlinie), höchstens so lange in der Warteschlange
+_nominatim_fallback = True
+_nominatim_bucket = TokenBucket(rate=1.0, burst=1)
+_nominatim_wartezeit = 10.0
+_speicher: Optional[GeocodeSpeicher] = None
+
+# Laufende Auflösungen: cache_schluessel → Future (single flight)
+_laufend: dict[str, Future] = {}
+_laufend_lock = threading.Lock()
+_koalesziert = 0
 
-def get_coordinates(ort: str) -> dict:
+
+def configure_geocoding(
+    nominatim_fallback: bool,
+    cache_groesse: int = 10_000,
+    speicher: Optional[GeocodeSpeicher] = None,
+    cache_mb: float = 16,
+    ttl: float = 30 * 86400,
+    ttl_negativ: float = 3600,
+    nominatim_rate: float = 1.0,
+    nominatim_burst: int = 1,
+    nominatim_wartezeit: float = 10.0,
+) -> None:
+    """
+    Einmal beim Start, aus Settings (leert den LRU-Cache).
+
+    Args:
+        nominatim_fallback: Orte, die das Ortsverzeichnis nicht kennt, online suchen
+        cache_groesse: maximale Anzahl Orte im LRU-Cache dieses Prozesses
+        speicher: persistenter Cache (None = nur LRU)
+        cache_mb: maximaler (geschätzter) Speicher des LRU-Caches
+        ttl: Sekunden, die ein gefundener Ort im LRU bleibt
+        ttl_negativ: Sekunden, die "Ort nicht gefunden" im LRU bleibt (0 = nie cachen)
+        nominatim_rate: Nominatim-Anfragen pro Sekunde (dieses Prozesses)
+        nominatim_burst: so viele Anfragen dürfen ohne Abstand hintereinander
+        nominatim_wartezeit: maximale Sekunden in der Warteschlange des Buckets
+    """
+    global _nominatim_fallback, _speicher, _cache, _nominatim_bucket, _nominatim_wartezeit
+    _nominatim_fallback = nominatim_fallback
+    _speicher = speicher
+    _cache = TTLCache(cache_groesse, int(cache_mb * 1024 * 1024), ttl, ttl_negativ)
+    _nominatim_bucket = TokenBucket(nominatim_rate, nominatim_burst)
+    _nominatim_wartezeit = nominatim_wartezeit
+    logger.info(
+        "Geocoding: Ortsverzeichnis%s, LRU %d Orte / %.0f MB%s",
+        f" + Nominatim ({nominatim_rate:g}/s)" if nominatim_fallback else "",
+        _cache.max_eintraege,
+        cache_mb,
+        ", persistenter Cache" if speicher is not None else "",
+    )
+
+
+def cache_stats() -> dict:
+    """Zähler des LRU-Caches dieses Prozesses (für /api/admin/geocoding)."""
+    return _cache.stats()
+
+
+def upstream_stats() -> dict:
+    """Zähler des Nominatim-Buckets und des Single-Flight (für /api/admin/geocoding)."""
+    return {
+        **_nominatim_bucket.stats(),
+        "laufend": len(_laufend),
+        "koalesziert": _koalesziert,
+    }
+
+
+def cache_schluessel(ort: str) -> str:
+    """
+    Normierter Cache-Schlüssel eines Geburtsorts: Groß-/Kleinschreibung,
+    Leerzeichen, Umlaute und Satzzeichen egal, ein Länder-Suffix als
+    ISO-Code. "Bensheim,  BRD" / "bensheim, Deutschland" → "bensheim, de".
+    """
+    teile = [t for t in (normalisiere_ort(t) for t in ort.split(",")) if t]
+    if len(teile) > 1:
+        iso = land_code(teile[-1])
+        if iso:
+            teile[-1] = iso.lower()
+    return ", ".join(teile)
+
+
+def _aus_speicher(schluessel: list[str]) -> dict[str, dict]:
+    """Persistenter Cache — Fehler (DB weg) nur loggen, Geocoding geht weiter."""
+    if _speicher is None or not schluessel:
+        return {}
+    try:
+        return _speicher.laden(schluessel)
+    except Exception as e:
+        logger.warning("Geocode-Cache nicht lesbar: %s", e)
+        return {}
+
+
+def _rest(frist_bis: float | None) -> float | None:
+    return None if frist_bis is None else max(frist_bis - time.time(), 0.0)
+
+
+def get_coordinates(ort: str, frist_bis: float | None = None, wartezeit: float | None = None) -> dict:
     """
     Wandelt einen Ortsnamen in Koordinaten und Zeitzone um.
 
+    Reihenfolge: LRU-Cache → Ortsverzeichnis → persistenter Cache → Nominatim.
+    Auch "nicht gefunden" wird (kürzer) im LRU-Cache gehalten. Läuft für
+    denselben Schlüssel schon eine Auflösung, wird auf deren Ergebnis gewartet.
+
     Args:
         ort: Ortsname, z.B. "Bensheim, Deutschland"
+        frist_bis: Zeitpunkt (time.time()), bis zu dem ein Ergebnis da sein
+            muss — begrenzt das Warten im Nominatim-Bucket und auf eine
+            laufende Auflösung (None = nur Bucket-Wartezeit)
+        wartezeit: maximale Sekunden in der Nominatim-Warteschlange statt
+            der konfigurierten (z.B. länger für Bestellungen im Hintergrund)
 
     Returns:
         dict mit lat, lon, timezone, ort_vollstaendig
 
     Raises:
         ValueError: Wenn der Ort nicht gefunden wurde.
+        Gedrosselt: Wenn Nominatim nicht innerhalb der Frist angefragt werden darf.
+        TimeoutError: Wenn eine laufende Auflösung die Frist überschreitet.
     """
-    # Cache prüfen
-    cache_key = ort.strip().lower()
-    if cache_key in _cache:
+    global _koalesziert
+    schluessel = cache_schluessel(ort)
+    treffer = _cache.get(schluessel)
+    if treffer is not None:
+        negativ, wert = treffer
         logger.debug("Cache-Hit für: %s", ort)
-        return _cache[cache_key]
+        if negativ:
+            raise ValueError(wert)
+        return wert
+
+    with _laufend_lock:
+        future = _laufend.get(schluessel)
+        fuehrend = future is None
+        if fuehrend:
+            future = _laufend[schluessel] = Future()
+        else:
+            _koalesziert += 1
+    if not fuehrend:
+        logger.debug("Warte auf laufendes Geocoding für: %s", ort)
+        try:
+            return future.result(timeout=_rest(frist_bis))
+        except Gedrosselt:
+            # Die Frist der laufenden Auflösung war kürzer — selbst anstellen
+            return get_coordinates(ort, frist_bis, wartezeit)
+
+    try:
+        result = _aufloesen(ort, schluessel, frist_bis, wartezeit)
+    except BaseException as e:
+        if isinstance(e, ValueError):
+            _cache.put(schluessel, str(e), negativ=True)
+        future.set_exception(e)
+        raise
+    else:
+        _cache.put(schluessel, result)
+        future.set_result(result)
+    finally:
+        with _laufend_lock:
+            _laufend.pop(schluessel, None)
+
+    logger.info(
+        "Geocoding: '%s' → %s, %s (%s)", ort, result["lat"], result["lon"], result["timezone"],
+    )
+
+    return result
+
+
+def _aufloesen(ort: str, schluessel: str, frist_bis: float | None, wartezeit: float | None = None) -> dict:
+    """Ortsverzeichnis → persistenter Cache → Nominatim (ohne LRU)."""
+    gazetteer = get_gazetteer()
+    result = gazetteer.suche(ort) if gazetteer is not None else None
+    if result is None:
+        result = _aus_speicher([schluessel]).get(schluessel)
+    if result is None:
+        if not _nominatim_fallback:
+            raise ValueError(f"Ort nicht gefunden: '{ort}'")
+        result = _nominatim(ort, frist_bis, wartezeit)
+        if _speicher is not None:
+            try:
+                _speicher.speichern(schluessel, ort, result)
+            except Exception as e:
+                logger.warning("Geocode-Cache nicht beschreibbar: %s", e)
+    return result
+
+
+def vorladen(orte: list[str]) -> int:
+    """
+    Lädt Orte (z.B. die häufigsten Geburtsorte) in den LRU-Cache — aus dem
+    Ortsverzeichnis bzw. in einer Abfrage aus dem persistenten Cache, nie
+    über Nominatim.
+
+    Returns:
+        Anzahl Orte, die danach im Cache liegen.
+    """
+    gazetteer = get_gazetteer()
+    fehlend: dict[str, str] = {}
+    geladen = 0
+    for ort in orte:
+        schluessel = cache_schluessel(ort)
+        if not schluessel or schluessel in fehlend:
+            continue
+        if schluessel in _cache:
+            geladen += 1
+            continue
+        result = gazetteer.suche(ort) if gazetteer is not None else None
+        if result is None:
+            fehlend[schluessel] = ort
+            continue
+        _cache.put(schluessel, result)
+        geladen += 1
 
-    # Geocoding
+    for schluessel, result in _aus_speicher(list(fehlend)).items():
+        _cache.put(schluessel, result)
+        geladen += 1
+    return geladen
+
+
+def _nominatim(ort: str, frist_bis: float | None = None, wartezeit: float | None = None) -> dict:
+    """Online-Geocoding über Nominatim (durch den Token-Bucket) + Zeitzone per timezonefinder."""
+    wartezeit = _nominatim_wartezeit if wartezeit is None else wartezeit
+    rest = _rest(frist_bis)
+    _nominatim_bucket.warten(wartezeit if rest is None else min(wartezeit, rest))
     location = _geolocator.geocode(ort, language="de")
     if location is None:
         raise ValueError(f"Ort nicht gefunden: '{ort}'")
@@ -55,15 +289,22 @@ def get_coordinates(ort: str) -> dict:
             f"Zeitzone konnte nicht bestimmt werden für: '{ort}' ({lat}, {lon})"
         )
 
-    result = {
+    return {
         "lat": round(lat, 4),
         "lon": round(lon, 4),
         "timezone": timezone,
         "ort_vollstaendig": location.address,
     }
 
-    # Cachen
-    _cache[cache_key] = result
-    logger.info("Geocoding: '%s' → %s, %s (%s)", ort, lat, lon, timezone)
 
-    return result
+def zeitzone_fuer(lat: float, lon: float) -> str:
+    """
+    Zeitzone zu Koordinaten (timezonefinder, offline).
+
+    Raises:
+        ValueError: Wenn an der Stelle keine Zeitzone bekannt ist.
+    """
+    timezone = _timezone_finder.timezone_at(lat=lat, lng=lon)
+    if timezone is None:
+        raise ValueError(f"Zeitzone konnte nicht bestimmt werden für ({lat}, {lon})")
+    return timezone
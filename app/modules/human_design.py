@@ -8,16 +8,21 @@ VEREINFACHUNG FÜR MVP:
 - Nur Personality-Sonne und Design-Sonne (88° vorher) werden für
   die Gate-Aktivierung genutzt, plus Mond, Nordknoten, und die
   klassischen Planeten.
-- Dies ist eine Approximation — die Pro-Version wird alle 26 Aktivierungen
-  (13 Personality + 13 Design) vollständig berechnen.
+- Dies ist eine Approximation — intern als "simplified" markiert.
 
-Intern als "simplified" markiert.
+PRO-VERSION (vollstaendig=True):
+- Alle 26 Aktivierungen (13 Personality + 13 Design) inkl. Erde und
+  Südknoten, jeweils als Gate.Linie (z.B. "41.3"). Aus denselben Charts
+  des ChartContext wie der Rest des Reports (+ mittlerer Mondknoten);
+  Erde und Südknoten sind Sonne/Nordknoten + 180°.
 """
 
 import logging
-from datetime import datetime, timedelta
+from functools import lru_cache
 
-from kerykeion import AstrologicalSubjectFactory
+from .birth_moment import BirthMoment
+from .chart_context import ChartContext
+from .ephemeris import solar_arc_julian_day
 
 logger = logging.getLogger(__name__)
 
@@ -50,15 +55,21 @@ GATE_WHEEL = [
 ]
 
 
-def _ecliptic_to_gate(longitude: float) -> int:
-    """Wandelt ekliptische Länge (tropisch, 0–360°) in ein I-Ching Gate."""
-    longitude = longitude % 360.0
+# Gate = 5.625°, Linie = 0.9375° (6 Linien pro Gate) → 384 Linien im Rad
+GATE_BREITE = 360.0 / 64
+LINIEN_BREITE = GATE_BREITE / 6
+_GATE_NACH_INDEX = tuple(gate for _, gate in GATE_WHEEL)
+
 
-    for i in range(len(GATE_WHEEL) - 1, -1, -1):
-        if longitude >= GATE_WHEEL[i][0]:
-            return GATE_WHEEL[i][1]
+def _gate_und_linie(longitude: float) -> tuple[int, int]:
+    """Ekliptische Länge → (Gate 1–64, Linie 1–6) per Index-Arithmetik."""
+    linie = int(longitude % 360.0 / LINIEN_BREITE) % 384
+    return _GATE_NACH_INDEX[linie // 6], linie % 6 + 1
 
-    return GATE_WHEEL[-1][1]
+
+def _ecliptic_to_gate(longitude: float) -> int:
+    """Wandelt ekliptische Länge (tropisch, 0–360°) in ein I-Ching Gate."""
+    return _GATE_NACH_INDEX[int(longitude % 360.0 / GATE_BREITE) % 64]
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -132,34 +143,37 @@ CHANNELS = {
     (15, 5): ("g_zentrum", "sakral"),
 }
 
-# Motorische Zentren
-MOTOR_ZENTREN = {"sakral", "solar_plexus", "herz", "wurzel"}
-
+# Sonnenbogen zwischen Design- und Personality-Moment
+DESIGN_SONNENBOGEN = 88.0
 
-def _get_activated_gates(subject) -> set[int]:
-    """Extrahiert alle aktivierten Gates aus einem kerykeion-Subject."""
-    gates = set()
-    planets = [
-        subject.sun, subject.moon, subject.mercury, subject.venus,
-        subject.mars, subject.jupiter, subject.saturn,
-        subject.uranus, subject.neptune, subject.pluto,
-    ]
-
-    # Nordknoten
-    if subject.mean_north_lunar_node:
-        planets.append(subject.mean_north_lunar_node)
+# ═══════════════════════════════════════════════════════════════════
+# BITMASKEN
+# Aktivierte Gates: 64-Bit-Maske (Bit gate−1). Jeder Kanal hat eine
+# vorberechnete Gate-Maske und eine "Kante" zwischen zwei Zentren.
+# CHANNELS enthält jeden Kanal doppelt (beide Richtungen) — es zählt
+# der erste Eintrag, wie bisher.
+# ═══════════════════════════════════════════════════════════════════
 
-    for planet in planets:
-        if planet and planet.abs_pos is not None:
-            gate = _ecliptic_to_gate(planet.abs_pos)
-            gates.add(gate)
+ZENTREN = (
+    "kopf", "ajna", "kehle", "g_zentrum", "herz",
+    "solar_plexus", "sakral", "milz", "wurzel",
+)
+_ZENTRUM_BIT = {z: 1 << i for i, z in enumerate(ZENTREN)}
 
-    return gates
+# Motorische Zentren
+MOTOR_ZENTREN = {"sakral", "solar_plexus", "herz", "wurzel"}
+_MOTOR_MASKE = sum(_ZENTRUM_BIT[z] for z in MOTOR_ZENTREN)
+_KEHLE = _ZENTRUM_BIT["kehle"]
+_SAKRAL = _ZENTRUM_BIT["sakral"]
 
 
-def _find_defined_channels(active_gates: set[int]) -> list[tuple]:
-    """Findet alle komplett definierten Kanäle (beide Gates aktiv)."""
-    defined = []
+def _build_kanaele() -> tuple[tuple, tuple[int, ...]]:
+    """
+    Kanäle als (gate_maske, gate_a, gate_b, zentrum_a, zentrum_b, kanten_bit)
+    plus die Zentren-Maske jeder Kante (verschiedene Zentren-Paare).
+    """
+    kanaele = []
+    kanten: list[int] = []
     seen = set()
 
     for (gate_a, gate_b), (zentrum_a, zentrum_b) in CHANNELS.items():
@@ -168,48 +182,123 @@ def _find_defined_channels(active_gates: set[int]) -> list[tuple]:
             continue
         seen.add(key)
 
-        if gate_a in active_gates and gate_b in active_gates:
-            defined.append((gate_a, gate_b, zentrum_a, zentrum_b))
+        zentren = _ZENTRUM_BIT[zentrum_a] | _ZENTRUM_BIT[zentrum_b]
+        if zentren not in kanten:
+            kanten.append(zentren)
+        gate_maske = 1 << (gate_a - 1) | 1 << (gate_b - 1)
+        kanaele.append((gate_maske, gate_a, gate_b, zentrum_a, zentrum_b, 1 << kanten.index(zentren)))
 
-    return defined
+    return tuple(kanaele), tuple(kanten)
 
 
-def _find_defined_zentren(channels: list[tuple]) -> set[str]:
-    """Bestimmt welche Zentren durch Kanäle definiert sind."""
-    zentren = set()
-    for _, _, z_a, z_b in channels:
-        zentren.add(z_a)
-        zentren.add(z_b)
-    return zentren
+_KANAELE, _KANTEN = _build_kanaele()
 
 
-def _is_motor_to_throat(channels: list[tuple], defined_zentren: set[str]) -> bool:
-    """Prüft ob ein motorisches Zentrum direkt oder indirekt mit der Kehle verbunden ist."""
-    # Adjazenzliste aufbauen
-    adjacency: dict[str, set[str]] = {}
-    for _, _, z_a, z_b in channels:
-        adjacency.setdefault(z_a, set()).add(z_b)
-        adjacency.setdefault(z_b, set()).add(z_a)
+def _gate_maske(subject, linien: dict[str, int] | None = None) -> int:
+    """
+    Aktivierte Gates eines Charts als Bitmaske.
 
-    # BFS von jedem Motor zur Kehle
-    for motor in MOTOR_ZENTREN:
-        if motor not in defined_zentren:
-            continue
+    linien: optional, wird mit der Linie jedes Körpers befüllt (z.B. "sun" → 3).
+    """
+    maske = 0
+    for body in (
+        "sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn",
+        "uranus", "neptune", "pluto", "mean_north_lunar_node",
+    ):
+        planet = getattr(subject, body, None)
+        if planet and planet.abs_pos is not None:
+            gate, linie = _gate_und_linie(planet.abs_pos)
+            maske |= 1 << (gate - 1)
+            if linien is not None:
+                linien[body] = linie
+    return maske
+
+
+# 13 Aktivierungen pro Moment: Name → (Körper, Versatz in Grad)
+AKTIVIERUNGEN = {
+    "sonne": ("sun", 0.0),
+    "erde": ("sun", 180.0),
+    "mond": ("moon", 0.0),
+    "nordknoten": ("mean_north_lunar_node", 0.0),
+    "suedknoten": ("mean_north_lunar_node", 180.0),
+    "merkur": ("mercury", 0.0),
+    "venus": ("venus", 0.0),
+    "mars": ("mars", 0.0),
+    "jupiter": ("jupiter", 0.0),
+    "saturn": ("saturn", 0.0),
+    "uranus": ("uranus", 0.0),
+    "neptun": ("neptune", 0.0),
+    "pluto": ("pluto", 0.0),
+}
 
-        visited = set()
-        queue = [motor]
-        while queue:
-            current = queue.pop(0)
-            if current == "kehle":
-                return True
-            if current in visited:
-                continue
-            visited.add(current)
-            for neighbor in adjacency.get(current, []):
-                if neighbor not in visited:
-                    queue.append(neighbor)
 
-    return False
+def _aktivierungen(chart, mondknoten: float) -> tuple[dict[str, str], int, int]:
+    """
+    Alle 13 Aktivierungen eines Moments aus seinem Chart (ChartContext)
+    und dem mittleren Mondknoten.
+
+    Returns:
+        ({"sonne": "41.3", ...}, gate_maske, sonnen_linie)
+    """
+    aktivierungen = {}
+    maske = 0
+    for name, (body, versatz) in AKTIVIERUNGEN.items():
+        pos = mondknoten if body == "mean_north_lunar_node" else getattr(chart, body).abs_pos
+        gate, linie = _gate_und_linie(pos + versatz)
+        aktivierungen[name] = f"{gate}.{linie}"
+        maske |= 1 << (gate - 1)
+    sonnen_linie = _gate_und_linie(chart.sun.abs_pos)[1]
+    return aktivierungen, maske, sonnen_linie
+
+
+def _gates_aus_maske(maske: int) -> list[int]:
+    """Bitmaske → sortierte Gate-Liste."""
+    return [i + 1 for i in range(64) if maske >> i & 1]
+
+
+def _find_defined_channels(gate_maske: int) -> tuple[list[tuple], int]:
+    """Definierte Kanäle (beide Gates aktiv) und deren Kanten-Maske."""
+    defined = []
+    kanten_maske = 0
+    for kanal_maske, gate_a, gate_b, zentrum_a, zentrum_b, kanten_bit in _KANAELE:
+        if gate_maske & kanal_maske == kanal_maske:
+            defined.append((gate_a, gate_b, zentrum_a, zentrum_b))
+            kanten_maske |= kanten_bit
+    return defined, kanten_maske
+
+
+@lru_cache(maxsize=None)
+def _zentren_analyse(kanten_maske: int) -> tuple[int, bool]:
+    """
+    Definierte Zentren (Bitmaske) und Motor→Kehle-Verbindung für eine
+    Kanten-Maske (16 Zentren-Paare → höchstens 65.536 Einträge).
+
+    Der Typ hängt nur von dieser Maske ab, nicht von den einzelnen Gates;
+    jede Kombination wird einmal pro Prozess berechnet.
+    """
+    kanten = [z for i, z in enumerate(_KANTEN) if kanten_maske >> i & 1]
+    definiert = 0
+    for zentren in kanten:
+        definiert |= zentren
+
+    # Zusammenhangskomponente der Kehle (Fixpunkt über die Kanten)
+    erreichbar = _KEHLE
+    while True:
+        neu = erreichbar
+        for zentren in kanten:
+            if zentren & neu:
+                neu |= zentren
+        if neu == erreichbar:
+            break
+        erreichbar = neu
+
+    motor_to_throat = bool(erreichbar & definiert & _MOTOR_MASKE)
+    return definiert, motor_to_throat
+
+
+def _zentren_namen(maske: int) -> list[str]:
+    """Zentren-Bitmaske → sortierte Namen."""
+    return sorted(z for z, bit in _ZENTRUM_BIT.items() if maske & bit)
 
 
 def _determine_type(
@@ -259,74 +348,69 @@ def _determine_type(
 
 
 def calculate_human_design_type(
-    geburtsdatum: str,
-    geburtszeit: str,
-    lat: float,
-    lon: float,
-    timezone: str,
+    moment: BirthMoment,
+    ctx: ChartContext | None = None,
+    vollstaendig: bool = False,
 ) -> dict:
     """
-    Berechnet den Human Design Typ (vereinfacht für MVP).
+    Berechnet den Human Design Typ (vereinfacht für MVP, vollständig für Pro).
 
     Args:
-        geburtsdatum: DD.MM.YYYY
-        geburtszeit: HH:MM
-        lat, lon: Koordinaten
-        timezone: IANA Timezone
+        moment: Geburtsmoment (Ortszeit, Koordinaten, Zeitzone)
+        ctx: Geteilter Chart-Kontext (optional, sonst eigener)
+        vollstaendig: Alle 26 Aktivierungen (Pro-Version)
 
     Returns:
-        dict mit typ, strategie, autoritaet, kurzinfo, _simplified
+        dict mit typ, strategie, autoritaet, kurzinfo, profil, _simplified
+        (+ aktivierungen bei vollstaendig)
     """
-    teile = geburtsdatum.split(".")
-    tag, monat, jahr = int(teile[0]), int(teile[1]), int(teile[2])
-
-    zeit_teile = geburtszeit.split(":")
-    stunde, minute = int(zeit_teile[0]), int(zeit_teile[1])
-
-    # Personality-Chart (Geburtsmoment)
-    personality = AstrologicalSubjectFactory.from_birth_data(
-        name="Personality",
-        year=jahr, month=monat, day=tag,
-        hour=stunde, minute=minute,
-        lng=lon, lat=lat, tz_str=timezone,
-        zodiac_type="Tropical",
-        online=False,
-    )
-
-    # Design-Chart (~88 Tage / ~88° Sonnenbogen vorher)
-    geburt_dt = datetime(jahr, monat, tag, stunde, minute)
-    design_dt = geburt_dt - timedelta(days=88)
-
-    design = AstrologicalSubjectFactory.from_birth_data(
-        name="Design",
-        year=design_dt.year, month=design_dt.month, day=design_dt.day,
-        hour=design_dt.hour, minute=design_dt.minute,
-        lng=lon, lat=lat, tz_str=timezone,
-        zodiac_type="Tropical",
-        online=False,
-    )
-
-    # Gates sammeln
-    personality_gates = _get_activated_gates(personality)
-    design_gates = _get_activated_gates(design)
-    all_gates = personality_gates | design_gates
+    # Design-Moment: Sonne exakt 88° vorher (nicht 88 Tage — je nach
+    # Jahreszeit liegen dazwischen ~86–91 Tage)
+    geburt_jd = moment.julian_day
+    design_jd = solar_arc_julian_day(geburt_jd, DESIGN_SONNENBOGEN)
+
+    if ctx is None:
+        ctx = ChartContext()
+
+    # Personality-Chart (Geburtsmoment) — identisch mit dem tropischen Chart
+    personality = ctx.chart_for(moment)
+    design = ctx.chart_at(design_jd, moment.lat, moment.lon)
+
+    aktivierungen = None
+    if vollstaendig:
+        # Pro: 13 Aktivierungen pro Moment
+        personality_akt, personality_gates, personality_linie = _aktivierungen(
+            personality, ctx.mondknoten(geburt_jd),
+        )
+        design_akt, design_gates, design_linie = _aktivierungen(design, ctx.mondknoten(design_jd))
+        aktivierungen = {"personality": personality_akt, "design": design_akt}
+    else:
+        # Gates sammeln (Bitmasken) — Sonnen-Linien ergeben das Profil
+        personality_linien: dict[str, int] = {}
+        design_linien: dict[str, int] = {}
+        personality_gates = _gate_maske(personality, personality_linien)
+        design_gates = _gate_maske(design, design_linien)
+        personality_linie, design_linie = personality_linien["sun"], design_linien["sun"]
 
     # Kanäle und Zentren bestimmen
-    channels = _find_defined_channels(all_gates)
-    defined_zentren = _find_defined_zentren(channels)
+    channels, kanten_maske = _find_defined_channels(personality_gates | design_gates)
+    zentren_maske, motor_to_throat = _zentren_analyse(kanten_maske)
+    defined_zentren = _zentren_namen(zentren_maske)
 
-    sakral_defined = "sakral" in defined_zentren
-    motor_to_throat = _is_motor_to_throat(channels, defined_zentren)
+    sakral_defined = bool(zentren_maske & _SAKRAL)
 
     # Typ bestimmen
-    result = _determine_type(sakral_defined, motor_to_throat, bool(defined_zentren))
+    result = _determine_type(sakral_defined, motor_to_throat, bool(zentren_maske))
+    result["profil"] = f"{personality_linie}/{design_linie}"
+    if aktivierungen is not None:
+        result["aktivierungen"] = aktivierungen
 
     # Meta-Info hinzufügen
-    result["_simplified"] = True
-    result["_personality_gates"] = sorted(personality_gates)
-    result["_design_gates"] = sorted(design_gates)
+    result["_simplified"] = not vollstaendig
+    result["_personality_gates"] = _gates_aus_maske(personality_gates)
+    result["_design_gates"] = _gates_aus_maske(design_gates)
     result["_defined_channels"] = [(a, b) for a, b, _, _ in channels]
-    result["_defined_zentren"] = sorted(defined_zentren)
+    result["_defined_zentren"] = defined_zentren
 
     logger.info(
         "Human Design: Typ=%s (Sakral=%s, Motor→Kehle=%s, Zentren=%s)",
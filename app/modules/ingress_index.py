@@ -0,0 +1,213 @@
+"""
+SyncMaster — Zeichen-Ingress-Index (1900–2030)
+
+Vorberechnete Ingress-Zeitpunkte (Zeichenwechsel) für Sonne, Mond und
+Planeten — tropisch und siderisch (Lahiri). Das Zeichen eines Körpers zu
+einem beliebigen Zeitpunkt ist damit eine binäre Suche statt eines
+Ephemeriden-Aufrufs (Mikrosekunden statt Millisekunden).
+
+Der siderische Index kodiert zusätzlich die Ophiuchus-Zone
+(Bit OPHIUCHUS_FLAG), damit auch der Ophiuchus-Check ohne Ephemeride geht.
+
+Erzeugen (einmalig, z.B. beim Docker-Build):
+    python -m app.modules.ingress_index [pfad]
+
+Dateiformat (little-endian, per mmap geladen):
+    Header:  b"AMIX" | u32 version | u32 anzahl_tabellen
+    Tabelle: 16s körper | 16s variante | u32 n | u64 offset
+    Daten:   f64 jd[n] | u8 code[n + 1]   (code[i] gilt vor jd[i])
+"""
+
+import bisect
+import logging
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+import swisseph as swe
+
+from .ephemeris import BODIES, DEFAULT_BODIES, SIGN_CODES, ayanamsa, ensure_ephe_path, get_flags
+from .zodiac_index import get_zodiac_index
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "ingress_index.bin"
+
+VARIANTE_TROPISCH = "tropisch"
+VARIANTE_SIDERISCH = "siderisch"
+VARIANTEN = (VARIANTE_TROPISCH, VARIANTE_SIDERISCH)
+
+# Code-Bit für Positionen in der Ophiuchus-Zone (nur siderisch)
+OPHIUCHUS_FLAG = 0x10
+
+# Abgedeckter Zeitraum (GratisCheckRequest: 1900–2030), mit Rand
+START_JD = swe.julday(1899, 12, 1, 0.0)
+END_JD = swe.julday(2031, 2, 1, 0.0)
+
+# Schrittweite der Grobsuche in Tagen (muss kürzer als jedes Segment sein)
+_SCHRITT = {"moon": 0.25}
+_SCHRITT_STANDARD = 1.0
+
+# Genauigkeit der Ingress-Zeitpunkte (Tage, ~1 Sekunde)
+_GENAUIGKEIT = 1.0 / 86400.0
+
+# Grenzfall-Fenster: ±1 Tag deckt auch eine fehlende Geburtszeit ab
+GRENZFALL_FENSTER = 1.0
+
+_MAGIC = b"AMIX"
+_VERSION = 2  # 2: Ophiuchus-Grenzen aus config/ophiuchus.yaml
+_HEADER = struct.Struct("<4sII")
+_TABELLE = struct.Struct("<16s16sIQ")
+
+
+def _code(body: str, jd: float, variante: str) -> int:
+    """Zeichen-Code (0–11, siderisch ggf. | OPHIUCHUS_FLAG) eines Körpers."""
+    lon = swe.calc_ut(jd, BODIES[body], get_flags())[0][0]
+    if variante == VARIANTE_TROPISCH:
+        return int(lon // 30.0) % 12
+
+    eintrag = get_zodiac_index().lookup(lon - ayanamsa(jd, "LAHIRI"))
+    code = eintrag.zeichen_code
+    if eintrag.ist_ophiuchus:
+        code |= OPHIUCHUS_FLAG
+    return code
+
+
+def _build_table(body: str, variante: str) -> tuple[list[float], list[int]]:
+    """Sucht alle Ingresse eines Körpers im Zeitraum (Grobsuche + Bisektion)."""
+    schritt = _SCHRITT.get(body, _SCHRITT_STANDARD)
+    jds: list[float] = []
+    codes = [_code(body, START_JD, variante)]
+
+    links = START_JD
+    while links < END_JD:
+        rechts = links + schritt
+        code_rechts = _code(body, rechts, variante)
+        if code_rechts != codes[-1]:
+            a, b = links, rechts
+            while b - a > _GENAUIGKEIT:
+                mitte = (a + b) / 2.0
+                if _code(body, mitte, variante) == codes[-1]:
+                    a = mitte
+                else:
+                    b = mitte
+            jds.append(b)
+            codes.append(code_rechts)
+        links = rechts
+
+    return jds, codes
+
+
+def build_index(path: Path = INDEX_PATH) -> Path:
+    """Erzeugt die Index-Datei für alle Standard-Körper und beide Varianten."""
+    ensure_ephe_path()
+    tabellen = []
+    for variante in VARIANTEN:
+        for body in DEFAULT_BODIES:
+            jds, codes = _build_table(body, variante)
+            tabellen.append((body, variante, jds, codes))
+            logger.info("Ingress-Index: %s/%s → %d Ingresse", body, variante, len(jds))
+
+    offset = _HEADER.size + _TABELLE.size * len(tabellen)
+    kopf = [_HEADER.pack(_MAGIC, _VERSION, len(tabellen))]
+    daten = []
+    for body, variante, jds, codes in tabellen:
+        kopf.append(_TABELLE.pack(body.encode(), variante.encode(), len(jds), offset))
+        block = struct.pack(f"<{len(jds)}d", *jds) + bytes(codes)
+        daten.append(block)
+        offset += len(block)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"".join(kopf + daten))
+
+    logger.info("Ingress-Index gespeichert: %s (%d Bytes)", path, offset)
+    return path
+
+
+class IngressIndex:
+    """Per mmap geladener Ingress-Index (read-only, threadsicher)."""
+
+    def __init__(self, path: Path = INDEX_PATH):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, anzahl = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Ungültige Ingress-Index-Datei: {path}")
+
+        view = memoryview(self._mmap)
+        self._tabellen: dict[tuple[str, str], tuple[memoryview, memoryview]] = {}
+        for i in range(anzahl):
+            body, variante, n, offset = _TABELLE.unpack_from(
+                self._mmap, _HEADER.size + i * _TABELLE.size
+            )
+            key = (body.rstrip(b"\0").decode(), variante.rstrip(b"\0").decode())
+            jds = view[offset:offset + 8 * n].cast("d")
+            codes = view[offset + 8 * n:offset + 9 * n + 1]
+            self._tabellen[key] = (jds, codes)
+
+    @staticmethod
+    def deckt(jd: float) -> bool:
+        """Liegt der Zeitpunkt im indizierten Zeitraum (inkl. Grenzfall-Fenster)?"""
+        return START_JD + GRENZFALL_FENSTER <= jd < END_JD - GRENZFALL_FENSTER
+
+    def _tabelle(self, body: str, jd: float, variante: str):
+        if not START_JD <= jd < END_JD:
+            raise ValueError(f"Zeitpunkt außerhalb des Index (1900–2030): JD {jd}")
+        return self._tabellen[(body, variante)]
+
+    def code(self, body: str, jd: float, variante: str = VARIANTE_TROPISCH) -> int:
+        """Roher Zeichen-Code (inkl. OPHIUCHUS_FLAG bei siderisch)."""
+        jds, codes = self._tabelle(body, jd, variante)
+        return codes[bisect.bisect_right(jds, jd)]
+
+    def sign(self, body: str, jd: float, variante: str = VARIANTE_TROPISCH) -> str:
+        """Zeichen als kerykeion-Code (z.B. "Gem")."""
+        return SIGN_CODES[self.code(body, jd, variante) & 0x0F]
+
+    def ist_ophiuchus(self, body: str, jd: float) -> bool:
+        """Liegt die siderische Position in der Ophiuchus-Zone?"""
+        return bool(self.code(body, jd, VARIANTE_SIDERISCH) & OPHIUCHUS_FLAG)
+
+    def ist_grenzfall(
+        self,
+        body: str,
+        jd: float,
+        variante: str = VARIANTE_TROPISCH,
+        fenster: float = GRENZFALL_FENSTER,
+    ) -> bool:
+        """True wenn innerhalb von ±fenster Tagen ein Zeichenwechsel liegt."""
+        jds, _ = self._tabelle(body, jd, variante)
+        i = bisect.bisect_left(jds, jd - fenster)
+        return i < len(jds) and jds[i] <= jd + fenster
+
+
+_index: IngressIndex | None = None
+_geladen = False
+
+
+def get_index() -> IngressIndex | None:
+    """Lädt den Index einmalig; None wenn die Datei (noch) nicht erzeugt wurde."""
+    global _index, _geladen
+    if _geladen:
+        return _index
+
+    _geladen = True
+    if not INDEX_PATH.exists():
+        logger.warning("Ingress-Index fehlt (%s) — Zeichen kommen aus der Ephemeride", INDEX_PATH)
+        return None
+
+    try:
+        _index = IngressIndex(INDEX_PATH)
+    except ValueError as e:
+        logger.warning("%s — bitte neu erzeugen; Zeichen kommen aus der Ephemeride", e)
+        return None
+    logger.info("Ingress-Index geladen: %s", INDEX_PATH)
+    return _index
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    build_index(Path(sys.argv[1]) if len(sys.argv) > 1 else INDEX_PATH)
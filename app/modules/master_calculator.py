@@ -3,10 +3,17 @@ SyncMaster — Master Calculator
 
 Orchestriert alle Berechnungsmodule und gibt ein komplettes
 Ergebnis-Dictionary für eine Person zurück.
+
+Nach Geocoding und Geburtsmoment sind Tropisch, Siderisch, Sternbilder
+und Human Design voneinander unabhängig — mit einem Executor laufen sie
+gleichzeitig; Element und Dekan folgen danach aus der siderischen Sonne.
 """
 
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from pathlib import Path
 
@@ -14,16 +21,155 @@ import sys
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from utils import safe_filename
 
+from .birth_moment import BirthMoment
+from .chart_context import ChartContext
 from .geocoding import get_coordinates
 from .numerology import calculate_lebenszahl
 from .tropical import calculate_tropical
 from .sidereal import calculate_sidereal
-from .elements import get_element
-from .egyptian_dekans import get_dekan
+from .constellations import TIERKREIS_KONSTELLATIONEN, TIERKREIS_SIDERISCH, calculate_constellations
+from .zodiac_index import get_zodiac_index
 from .human_design import calculate_human_design_type
 
 logger = logging.getLogger(__name__)
 
+# Modul-Key → Name in Log-Meldungen
+_MODUL_LOG_NAMEN = {
+    "tropisch": "Tropisch",
+    "siderisch": "Siderisch",
+    "konstellationen": "Sternbilder",
+    "human_design": "Human Design",
+}
+
+# Zeitbudget pro Modul in Sekunden (überschreibbar per calculate_all(budgets=...))
+MODUL_BUDGETS = {
+    "geocoding": 5.0,
+    "tropisch": 5.0,
+    "siderisch": 5.0,
+    "konstellationen": 10.0,
+    "human_design": 10.0,
+}
+
+# Timer feuern ggf. minimal zu früh — so nah an der Frist gilt sie als abgelaufen
+_FRIST_TOLERANZ = 0.01
+
+# Status je Modul in result["meta"]["module"]
+STATUS_OK = "ok"
+STATUS_FEHLER = "fehler"
+STATUS_ZEIT = "zeitueberschreitung"
+
+# Geocoding läuft mit Zeitbudget in einem Hilfs-Thread (kein swisseph)
+_geocoding_threads = ThreadPoolExecutor(max_workers=4, thread_name_prefix="geocoding")
+
+
+class Zeitplan:
+    """Gesamtfrist und Zeitbudgets der Module einer Berechnung."""
+
+    def __init__(self, frist_bis: float | None = None, budgets: dict | None = None):
+        self.frist_bis = frist_bis
+        self.budgets = {**MODUL_BUDGETS, **(budgets or {})}
+
+    def rest(self) -> float | None:
+        """Sekunden bis zur Gesamtfrist (None = keine Frist)."""
+        return None if self.frist_bis is None else self.frist_bis - time.time()
+
+    def limit(self, modul: str, seit: float | None = None) -> float | None:
+        """
+        Sekunden, die ein Modul (gestartet zum Zeitpunkt seit) noch laufen
+        darf: Budget des Moduls, höchstens bis zur Gesamtfrist.
+        """
+        grenzen = []
+        if self.budgets.get(modul) is not None:
+            grenzen.append(self.budgets[modul] - (time.time() - seit if seit else 0.0))
+        if self.frist_bis is not None:
+            grenzen.append(self.rest())
+        return max(min(grenzen), 0.0) if grenzen else None
+
+
+def _zeitueberschreitung(modul: str, zeitplan: Zeitplan) -> TimeoutError:
+    budget = zeitplan.budgets.get(modul)
+    rest = zeitplan.rest()
+    if budget is None or (rest is not None and rest <= _FRIST_TOLERANZ):
+        return TimeoutError("Frist der Berechnung abgelaufen")
+    return TimeoutError(f"Zeitbudget von {budget:.1f}s überschritten")
+
+
+def _ausfuehren(aufgaben: dict, zeitplan: Zeitplan, executor=None) -> dict:
+    """
+    Führt unabhängige Module aus: {modul: (funktion, args, kwargs)}.
+
+    Ohne Executor nacheinander mit einem gemeinsamen ChartContext (jedes
+    Chart nur einmal pro Berechnung); ein laufendes Modul kann dann nicht
+    abgebrochen werden — nach Ablauf der Gesamtfrist wird aber kein
+    weiteres mehr gestartet. Mit Executor als eigene Aufgaben (Funktionen
+    und Argumente müssen picklebar sein). In beiden Fällen wird verworfen,
+    wer sein Budget oder die Gesamtfrist überschreitet.
+
+    Eine Pool-Aufgabe, die schon läuft, lässt sich nicht abbrechen
+    (future.cancel() wirkt nur auf wartende): ein hängendes Modul belegt
+    seinen Worker und Pool-Platz, bis es endet.
+
+    Returns:
+        {modul: (Ergebnis oder Exception, Dauer in Sekunden)} in der
+        Reihenfolge der Aufgaben
+    """
+    ergebnisse = {}
+    if executor is None:
+        ctx = ChartContext()
+        for modul, (funktion, args, kwargs) in aufgaben.items():
+            start = time.time()
+            if zeitplan.limit(modul) == 0.0:
+                ergebnisse[modul] = (_zeitueberschreitung(modul, zeitplan), 0.0)
+                continue
+            try:
+                wert = funktion(*args, ctx=ctx, **kwargs)
+            except Exception as e:
+                wert = e
+            if not isinstance(wert, Exception) and zeitplan.limit(modul, seit=start) == 0.0:
+                # Zu spät fertig — wie im parallelen Fall verworfen
+                wert = _zeitueberschreitung(modul, zeitplan)
+            ergebnisse[modul] = (wert, time.time() - start)
+        return ergebnisse
+
+    futures = {}
+    for modul, (funktion, args, kwargs) in aufgaben.items():
+        start = time.time()
+        try:
+            futures[modul] = (executor.submit(funktion, *args, **kwargs), start)
+        except Exception as e:
+            ergebnisse[modul] = (e, time.time() - start)
+    for modul, (future, start) in futures.items():
+        try:
+            wert = future.result(timeout=zeitplan.limit(modul, seit=start))
+        except FutureTimeoutError:
+            future.cancel()
+            wert = _zeitueberschreitung(modul, zeitplan)
+        except Exception as e:
+            wert = e
+        ergebnisse[modul] = (wert, time.time() - start)
+    return {modul: ergebnisse[modul] for modul in aufgaben}
+
+
+def geocoding_mit_budget(ort: str, zeitplan: Zeitplan) -> dict:
+    """
+    get_coordinates() mit dem Geocoding-Budget des Zeitplans (ein hängender
+    Nominatim-Aufruf läuft im Hilfs-Thread weiter, sein Ergebnis wird verworfen).
+    Das Budget ist auch die Frist für die Warteschlange vor Nominatim.
+
+    Raises:
+        TimeoutError: Wenn Budget oder Gesamtfrist überschritten werden.
+        ValueError, Gedrosselt: Wie get_coordinates().
+    """
+    limit = zeitplan.limit("geocoding")
+    if limit is None:
+        return get_coordinates(ort)
+    future = _geocoding_threads.submit(get_coordinates, ort, time.time() + limit)
+    try:
+        return future.result(timeout=limit)
+    except FutureTimeoutError:
+        future.cancel()
+        raise _zeitueberschreitung("geocoding", zeitplan)
+
 
 def calculate_all(
     name: str,
@@ -31,12 +177,21 @@ def calculate_all(
     geburtszeit: str,
     geburtsort: str,
     save_json: bool = False,
+    version: str = "normal",
+    tierkreis: str = TIERKREIS_SIDERISCH,
+    geo: dict | Exception | None = None,
+    executor=None,
+    frist_bis: float | None = None,
+    budgets: dict | None = None,
 ) -> dict:
     """
     Führt alle Berechnungen durch und gibt ein komplettes Ergebnis zurück.
 
     Jedes Modul wird in try/except gewrappt — bei Fehler in einem Modul
-    wird der Rest trotzdem berechnet.
+    wird der Rest trotzdem berechnet. Module, die ihr Zeitbudget oder die
+    Gesamtfrist verpassen, stehen mit "Zeitbudget … überschritten" bzw.
+    "Frist … abgelaufen" in "fehler"; meta["module"] zeigt Status und
+    Dauer je Modul, meta["vollstaendig"] ob alle abgeschlossen wurden.
 
     Args:
         name: Vollständiger Name
@@ -44,10 +199,27 @@ def calculate_all(
         geburtszeit: HH:MM
         geburtsort: z.B. "Bensheim, Deutschland"
         save_json: Wenn True, wird das Ergebnis als .json gespeichert
+        version: "normal" oder "pro" (Pro: vollständiges Human Design)
+        tierkreis: "siderisch" (12 Zeichen + Ophiuchus-Flag) oder
+            "konstellationen" (IAU-Sternbilder, Ophiuchus als 13. Zeichen;
+            Element und Dekan folgen dann dem Sternbild der Sonne)
+        geo: Bereits aufgelöster Geburtsort (get_coordinates-Ergebnis) —
+            dann entfällt das Geocoding hier (z.B. im Ephemeriden-Pool);
+            eine Exception gilt als bereits fehlgeschlagenes Geocoding
+        executor: Optional ein Executor mit submit(funktion, *args, **kwargs)
+            → Future (z.B. der Ephemeriden-Pool). Dann laufen Tropisch,
+            Siderisch, Sternbilder und Human Design gleichzeitig, jedes mit
+            eigenem Chart-Kontext; ohne nacheinander mit geteiltem Kontext.
+        frist_bis: Zeitpunkt (time.time()), bis zu dem das Ergebnis
+            vorliegen muss — prozessübergreifend gültig (None = keine Frist)
+        budgets: Zeitbudgets je Modul in Sekunden, ergänzt MODUL_BUDGETS
+            (None als Wert = ohne Budget)
 
     Returns:
         Komplettes Ergebnis-Dictionary
     """
+    zeitplan = Zeitplan(frist_bis, budgets)
+    module = {}
     result = {
         "person": {
             "name": name,
@@ -63,93 +235,122 @@ def calculate_all(
         "dekan": None,
         "human_design": None,
         "meta": {
-            "version": "normal",
+            "version": version,
+            "tierkreis": tierkreis,
             "berechnet_am": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "ayanamsa": "Lahiri",
             "ayanamsa_wert": None,
+            "module": module,
+            "vollstaendig": False,
         },
         "fehler": [],
     }
 
-    # 1. Geocoding
-    try:
-        geo = get_coordinates(geburtsort)
-        result["geocoding"] = geo
-    except Exception as e:
-        logger.error("Geocoding fehlgeschlagen: %s", e)
-        result["fehler"].append({"modul": "geocoding", "fehler": str(e)})
-        return result  # Ohne Koordinaten geht nichts weiter
+    def erfassen(modul: str, wert, dauer: float | None = None, log_name: str | None = None) -> bool:
+        """Ergebnis oder Fehler eines Moduls eintragen; True bei Erfolg."""
+        if isinstance(wert, Exception):
+            logger.error("%s fehlgeschlagen: %s", log_name or modul.capitalize(), wert)
+            result["fehler"].append({"modul": modul, "fehler": str(wert)})
+            status = STATUS_ZEIT if isinstance(wert, TimeoutError) else STATUS_FEHLER
+        else:
+            result[modul] = wert
+            status = STATUS_OK
+        module[modul] = {
+            "status": status,
+            "dauer_ms": None if dauer is None else round(dauer * 1000, 1),
+        }
+        return status == STATUS_OK
 
-    lat = geo["lat"]
-    lon = geo["lon"]
-    timezone = geo["timezone"]
+    # 1. Geocoding
+    start = time.time()
+    if geo is None:
+        try:
+            geo = geocoding_mit_budget(geburtsort, zeitplan)
+        except Exception as e:
+            geo = e
+    if not erfassen("geocoding", geo, time.time() - start):
+        return _abschliessen(result, name)  # Ohne Koordinaten geht nichts weiter
 
-    # 2. Numerologie
+    # 2. Numerologie (braucht nur das Datum)
+    start = time.time()
     try:
-        result["numerologie"] = calculate_lebenszahl(geburtsdatum)
+        wert = calculate_lebenszahl(geburtsdatum)
     except Exception as e:
-        logger.error("Numerologie fehlgeschlagen: %s", e)
-        result["fehler"].append({"modul": "numerologie", "fehler": str(e)})
+        wert = e
+    erfassen("numerologie", wert, time.time() - start)
 
-    # 3. Tropische Positionen
+    # Geburtsmoment einmal parsen und nach UTC auflösen — alle Module teilen ihn
     try:
-        result["tropisch"] = calculate_tropical(
-            name, geburtsdatum, geburtszeit, lat, lon, timezone,
+        moment = BirthMoment.from_strings(
+            geburtsdatum, geburtszeit, geo["lat"], geo["lon"], geo["timezone"],
         )
     except Exception as e:
-        logger.error("Tropisch fehlgeschlagen: %s", e)
-        result["fehler"].append({"modul": "tropisch", "fehler": str(e)})
+        logger.error("Geburtsmoment ungültig: %s", e)
+        result["fehler"].append({"modul": "geburtsmoment", "fehler": str(e)})
+        return _abschliessen(result, name)  # Ohne gültige Ortszeit keine Positionen
 
-    # 4. Siderische Positionen (13 Zeichen)
-    try:
-        siderisch = calculate_sidereal(
-            name, geburtsdatum, geburtszeit, lat, lon, timezone,
-        )
-        result["siderisch"] = siderisch
+    # 3./4./4b./7. Unabhängige Module — mit Executor parallel, sonst nacheinander
+    aufgaben = {
+        "tropisch": (calculate_tropical, (name, moment), {}),
+        "siderisch": (calculate_sidereal, (name, moment), {}),
+    }
+    if tierkreis == TIERKREIS_KONSTELLATIONEN:
+        # IAU-Sternbilder (nur im Modus "konstellationen")
+        aufgaben["konstellationen"] = (calculate_constellations, (name, moment), {})
+    aufgaben["human_design"] = (
+        calculate_human_design_type, (moment,), {"vollstaendig": version == "pro"},
+    )
+
+    for modul, (wert, dauer) in _ausfuehren(aufgaben, zeitplan, executor).items():
+        erfassen(modul, wert, dauer, _MODUL_LOG_NAMEN[modul])
+
+    siderisch = result["siderisch"]
+    if siderisch:
+        result["meta"]["ayanamsa"] = siderisch.get("ayanamsa", "Lahiri")
         result["meta"]["ayanamsa_wert"] = siderisch.get("ayanamsa_wert")
-    except Exception as e:
-        logger.error("Siderisch fehlgeschlagen: %s", e)
-        result["fehler"].append({"modul": "siderisch", "fehler": str(e)})
 
-    # 5. Element (basierend auf siderischem Sonnenzeichen)
+    # 5./6. Element + Ägyptischer Dekan (ein Tierkreis-Eintrag der siderischen Sonne)
     if result["siderisch"]:
         try:
-            sonnenzeichen = result["siderisch"]["sonne"]["zeichen"]
-            result["element"] = get_element(sonnenzeichen)
-        except Exception as e:
-            logger.error("Element fehlgeschlagen: %s", e)
-            result["fehler"].append({"modul": "element", "fehler": str(e)})
+            sonne = result["siderisch"]["sonne"]
+            index = get_zodiac_index()
+            eintrag = index.lookup_zeichen(sonne["zeichen"], sonne["grad"])
+            element, dekan = eintrag.element_dict(), eintrag.dekan_dict()
 
-    # 6. Ägyptischer Dekan (basierend auf siderischer Sonne)
-    if result["siderisch"]:
-        try:
-            sonnenzeichen = result["siderisch"]["sonne"]["zeichen"]
-            grad = result["siderisch"]["sonne"]["grad"]
-            result["dekan"] = get_dekan(sonnenzeichen, grad)
+            # Sternbild-Modus: Sonne im Ophiuchus → Feuer-Wasser + Asklepios,
+            # sonst Element des Sternbilds (Dekane bleiben 10°-Abschnitte)
+            if result.get("konstellationen"):
+                sternbild = result["konstellationen"]["sonne"]["zeichen"]
+                if sternbild == index.ophiuchus_dekan.zeichen:
+                    dekan = index.ophiuchus_dekan.dekan_dict()
+                element = index.lookup_zeichen(sternbild, 0.0).element_dict()
         except Exception as e:
-            logger.error("Dekan fehlgeschlagen: %s", e)
-            result["fehler"].append({"modul": "dekan", "fehler": str(e)})
-
-    # 7. Human Design
-    try:
-        result["human_design"] = calculate_human_design_type(
-            geburtsdatum, geburtszeit, lat, lon, timezone,
-        )
-    except Exception as e:
-        logger.error("Human Design fehlgeschlagen: %s", e)
-        result["fehler"].append({"modul": "human_design", "fehler": str(e)})
+            element = dekan = e
+        erfassen("element", element, log_name="Element")
+        erfassen("dekan", dekan, log_name="Dekan")
 
-    # Fehler-Liste leeren wenn keine Fehler
-    if not result["fehler"]:
-        del result["fehler"]
+    result["meta"]["vollstaendig"] = (
+        not result["fehler"] and all(m["status"] == STATUS_OK for m in module.values())
+    )
+    result = _abschliessen(result, name)
 
     # Optional: JSON speichern
     if save_json:
         _save_result_json(result, name, geburtsdatum)
 
-    logger.info("Berechnung komplett für %s — %d Fehler",
-                name, len(result.get("fehler", [])))
+    return result
+
+
+def _abschliessen(result: dict, name: str) -> dict:
+    """Fehler-Liste entfernen, wenn leer; Zusammenfassung loggen."""
+    if not result["fehler"]:
+        del result["fehler"]
 
+    abgeschlossen = [m for m, info in result["meta"]["module"].items() if info["status"] == STATUS_OK]
+    logger.info(
+        "Berechnung komplett für %s — %d Fehler, abgeschlossen: %s",
+        name, len(result.get("fehler", [])), ", ".join(abgeschlossen) or "keine",
+    )
     return result
 
 
@@ -2,145 +2,154 @@
 SyncMaster — Siderische Astrologie (13 Zeichen inkl. Ophiuchus)
 
 DAS HERZSTÜCK: Berechnet siderische Positionen mit Lahiri-Ayanamsa.
-Nutzt kerykeions eingebauten Sidereal-Modus für korrekte 12-Zeichen-Zuordnung
-(passend zu Astro-Seek). Ophiuchus wird als Zusatz-Check geprüft.
+Siderische Längen = tropische Länge − Ayanamsa (swisseph, inkl. Nutation);
+identisch mit swissephs Sidereal-Modus (12-Zeichen, passend zu Astro-Seek),
+aber aus einem einzigen tropischen Durchlauf. Dadurch sind weitere
+Ayanamsa-Systeme für den Vergleich fast kostenlos.
+Ophiuchus wird als Zusatz-Check geprüft.
 """
 
 import logging
-from kerykeion import AstrologicalSubjectFactory
+from pathlib import Path
+
+import yaml
+
+from .birth_moment import BirthMoment
+from .chart_context import ChartContext
+from .ephemeris import SIDEREAL_MODES, ayanamsa
+from .ingress_index import VARIANTE_SIDERISCH, get_index
+from .zodiac_index import ZodiacRecord, get_zodiac_index
 
 logger = logging.getLogger(__name__)
 
-# Kerykeion 3-Letter-Codes → Deutsche Zeichennamen
-SIGN_MAP = {
-    "Ari": "Widder",
-    "Tau": "Stier",
-    "Gem": "Zwillinge",
-    "Can": "Krebs",
-    "Leo": "Löwe",
-    "Vir": "Jungfrau",
-    "Lib": "Waage",
-    "Sco": "Skorpion",
-    "Sag": "Schütze",
-    "Cap": "Steinbock",
-    "Aqu": "Wassermann",
-    "Pis": "Fische",
+# YAML-Konfiguration laden
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "ayanamsa.yaml"
+
+_ayanamsa_config: dict | None = None
+
+# Anzeigenamen der Ayanamsa-Systeme
+AYANAMSA_NAMEN = {
+    "LAHIRI": "Lahiri",
+    "FAGAN_BRADLEY": "Fagan-Bradley",
+    "RAMAN": "Raman",
+    "KRISHNAMURTI": "Krishnamurti",
 }
 
-# Ophiuchus-Zone in siderischen Graden (zwischen Skorpion und Schütze)
-# Siderisch: Skorpion endet bei ~240°, Schütze beginnt bei ~266°
-OPHIUCHUS_START = 240.0
-OPHIUCHUS_END = 266.0
+def _load_ayanamsa_config() -> dict:
+    """Lädt die Ayanamsa-Konfiguration aus YAML (lazy, einmalig)."""
+    global _ayanamsa_config
+    if _ayanamsa_config is not None:
+        return _ayanamsa_config
+
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        _ayanamsa_config = yaml.safe_load(f)
+
+    logger.debug("Ayanamsa-Konfiguration geladen aus %s", CONFIG_PATH)
+    return _ayanamsa_config
+
+
+def _mode_key(name: str) -> str:
+    """Normalisiert einen Ayanamsa-Namen ("fagan_bradley") auf den swisseph-Modus."""
+    key = name.strip().upper().replace("-", "_")
+    if key not in SIDEREAL_MODES:
+        raise ValueError(
+            f"Unbekanntes Ayanamsa: '{name}'. Erlaubt: {sorted(SIDEREAL_MODES)}"
+        )
+    return key
 
 
-def _translate_sign(code: str) -> str:
-    """Übersetzt Kerykeion-Zeichencode in deutschen Namen."""
-    return SIGN_MAP.get(code, code)
+def get_standard_ayanamsa() -> str:
+    """Konfiguriertes Standard-Ayanamsa als swisseph-Modus (z.B. "LAHIRI")."""
+    return _mode_key(_load_ayanamsa_config().get("standard", "lahiri"))
 
 
-def _check_ophiuchus(abs_pos: float) -> bool:
-    """Prüft ob eine siderische Position in der Ophiuchus-Zone liegt."""
-    return OPHIUCHUS_START <= abs_pos < OPHIUCHUS_END
+def get_vergleich_ayanamsas() -> list[str]:
+    """Konfigurierte Ayanamsa-Systeme für den Systemvergleich."""
+    return [_mode_key(n) for n in _load_ayanamsa_config().get("vergleich", [])]
+
+
+def _sidereal_pos(tropisch_abs: float, ayanamsa_wert: float) -> tuple[ZodiacRecord, float, float]:
+    """Tierkreis-Eintrag, Grad im Zeichen und absolute siderische Länge."""
+    abs_pos = (tropisch_abs - ayanamsa_wert) % 360.0
+    return get_zodiac_index().lookup(abs_pos), abs_pos % 30.0, abs_pos
 
 
 def calculate_sidereal(
     name: str,
-    geburtsdatum: str,
-    geburtszeit: str,
-    lat: float,
-    lon: float,
-    timezone: str,
+    moment: BirthMoment,
+    ctx: ChartContext | None = None,
+    ayanamsas: list[str] | None = None,
 ) -> dict:
     """
-    Berechnet siderische Positionen (Lahiri-Ayanamsa).
+    Berechnet siderische Positionen (Standard: Lahiri-Ayanamsa).
 
-    Nutzt kerykeions Sidereal-Modus direkt für die 12-Zeichen-Zuordnung
-    (kompatibel mit Astro-Seek). Ophiuchus wird als Zusatz-Flag gesetzt
-    wenn eine Position in der Zone 240°-266° liegt.
+    Die Positionen werden aus dem tropischen Chart minus Ayanamsa
+    abgeleitet (12-Zeichen-Zuordnung, kompatibel mit Astro-Seek).
+    Ophiuchus wird als Zusatz-Flag gesetzt wenn eine Position in der
+    Zone aus config/ophiuchus.yaml liegt (Tierkreis-Index).
 
     Args:
         name: Name der Person
-        geburtsdatum: DD.MM.YYYY
-        geburtszeit: HH:MM
-        lat: Breitengrad
-        lon: Längengrad
-        timezone: IANA Timezone
+        moment: Geburtsmoment (Ortszeit, Koordinaten, Zeitzone)
+        ctx: Geteilter Chart-Kontext (optional, sonst eigener)
+        ayanamsas: Zusätzliche Systeme für den Vergleich
+            (z.B. ["lahiri", "fagan_bradley"]); [] = aus config/ayanamsa.yaml
 
     Returns:
-        dict mit ayanamsa_wert, sonne, mond, aszendent
+        dict mit ayanamsa, ayanamsa_wert, sonne, mond, aszendent
+        (+ ayanamsa_vergleich wenn ayanamsas angegeben; sonne/mond mit
+        ist_grenzfall, wenn der Ingress-Index geladen ist)
     """
-    # Datum parsen
-    teile = geburtsdatum.split(".")
-    tag, monat, jahr = int(teile[0]), int(teile[1]), int(teile[2])
-
-    zeit_teile = geburtszeit.split(":")
-    stunde, minute = int(zeit_teile[0]), int(zeit_teile[1])
-
-    # Siderisches Chart mit Lahiri-Ayanamsa
-    sidereal_subject = AstrologicalSubjectFactory.from_birth_data(
-        name=name,
-        year=jahr,
-        month=monat,
-        day=tag,
-        hour=stunde,
-        minute=minute,
-        lng=lon,
-        lat=lat,
-        tz_str=timezone,
-        zodiac_type="Sidereal",
-        sidereal_mode="LAHIRI",
-        online=False,
-    )
-
-    # Tropisches Chart für Ayanamsa-Berechnung
-    tropical_subject = AstrologicalSubjectFactory.from_birth_data(
-        name=name,
-        year=jahr,
-        month=monat,
-        day=tag,
-        hour=stunde,
-        minute=minute,
-        lng=lon,
-        lat=lat,
-        tz_str=timezone,
-        zodiac_type="Tropical",
-        online=False,
-    )
-
-    # Ayanamsa = Differenz tropisch - siderisch
-    ayanamsa_wert = round(
-        tropical_subject.sun.abs_pos - sidereal_subject.sun.abs_pos, 4
-    )
-
-    # Positionen direkt von kerykeion übernehmen (12-Zeichen, Astro-Seek-kompatibel)
-    sonne_abs = sidereal_subject.sun.abs_pos
-    mond_abs = sidereal_subject.moon.abs_pos
-    asc_abs = sidereal_subject.ascendant.abs_pos
-
-    result = {
-        "ayanamsa_wert": ayanamsa_wert,
-        "sonne": {
-            "zeichen": _translate_sign(sidereal_subject.sun.sign),
-            "grad": round(sidereal_subject.sun.position, 2),
-            "grad_absolut": round(sonne_abs, 2),
-            "ist_ophiuchus": _check_ophiuchus(sonne_abs),
-        },
-        "mond": {
-            "zeichen": _translate_sign(sidereal_subject.moon.sign),
-            "grad": round(sidereal_subject.moon.position, 2),
-            "grad_absolut": round(mond_abs, 2),
-            "ist_ophiuchus": _check_ophiuchus(mond_abs),
-        },
-        "aszendent": {
-            "zeichen": _translate_sign(sidereal_subject.ascendant.sign),
-            "grad": round(sidereal_subject.ascendant.position, 2),
-            "grad_absolut": round(asc_abs, 2),
-            "ist_ophiuchus": _check_ophiuchus(asc_abs),
-        },
-    }
+    if ctx is None:
+        ctx = ChartContext()
+
+    # Ein tropischer Durchlauf (meist schon im Kontext)
+    tropical_subject = ctx.chart_for(moment)
+    jd = moment.julian_day
+
+    modus = get_standard_ayanamsa()
+    ayanamsa_exakt = ayanamsa(jd, modus)
+    ayanamsa_wert = round(ayanamsa_exakt, 4)
+
+    result = {"ayanamsa": AYANAMSA_NAMEN[modus], "ayanamsa_wert": ayanamsa_wert}
+    for key, point in (
+        ("sonne", tropical_subject.sun),
+        ("mond", tropical_subject.moon),
+        ("aszendent", tropical_subject.ascendant),
+    ):
+        eintrag, grad, abs_pos = _sidereal_pos(point.abs_pos, ayanamsa_exakt)
+        result[key] = {
+            "zeichen": eintrag.zeichen,
+            "grad": round(grad, 2),
+            "grad_absolut": round(abs_pos, 2),
+            "ist_ophiuchus": eintrag.ist_ophiuchus,
+        }
+
+    # Grenzfall: Zeichenwechsel innerhalb ±1 Tag (Index gilt für Lahiri)
+    index = get_index()
+    if index is not None and modus == "LAHIRI" and index.deckt(jd):
+        for key, body in (("sonne", "sun"), ("mond", "moon")):
+            result[key]["ist_grenzfall"] = index.ist_grenzfall(
+                body, jd, VARIANTE_SIDERISCH,
+            )
+
+    # Systemvergleich aus demselben tropischen Durchlauf
+    if ayanamsas is not None:
+        modi = [_mode_key(n) for n in ayanamsas] or get_vergleich_ayanamsas()
+        vergleich = {}
+        for m in modi:
+            wert = ayanamsa_exakt if m == modus else ayanamsa(jd, m)
+            vergleich[AYANAMSA_NAMEN[m]] = {
+                "ayanamsa_wert": round(wert, 4),
+                "sonne": _sidereal_pos(tropical_subject.sun.abs_pos, wert)[0].zeichen,
+                "mond": _sidereal_pos(tropical_subject.moon.abs_pos, wert)[0].zeichen,
+                "aszendent": _sidereal_pos(tropical_subject.ascendant.abs_pos, wert)[0].zeichen,
+            }
+        result["ayanamsa_vergleich"] = vergleich
 
     logger.info(
-        "Siderisch (Lahiri): %s -> Sonne=%s, Mond=%s, ASC=%s (Ayanamsa=%.4f)",
+        "Siderisch (%s): %s -> Sonne=%s, Mond=%s, ASC=%s (Ayanamsa=%.4f)",
+        result["ayanamsa"],
         name,
         result["sonne"]["zeichen"],
         result["mond"]["zeichen"],
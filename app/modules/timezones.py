@@ -0,0 +1,181 @@
+"""
+SyncMaster — Zeitzonen-Auflösung (Ortszeit → UTC / Julianischer Tag)
+
+Pro IANA-Zone wird einmal eine Tabelle aller Offset-Wechsel (Sommerzeit,
+Zonenwechsel, LMT → Normalzeit) im Zeitraum 1890–2040 erstellt. Danach ist
+jede Umrechnung eine binäre Suche — statt zoneinfo-Aufrufen pro Modul und
+Request. Die Tabellen leben pro Prozess und werden von tropisch, siderisch
+und Human Design (über ephemeris.local_to_julian_day) gemeinsam genutzt.
+
+Mehrdeutige (Zeitumstellung im Herbst) und nicht existierende Ortszeiten
+(Lücke im Frühjahr) werden explizit behandelt: Standard ist ein ValueError
+wie bei kerykeion; alternativ früherer/späterer Zeitpunkt bzw. Verschieben
+um die Länge der Lücke.
+"""
+
+import bisect
+import calendar
+import logging
+import threading
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# Abgedeckter Zeitraum (UTC-Sekunden seit 1970); außerhalb → zoneinfo direkt
+TABELLE_START = calendar.timegm((1890, 1, 1, 0, 0, 0))
+TABELLE_ENDE = calendar.timegm((2040, 1, 1, 0, 0, 0))
+
+# Grobsuche: Offsets werden täglich geprüft, Wechsel per Bisektion sekundengenau
+_SCHRITT = 86400
+
+# Verhalten bei mehrdeutiger Ortszeit
+MEHRDEUTIG_FEHLER = "fehler"
+MEHRDEUTIG_FRUEH = "frueh"      # erster Zeitpunkt (noch Sommerzeit)
+MEHRDEUTIG_SPAET = "spaet"      # zweiter Zeitpunkt (schon Normalzeit)
+
+# Verhalten bei nicht existierender Ortszeit
+LUECKE_FEHLER = "fehler"
+LUECKE_VERSCHIEBEN = "verschieben"  # um die Länge der Lücke nach vorne (02:30 → 03:30)
+
+_UNIX_EPOCH_JD = 2440587.5
+
+
+class ZoneTable:
+    """Offset-Wechsel einer Zone: sortierte UTC-Zeitpunkte und Offsets (Sekunden)."""
+
+    __slots__ = ("name", "wechsel", "offsets")
+
+    def __init__(self, name: str):
+        self.name = name
+        tz = ZoneInfo(name)
+
+        def offset(t: int) -> int:
+            return int(datetime.fromtimestamp(t, tz).utcoffset().total_seconds())
+
+        # offsets[i] gilt vor wechsel[i], offsets[-1] nach dem letzten Wechsel
+        self.wechsel: list[int] = []
+        self.offsets: list[int] = [offset(TABELLE_START)]
+
+        links = TABELLE_START
+        while links < TABELLE_ENDE:
+            rechts = links + _SCHRITT
+            neu = offset(rechts)
+            if neu != self.offsets[-1]:
+                a, b = links, rechts
+                while b - a > 1:
+                    mitte = (a + b) // 2
+                    if offset(mitte) == self.offsets[-1]:
+                        a = mitte
+                    else:
+                        b = mitte
+                self.wechsel.append(b)
+                self.offsets.append(neu)
+            links = rechts
+
+    def offset_at_utc(self, utc: int) -> int:
+        """Offset (Sekunden) zu einem UTC-Zeitpunkt."""
+        return self.offsets[bisect.bisect_right(self.wechsel, utc)]
+
+    def local_to_utc(
+        self,
+        lokal: int,
+        mehrdeutig: str = MEHRDEUTIG_FEHLER,
+        luecke: str = LUECKE_FEHLER,
+    ) -> int:
+        """
+        Ortszeit (Sekunden, als wäre sie UTC) → UTC-Sekunden.
+
+        Raises:
+            ValueError: Bei mehrdeutiger oder nicht existierender Ortszeit
+                (sofern nicht per mehrdeutig/luecke anders gewählt).
+        """
+        # Offsets der benachbarten Segmente sind die einzigen Kandidaten
+        i = bisect.bisect_right(self.wechsel, lokal)
+        kandidaten = {self.offsets[j] for j in range(max(i - 1, 0), min(i + 2, len(self.offsets)))}
+        treffer = sorted(
+            lokal - o for o in kandidaten if self.offset_at_utc(lokal - o) == o
+        )
+
+        if len(treffer) == 1:
+            return treffer[0]
+
+        wanduhr = datetime.fromtimestamp(lokal, dt_timezone.utc).replace(tzinfo=None)
+        if treffer:
+            if mehrdeutig == MEHRDEUTIG_FRUEH:
+                return treffer[0]
+            if mehrdeutig == MEHRDEUTIG_SPAET:
+                return treffer[-1]
+            raise ValueError(f"Ortszeit ist mehrdeutig (Zeitumstellung): {wanduhr} {self.name}")
+
+        if luecke == LUECKE_VERSCHIEBEN:
+            # Offset vor der Lücke anwenden: ergibt die Wanduhrzeit + Lückenlänge
+            return lokal - self.offset_at_utc(lokal - max(kandidaten))
+        raise ValueError(f"Ortszeit existiert nicht (Zeitumstellung): {wanduhr} {self.name}")
+
+
+_tabellen: dict[str, ZoneTable] = {}
+_lock = threading.Lock()
+
+
+def get_zone_table(name: str) -> ZoneTable:
+    """Tabelle einer Zone — beim ersten Zugriff erstellt (~100 ms), danach gecacht."""
+    tabelle = _tabellen.get(name)
+    if tabelle is None:
+        with _lock:
+            tabelle = _tabellen.get(name)
+            if tabelle is None:
+                tabelle = ZoneTable(name)
+                _tabellen[name] = tabelle
+                logger.info("Zeitzonen-Tabelle: %s (%d Wechsel)", name, len(tabelle.wechsel))
+    return tabelle
+
+
+def preload_zones(namen) -> None:
+    """Erstellt die Tabellen für bekannte Zonen vorab (z.B. beim Start)."""
+    for name in namen:
+        get_zone_table(name)
+
+
+def _local_to_utc_zoneinfo(lokal: int, name: str, mehrdeutig: str, luecke: str) -> int:
+    """Fallback außerhalb des Tabellen-Zeitraums (zoneinfo direkt)."""
+    tz = ZoneInfo(name)
+    naive = datetime.fromtimestamp(lokal, dt_timezone.utc).replace(tzinfo=None)
+    frueh = naive.replace(tzinfo=tz, fold=0)
+    spaet = naive.replace(tzinfo=tz, fold=1)
+    if frueh.utcoffset() != spaet.utcoffset():
+        rueck = frueh.astimezone(dt_timezone.utc).astimezone(tz).replace(tzinfo=None)
+        if rueck != naive:
+            if luecke != LUECKE_VERSCHIEBEN:
+                raise ValueError(f"Ortszeit existiert nicht (Zeitumstellung): {naive} {name}")
+        elif mehrdeutig == MEHRDEUTIG_SPAET:
+            return int(spaet.timestamp())
+        elif mehrdeutig != MEHRDEUTIG_FRUEH:
+            raise ValueError(f"Ortszeit ist mehrdeutig (Zeitumstellung): {naive} {name}")
+    return int(frueh.timestamp())
+
+
+@lru_cache(maxsize=65536)
+def local_to_utc(
+    jahr: int, monat: int, tag: int, stunde: int, minute: int, timezone: str,
+    mehrdeutig: str = MEHRDEUTIG_FEHLER,
+    luecke: str = LUECKE_FEHLER,
+) -> int:
+    """
+    Lokale Zeit + IANA-Zone → UTC-Sekunden seit 1970. Ergebnisse werden
+    gecacht — alle Module einer Berechnung teilen dieselbe Auflösung.
+
+    Raises:
+        ValueError: Bei mehrdeutiger oder nicht existierender Ortszeit
+            (Standard), oder unbekannter Zone.
+    """
+    lokal = calendar.timegm((jahr, monat, tag, stunde, minute, 0))
+    if TABELLE_START + _SCHRITT <= lokal < TABELLE_ENDE - _SCHRITT:
+        return get_zone_table(timezone).local_to_utc(lokal, mehrdeutig, luecke)
+    return _local_to_utc_zoneinfo(lokal, timezone, mehrdeutig, luecke)
+
+
+def utc_seconds_to_julian_day(utc: int) -> float:
+    """UTC-Sekunden seit 1970 → Julianischer Tag (UT)."""
+    return utc / 86400.0 + _UNIX_EPOCH_JD
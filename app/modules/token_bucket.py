@@ -0,0 +1,94 @@
+"""
+SyncMaster — Token-Bucket für Upstream-Dienste (z.B. Nominatim)
+
+Nominatim erlaubt höchstens eine Anfrage pro Sekunde; wer mehr schickt,
+wird gedrosselt oder gesperrt. Alle Aufrufe eines Prozesses holen sich
+deshalb vorher einen Platz im Bucket: bis zu `burst` sofort, danach im
+Abstand 1/rate — in Ankunftsreihenfolge (FIFO).
+
+Wer länger warten müsste, als seine Frist erlaubt, wird sofort mit
+Gedrosselt abgewiesen, statt erst zu warten und dann doch zu spät zu sein.
+Die Rate gilt pro Prozess (bei mehreren Uvicorn-Workern entsprechend
+kleiner konfigurieren).
+"""
+
+import math
+import threading
+import time
+
+
+class Gedrosselt(RuntimeError):
+    """Kein Platz im Token-Bucket innerhalb der Frist (retry_after in Sekunden)."""
+
+    def __init__(self, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket (virtuelle Ankunftszeit, keine Timer-Threads)."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Rate muss > 0 und Burst >= 1 sein: {rate}, {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._intervall = 1.0 / rate
+        self._toleranz = (burst - 1) * self._intervall
+        # Zeitpunkt, ab dem der nächste Platz frei ist (ohne Burst)
+        self._naechster = 0.0
+        self._lock = threading.Lock()
+
+        # Metriken
+        self.zugelassen = 0
+        self.abgewiesen = 0
+        self.wartend = 0
+        self.max_wartezeit = 0.0
+
+    def reservieren(self, max_wartezeit: float | None = None) -> float:
+        """
+        Reserviert einen Platz und liefert die Sekunden bis dahin (0 = sofort).
+
+        Raises:
+            Gedrosselt: Wenn der Platz später als max_wartezeit frei wird
+                (dann wird nichts reserviert).
+        """
+        with self._lock:
+            jetzt = time.monotonic()
+            naechster = max(self._naechster, jetzt)
+            warten = max(naechster - self._toleranz - jetzt, 0.0)
+            if max_wartezeit is not None and warten > max_wartezeit:
+                self.abgewiesen += 1
+                raise Gedrosselt(
+                    f"Upstream gedrosselt ({self.rate:g}/s) — Wartezeit {warten:.1f}s",
+                    max(1, math.ceil(warten)),
+                )
+            self._naechster = naechster + self._intervall
+            self.zugelassen += 1
+            self.max_wartezeit = max(self.max_wartezeit, warten)
+            return warten
+
+    def warten(self, max_wartezeit: float | None = None) -> None:
+        """Reserviert einen Platz und schläft bis dahin."""
+        warten = self.reservieren(max_wartezeit)
+        if warten <= 0:
+            return
+        with self._lock:
+            self.wartend += 1
+        try:
+            time.sleep(warten)
+        finally:
+            with self._lock:
+                self.wartend -= 1
+
+    def stats(self) -> dict:
+        """Momentaufnahme (Zähler seit Prozessstart)."""
+        with self._lock:
+            return {
+                "rate_pro_s": self.rate,
+                "burst": self.burst,
+                "zugelassen": self.zugelassen,
+                "abgewiesen": self.abgewiesen,
+                "wartend": self.wartend,
+                "max_wartezeit_s": round(self.max_wartezeit, 3),
+            }
@@ -6,7 +6,10 @@ Dient als Vergleichsreferenz für den System-Check.
 """
 
 import logging
-from kerykeion import AstrologicalSubjectFactory
+
+from .birth_moment import BirthMoment
+from .chart_context import ChartContext
+from .ingress_index import VARIANTE_TROPISCH, get_index
 
 logger = logging.getLogger(__name__)
 
@@ -34,47 +37,25 @@ def _translate_sign(code: str) -> str:
 
 def calculate_tropical(
     name: str,
-    geburtsdatum: str,
-    geburtszeit: str,
-    lat: float,
-    lon: float,
-    timezone: str,
+    moment: BirthMoment,
+    ctx: ChartContext | None = None,
 ) -> dict:
     """
     Berechnet tropische Positionen für Sonne, Mond, Aszendent.
 
     Args:
         name: Name der Person
-        geburtsdatum: DD.MM.YYYY
-        geburtszeit: HH:MM
-        lat: Breitengrad
-        lon: Längengrad
-        timezone: IANA Timezone (z.B. "Europe/Berlin")
+        moment: Geburtsmoment (Ortszeit, Koordinaten, Zeitzone)
+        ctx: Geteilter Chart-Kontext (optional, sonst eigener)
 
     Returns:
         dict mit sonne, mond, aszendent — jeweils zeichen, grad, grad_absolut
+        (sonne/mond zusätzlich ist_grenzfall, wenn der Ingress-Index geladen ist)
     """
-    # Datum parsen
-    teile = geburtsdatum.split(".")
-    tag, monat, jahr = int(teile[0]), int(teile[1]), int(teile[2])
-
-    zeit_teile = geburtszeit.split(":")
-    stunde, minute = int(zeit_teile[0]), int(zeit_teile[1])
-
-    # Kerykeion-Chart erstellen (tropical ist Standard)
-    subject = AstrologicalSubjectFactory.from_birth_data(
-        name=name,
-        year=jahr,
-        month=monat,
-        day=tag,
-        hour=stunde,
-        minute=minute,
-        lng=lon,
-        lat=lat,
-        tz_str=timezone,
-        zodiac_type="Tropical",
-        online=False,
-    )
+    # Tropisches Chart aus dem (geteilten) Kontext
+    if ctx is None:
+        ctx = ChartContext()
+    subject = ctx.chart_for(moment)
 
     result = {
         "sonne": {
@@ -94,6 +75,14 @@ def calculate_tropical(
         },
     }
 
+    # Grenzfall: Zeichenwechsel innerhalb ±1 Tag
+    index = get_index()
+    if index is not None and index.deckt(subject.julian_day):
+        for key, body in (("sonne", "sun"), ("mond", "moon")):
+            result[key]["ist_grenzfall"] = index.ist_grenzfall(
+                body, subject.julian_day, VARIANTE_TROPISCH,
+            )
+
     logger.info(
         "Tropisch: %s → Sonne=%s, Mond=%s, ASC=%s",
         name,
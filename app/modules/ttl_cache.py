@@ -0,0 +1,131 @@
+"""
+SyncMaster — Begrenzter LRU-Cache mit Ablaufzeit (TTL)
+
+Für Lookups, deren Ergebnis sich selten ändert, die aber teuer sind
+(Geocoding über Nominatim). Begrenzt nach Anzahl Einträgen UND
+geschätztem Speicher, damit ein Worker nicht unbemerkt wächst.
+
+Negative Ergebnisse (z.B. "Ort nicht gefunden") werden mit eigener,
+kürzerer TTL gespeichert — ein Tippfehler, der bei jedem Retry erneut
+nachgeschlagen würde, kostet so nur einen Upstream-Aufruf.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Grobe Verwaltungskosten pro Eintrag (OrderedDict-Knoten, Tupel, Floats)
+_EINTRAG_OVERHEAD = 200
+
+
+def _groesse(objekt) -> int:
+    """Geschätzte Bytes eines Schlüssels/Werts (dict/list/tuple eine Ebene tief)."""
+    groesse = sys.getsizeof(objekt)
+    if isinstance(objekt, dict):
+        groesse += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in objekt.items())
+    elif isinstance(objekt, (list, tuple)):
+        groesse += sum(sys.getsizeof(v) for v in objekt)
+    return groesse
+
+
+class TTLCache:
+    """Thread-sicherer LRU mit getrennter TTL für positive und negative Einträge."""
+
+    def __init__(self, max_eintraege: int, max_bytes: int, ttl: float, ttl_negativ: float):
+        self.max_eintraege = max(max_eintraege, 1)
+        self.max_bytes = max(max_bytes, 1)
+        self.ttl = ttl
+        self.ttl_negativ = ttl_negativ
+
+        # schluessel → (wert, negativ, ablauf, bytes)
+        self._eintraege: OrderedDict[str, tuple[object, bool, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._negativ = 0
+
+        # Metriken
+        self.treffer = 0
+        self.treffer_negativ = 0
+        self.fehlschlaege = 0
+        self.abgelaufen = 0
+        self.verdraengt = 0
+
+    def _entfernen(self, schluessel: str) -> None:
+        _, negativ, _, groesse = self._eintraege.pop(schluessel)
+        self._bytes -= groesse
+        self._negativ -= negativ
+
+    def _gueltig(self, schluessel: str) -> tuple[object, bool, float, int] | None:
+        eintrag = self._eintraege.get(schluessel)
+        if eintrag is not None and eintrag[2] <= time.monotonic():
+            self._entfernen(schluessel)
+            self.abgelaufen += 1
+            return None
+        return eintrag
+
+    def get(self, schluessel: str) -> tuple[bool, object] | None:
+        """(negativ, wert) oder None, wenn nicht (mehr) im Cache."""
+        with self._lock:
+            eintrag = self._gueltig(schluessel)
+            if eintrag is None:
+                self.fehlschlaege += 1
+                return None
+            self._eintraege.move_to_end(schluessel)
+            if eintrag[1]:
+                self.treffer_negativ += 1
+            else:
+                self.treffer += 1
+            return eintrag[1], eintrag[0]
+
+    def __contains__(self, schluessel: str) -> bool:
+        """Gültiger Eintrag vorhanden? Zählt nicht als Treffer, ändert die LRU-Reihenfolge nicht."""
+        with self._lock:
+            return self._gueltig(schluessel) is not None
+
+    def put(self, schluessel: str, wert, negativ: bool = False) -> None:
+        """Speichert ein Ergebnis (negativ=True: Fehlermeldung mit ttl_negativ)."""
+        ttl = self.ttl_negativ if negativ else self.ttl
+        if ttl <= 0:
+            return
+        groesse = _EINTRAG_OVERHEAD + _groesse(schluessel) + _groesse(wert)
+        with self._lock:
+            if schluessel in self._eintraege:
+                self._entfernen(schluessel)
+            self._eintraege[schluessel] = (wert, negativ, time.monotonic() + ttl, groesse)
+            self._bytes += groesse
+            self._negativ += negativ
+            while len(self._eintraege) > self.max_eintraege or (
+                self._bytes > self.max_bytes and len(self._eintraege) > 1
+            ):
+                self._entfernen(next(iter(self._eintraege)))
+                self.verdraengt += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._eintraege.clear()
+            self._bytes = 0
+            self._negativ = 0
+
+    def __len__(self) -> int:
+        return len(self._eintraege)
+
+    def stats(self) -> dict:
+        """Momentaufnahme (Zähler seit Prozessstart)."""
+        with self._lock:
+            anfragen = self.treffer + self.treffer_negativ + self.fehlschlaege
+            return {
+                "eintraege": len(self._eintraege),
+                "max_eintraege": self.max_eintraege,
+                "negativ": self._negativ,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl,
+                "ttl_negativ_s": self.ttl_negativ,
+                "treffer": self.treffer,
+                "treffer_negativ": self.treffer_negativ,
+                "fehlschlaege": self.fehlschlaege,
+                "abgelaufen": self.abgelaufen,
+                "verdraengt": self.verdraengt,
+                "trefferquote": round((self.treffer + self.treffer_negativ) / anfragen, 4) if anfragen else 0.0,
+            }
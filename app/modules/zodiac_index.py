@@ -0,0 +1,273 @@
+"""
+SyncMaster — Siderischer Tierkreis-Index (0°–360°)
+
+Eine siderische Länge bestimmt Zeichen, Dekan, Element und Ophiuchus-Flag.
+Statt diese Schritte pro Aufruf einzeln zu erledigen (Zeichen-Code,
+Ophiuchus-Grenzen, Element-Dict, Dekan-YAML + Bereichs-Text), wird der
+Tierkreis einmal in Segmente zerlegt: jede Dekan-Grenze (alle 10°) und die
+Ophiuchus-Grenzen aus config/ophiuchus.yaml. Pro Segment gibt es einen
+unveränderlichen Eintrag mit allen Angaben; ein Lookup ist eine binäre
+Suche über 38 Grenzen — vektorisiert per np.searchsorted für Batch.
+
+Quellen (einzige Wahrheit): config/dekans.yaml, config/ophiuchus.yaml,
+elements.ELEMENTS. Ophiuchus bleibt ein Zusatz-Flag — Zeichen, Dekan und
+Element folgen der 12-Zeichen-Zuordnung (kompatibel mit Astro-Seek).
+"""
+
+import bisect
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from .elements import ELEMENTS
+
+logger = logging.getLogger(__name__)
+
+_CONFIG_DIR = Path(__file__).resolve().parent.parent.parent / "config"
+DEKANS_PATH = _CONFIG_DIR / "dekans.yaml"
+OPHIUCHUS_PATH = _CONFIG_DIR / "ophiuchus.yaml"
+
+# Deutsche Zeichennamen in Tierkreis-Reihenfolge (Index = Zeichen-Code 0–11)
+ZEICHEN = (
+    "Widder", "Stier", "Zwillinge", "Krebs", "Löwe", "Jungfrau",
+    "Waage", "Skorpion", "Schütze", "Steinbock", "Wassermann", "Fische",
+)
+OPHIUCHUS = "Ophiuchus"
+
+# Zeichen → YAML-Key in config/dekans.yaml
+_ZEICHEN_ZU_KEY = {
+    "Widder": "widder",
+    "Stier": "stier",
+    "Zwillinge": "zwillinge",
+    "Krebs": "krebs",
+    "Löwe": "loewe",
+    "Jungfrau": "jungfrau",
+    "Waage": "waage",
+    "Skorpion": "skorpion",
+    "Schütze": "schuetze",
+    "Steinbock": "steinbock",
+    "Wassermann": "wassermann",
+    "Fische": "fische",
+    "Ophiuchus": "ophiuchus",
+}
+
+# Element-Codes in der Reihenfolge von ELEMENTS
+ELEMENT_NAMEN = tuple(ELEMENTS)
+
+# Sonder-Dekan Asklepios (nach den 36 Standard-Dekanen)
+OPHIUCHUS_DEKAN_NUMMER = 37
+
+_ZEICHEN_BREITE = 30.0
+_DEKAN_BREITE = 10.0
+_VOLLKREIS = 360.0
+
+
+@dataclass(frozen=True, slots=True)
+class ZodiacRecord:
+    """Alle Angaben zu einem Segment des siderischen Tierkreises."""
+
+    start: float
+    zeichen: str
+    zeichen_code: int
+    element: str
+    element_code: int
+    eigenschaften: str
+    schatten: str
+    dekan_nummer: int
+    dekan_bereich: str
+    gott: str
+    titel: str
+    werkzeug: str
+    ist_ophiuchus: bool
+
+    def dekan_dict(self) -> dict:
+        """Dekan im Ergebnis-Format (wie get_dekan)."""
+        return {
+            "dekan_nummer": self.dekan_nummer,
+            "dekan_bereich": self.dekan_bereich,
+            "gott": self.gott,
+            "titel": self.titel,
+            "werkzeug": self.werkzeug,
+        }
+
+    def element_dict(self) -> dict:
+        """Element im Ergebnis-Format (wie get_element)."""
+        return {
+            "element": self.element,
+            "eigenschaften": self.eigenschaften,
+            "schatten": self.schatten,
+        }
+
+
+def _load_yaml(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _element_von(zeichen: str) -> tuple[int, str, dict]:
+    for code, (name, data) in enumerate(ELEMENTS.items()):
+        if zeichen in data["zeichen"]:
+            return code, name, data
+    raise ValueError(f"Kein Element für Zeichen '{zeichen}' in ELEMENTS")
+
+
+def _dekan_von(dekans: dict, zeichen: str, nummer: int) -> dict:
+    zeichen_dekane = dekans.get(_ZEICHEN_ZU_KEY[zeichen]) or []
+    if nummer >= len(zeichen_dekane):
+        raise ValueError(f"Dekan {nummer + 1} für {zeichen} nicht in Konfiguration")
+    return zeichen_dekane[nummer]
+
+
+class ZodiacIndex:
+    """Unveränderlicher Index: siderische Länge → ZodiacRecord."""
+
+    __slots__ = (
+        "ophiuchus_start", "ophiuchus_end", "grenzen", "eintraege", "ophiuchus_dekan",
+        "_grenzen", "_zeichen_codes", "_element_codes", "_dekan_nummern", "_ophiuchus",
+    )
+
+    def __init__(self, dekans: dict, ophiuchus: dict):
+        start, ende = float(ophiuchus["start"]), float(ophiuchus["end"])
+        if not 0.0 <= start < ende <= _VOLLKREIS:
+            raise ValueError(f"Ungültige Ophiuchus-Grenzen: {start}°–{ende}°")
+        self.ophiuchus_start = start
+        self.ophiuchus_end = ende
+
+        grenzen = sorted(
+            {i * _DEKAN_BREITE for i in range(36)} | ({start, ende} - {_VOLLKREIS})
+        )
+        eintraege = []
+        for grenze in grenzen:
+            code = int(grenze // _ZEICHEN_BREITE)
+            zeichen = ZEICHEN[code]
+            dekan_index = int(grenze % _ZEICHEN_BREITE // _DEKAN_BREITE)
+            dekan = _dekan_von(dekans, zeichen, dekan_index)
+            element_code, element, element_data = _element_von(zeichen)
+            von = dekan_index * 10
+            eintraege.append(ZodiacRecord(
+                start=grenze,
+                zeichen=zeichen,
+                zeichen_code=code,
+                element=element,
+                element_code=element_code,
+                eigenschaften=element_data["eigenschaften"],
+                schatten=element_data["schatten"],
+                dekan_nummer=code * 3 + dekan_index + 1,
+                dekan_bereich=f"{dekan_index + 1}. Dekan {zeichen} ({von}°–{von + 10}°)",
+                gott=dekan["gott"],
+                titel=dekan["titel"],
+                werkzeug=dekan["werkzeug"],
+                ist_ophiuchus=start <= grenze < ende,
+            ))
+        self.grenzen: tuple[float, ...] = tuple(grenzen)
+        self.eintraege: tuple[ZodiacRecord, ...] = tuple(eintraege)
+
+        # Sonder-Dekan (Zeichen "Ophiuchus" im 13-Zeichen-Modell)
+        element_code, element, element_data = _element_von(OPHIUCHUS)
+        if element != ophiuchus.get("element", element):
+            raise ValueError(
+                f"Ophiuchus-Element '{ophiuchus['element']}' passt nicht zu ELEMENTS ('{element}')"
+            )
+        dekan = _dekan_von(dekans, OPHIUCHUS, 0)
+        self.ophiuchus_dekan = ZodiacRecord(
+            start=start,
+            zeichen=OPHIUCHUS,
+            zeichen_code=-1,
+            element=element,
+            element_code=element_code,
+            eigenschaften=element_data["eigenschaften"],
+            schatten=element_data["schatten"],
+            dekan_nummer=OPHIUCHUS_DEKAN_NUMMER,
+            dekan_bereich="Ophiuchus (Sonder-Dekan)",
+            gott=dekan["gott"],
+            titel=dekan["titel"],
+            werkzeug=dekan["werkzeug"],
+            ist_ophiuchus=True,
+        )
+
+        # Spalten für den vektorisierten Lookup (read-only)
+        self._grenzen = np.array(grenzen, dtype="f8")
+        self._zeichen_codes = np.array([e.zeichen_code for e in eintraege], dtype=np.int8)
+        self._element_codes = np.array([e.element_code for e in eintraege], dtype=np.int8)
+        self._dekan_nummern = np.array([e.dekan_nummer for e in eintraege], dtype=np.int8)
+        self._ophiuchus = np.array([e.ist_ophiuchus for e in eintraege], dtype=bool)
+        for spalte in (
+            self._grenzen, self._zeichen_codes, self._element_codes,
+            self._dekan_nummern, self._ophiuchus,
+        ):
+            spalte.flags.writeable = False
+
+    def lookup(self, longitude: float) -> ZodiacRecord:
+        """Siderische Länge (beliebig, wird auf 0–360° normiert) → Eintrag."""
+        lon = longitude % _VOLLKREIS
+        if lon >= _VOLLKREIS:  # -1e-17 % 360 == 360.0
+            lon = 0.0
+        return self.eintraege[bisect.bisect_right(self.grenzen, lon) - 1]
+
+    def lookup_zeichen(self, zeichen: str, grad_im_zeichen: float) -> ZodiacRecord:
+        """
+        Zeichen + Grad im Zeichen → Eintrag. Gerundete 30.0° bleiben im
+        Zeichen; "Ophiuchus" liefert den Sonder-Dekan.
+
+        Raises:
+            ValueError: Bei unbekanntem Zeichen.
+        """
+        if zeichen == OPHIUCHUS:
+            return self.ophiuchus_dekan
+        try:
+            code = ZEICHEN.index(zeichen)
+        except ValueError:
+            raise ValueError(f"Unbekanntes Zeichen: '{zeichen}'")
+        ende = math.nextafter((code + 1) * _ZEICHEN_BREITE, 0.0)
+        lon = min(code * _ZEICHEN_BREITE + max(grad_im_zeichen, 0.0), ende)
+        return self.eintraege[bisect.bisect_right(self.grenzen, lon) - 1]
+
+    def indices(self, longitudes) -> np.ndarray:
+        """Vektorisiert: Längen → Eintrags-Index (NaN → -1)."""
+        lon = np.mod(np.asarray(longitudes, dtype="f8"), _VOLLKREIS)
+        lon = np.where(lon >= _VOLLKREIS, 0.0, lon)
+        i = np.searchsorted(self._grenzen, lon, side="right") - 1
+        return np.where(np.isnan(lon), -1, i)
+
+    def zeichen_codes(self, longitudes) -> np.ndarray:
+        """Vektorisiert: Zeichen-Code 0–11 (NaN → -1)."""
+        i = self.indices(longitudes)
+        return np.where(i < 0, -1, self._zeichen_codes[i]).astype(np.int8)
+
+    def element_codes(self, longitudes) -> np.ndarray:
+        """Vektorisiert: Element-Code (Index in ELEMENT_NAMEN, NaN → -1)."""
+        i = self.indices(longitudes)
+        return np.where(i < 0, -1, self._element_codes[i]).astype(np.int8)
+
+    def dekan_nummern(self, longitudes) -> np.ndarray:
+        """Vektorisiert: absolute Dekan-Nummer 1–36 (NaN → -1)."""
+        i = self.indices(longitudes)
+        return np.where(i < 0, -1, self._dekan_nummern[i]).astype(np.int8)
+
+    def ophiuchus_maske(self, longitudes) -> np.ndarray:
+        """Vektorisiert: True für Längen in der Ophiuchus-Zone (NaN → False)."""
+        i = self.indices(longitudes)
+        return (i >= 0) & self._ophiuchus[i]
+
+
+_index: ZodiacIndex | None = None
+_lock = threading.Lock()
+
+
+def get_zodiac_index() -> ZodiacIndex:
+    """Index aus der Konfiguration — beim ersten Zugriff (bzw. beim Start) gebaut."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = ZodiacIndex(_load_yaml(DEKANS_PATH), _load_yaml(OPHIUCHUS_PATH))
+                logger.info(
+                    "Tierkreis-Index: %d Segmente, Ophiuchus %.1f°–%.1f°",
+                    len(_index.eintraege), _index.ophiuchus_start, _index.ophiuchus_end,
+                )
+    return _index
@@ -10,7 +10,10 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.dependencies import verify_admin_key
 from app.models import Bestellung
-from app.schemas import AdminBestellungResponse, StatistikResponse
+from app.modules.geocoding import cache_stats, upstream_stats
+from app.schemas import AdminBestellungResponse, GeocodingResponse, LastResponse, StatistikResponse
+from app.services.admission import get_admission
+from app.services.ephemeris_pool import get_pool
 
 router = APIRouter()
 
@@ -74,3 +77,31 @@ def get_statistik(db: Session = Depends(get_db)):
         StatistikResponse(monat=row.monat, anzahl=row.anzahl, umsatz=float(row.umsatz))
         for row in rows
     ]
+
+
+@router.get(
+    "/api/admin/last",
+    response_model=LastResponse,
+    dependencies=[Depends(verify_admin_key)],
+)
+def get_last():
+    """Auslastung: Zulassungskontrolle Gratis-Check (Warteschlange, Abweisungen) und Ephemeriden-Pool."""
+    controller = get_admission()
+    pool = get_pool()
+    return LastResponse(
+        gratis_check=controller.stats() if controller else None,
+        ephemeris_pool=pool.stats() if pool else None,
+    )
+
+
+@router.get(
+    "/api/admin/geocoding",
+    response_model=GeocodingResponse,
+    dependencies=[Depends(verify_admin_key)],
+)
+def get_geocoding():
+    """
+    Geocoding dieses Worker-Prozesses: LRU (Treffer, Fehlschläge,
+    Verdrängungen, Speicher) und Nominatim (Bucket, zusammengelegte Anfragen).
+    """
+    return GeocodingResponse(cache=cache_stats(), nominatim=upstream_stats())
@@ -1,46 +1,143 @@
 """AstroMaster Backend — Bestellung Endpoints."""
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.database import SessionLocal, get_db
 from app.models import Bestellung
+from app.modules.master_calculator import STATUS_ZEIT
 from app.schemas import BestellungCreateResponse, BestellungRequest, BestellungStatusResponse
+from app.services.auftraege import einreihen
 from app.services.calculation import full_calculation
 from app.services.email_service import send_pdf_email
+from app.services.ephemeris_pool import PoolUeberlastet
+from app.services.orte import geo_aus_angaben
 from app.services.pdf_service import generate_pdf
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def _process_order(bestellung_id: str):
-    """Background-Task: Berechnung → PDF → Email."""
-    db = SessionLocal()
-    try:
-        bestellung = db.query(Bestellung).filter(Bestellung.id == bestellung_id).first()
-        if not bestellung:
-            logger.error("Bestellung %s nicht gefunden", bestellung_id)
-            return
+class _Voruebergehend(RuntimeError):
+    """Berechnung unvollständig, aber ein späterer Versuch kann gelingen."""
 
-        # Status → berechne
-        bestellung.status = "berechne"
-        bestellung.aktualisiert_am = datetime.now(timezone.utc)
-        db.commit()
 
-        # Berechnung
+def _berechnen(bestellung: Bestellung, geo: dict | None) -> dict:
+    """
+    Ein Versuch full_calculation für eine Bestellung — ohne Teilergebnisse.
+
+    Raises:
+        _Voruebergehend: Wenn ein Modul nur Frist oder Budget verpasst hat
+            bzw. der Pool ausgelastet ist (→ später neu versuchen).
+        RuntimeError: Wenn die Berechnung aus anderen Gründen unvollständig ist.
+    """
+    try:
         data = full_calculation(
             name=bestellung.name,
             geburtsdatum=bestellung.geburtsdatum,
             geburtszeit=bestellung.geburtszeit,
             geburtsort=bestellung.geburtsort,
+            version=bestellung.version,
+            tierkreis=bestellung.tierkreis,
+            geo=geo,
+        )
+    except (TimeoutError, PoolUeberlastet) as e:
+        raise _Voruebergehend(str(e) or type(e).__name__) from e
+
+    if data["meta"]["vollstaendig"]:
+        return data
+    fehler = "; ".join(f"{f['modul']}: {f['fehler']}" for f in data.get("fehler", []))
+    if any(m["status"] == STATUS_ZEIT for m in data["meta"]["module"].values()):
+        raise _Voruebergehend(f"Berechnung unvollständig — {fehler}")
+    raise RuntimeError(f"Berechnung unvollständig — {fehler}")
+
+
+def _uebernehmen(db: Session, bestellung_id: str) -> Bestellung | None:
+    """
+    Bestellung atomar auf "berechne" setzen und den Versuch zählen — nur
+    aus "neu" oder einem fälligen "wartend". So läuft sie auch bei doppeltem
+    Einreihen (Start-Sweep, Webhook-Wiederholung) nur einmal.
+    """
+    jetzt = datetime.now(timezone.utc)
+    uebernommen = (
+        db.query(Bestellung)
+        .filter(
+            Bestellung.id == bestellung_id,
+            or_(
+                Bestellung.status == "neu",
+                and_(Bestellung.status == "wartend", Bestellung.naechster_versuch <= jetzt),
+            ),
+        )
+        .update(
+            {
+                Bestellung.status: "berechne",
+                Bestellung.versuche: Bestellung.versuche + 1,
+                Bestellung.naechster_versuch: None,
+                Bestellung.aktualisiert_am: jetzt,
+            },
+            synchronize_session=False,
         )
+    )
+    db.commit()
+    if not uebernommen:
+        return None
+    return db.query(Bestellung).filter(Bestellung.id == bestellung_id).first()
+
+
+def _process_order(bestellung_id: str):
+    """
+    Ein Versuch: Berechnung → PDF → Email (läuft im Bestellungs-Pool).
+
+    Verpasst die Berechnung nur Frist oder Budget (bzw. ist der Pool
+    ausgelastet), geht die Bestellung auf "wartend" und wird nach
+    BESTELLUNG_PAUSE neu eingereiht — höchstens BESTELLUNG_VERSUCHE
+    Versuche. Geschlafen wird dabei in keinem Thread.
+    """
+    db = SessionLocal()
+    bestellung = None
+    try:
+        bestellung = _uebernehmen(db, bestellung_id)
+        if not bestellung:
+            logger.info("Bestellung %s nicht gefunden, in Bearbeitung oder nicht fällig", bestellung_id)
+            return
+        versuche = max(settings.BESTELLUNG_VERSUCHE, 1)
+        logger.info("Bestellung %s: Versuch %d/%d", bestellung_id, bestellung.versuche, versuche)
+
+        # Berechnung (Ort schon bei der Bestellung aufgelöst → ohne Geocoding);
+        # das PDF braucht alle Module
+        geo = None
+        if bestellung.lat is not None and bestellung.timezone:
+            geo = {
+                "lat": bestellung.lat,
+                "lon": bestellung.lon,
+                "timezone": bestellung.timezone,
+                "ort_vollstaendig": bestellung.geburtsort,
+            }
+        try:
+            data = _berechnen(bestellung, geo)
+        except _Voruebergehend as e:
+            if bestellung.versuche >= versuche:
+                raise
+            logger.warning(
+                "Bestellung %s: Versuch %d/%d — %s; nächster in %.0fs",
+                bestellung_id, bestellung.versuche, versuche, e, settings.BESTELLUNG_PAUSE,
+            )
+            jetzt = datetime.now(timezone.utc)
+            bestellung.status = "wartend"
+            bestellung.fehler_nachricht = str(e)
+            bestellung.naechster_versuch = jetzt + timedelta(seconds=settings.BESTELLUNG_PAUSE)
+            bestellung.aktualisiert_am = jetzt
+            db.commit()
+            einreihen(_process_order, bestellung_id, verzoegerung=settings.BESTELLUNG_PAUSE)
+            return
         bestellung.berechnung_json = data
+        bestellung.fehler_nachricht = None
 
         # PDF generieren
         pdf_path = generate_pdf(data, bestellung.version)
@@ -57,7 +154,12 @@ def _process_order(bestellung_id: str):
         logger.info("Bestellung %s erfolgreich verarbeitet", bestellung_id)
 
     except Exception as e:
-        logger.error("Bestellung %s fehlgeschlagen: %s", bestellung_id, e)
+        logger.error(
+            "Bestellung %s fehlgeschlagen (Versuch %s): %s",
+            bestellung_id, bestellung.versuche if bestellung else "-", e,
+        )
+        if bestellung is None:
+            return
         bestellung.status = "fehler"
         bestellung.fehler_nachricht = str(e)
         bestellung.aktualisiert_am = datetime.now(timezone.utc)
@@ -66,14 +168,54 @@ def _process_order(bestellung_id: str):
         db.close()
 
 
+def verarbeitung_starten(bestellung_id: str) -> None:
+    """Reiht eine neue Bestellung im Bestellungs-Pool ein (nicht im Endpoint-Thread-Pool)."""
+    einreihen(_process_order, bestellung_id)
+
+
+def offene_bestellungen_einreihen() -> int:
+    """
+    Start-Sweep: reiht Bestellungen mit Status "neu" bzw. "wartend" (zum
+    gespeicherten Termin) wieder ein — ihre Aufträge lebten nur im Speicher
+    des vorigen Prozesses.
+    """
+    db = SessionLocal()
+    try:
+        offen = (
+            db.query(Bestellung.id, Bestellung.status, Bestellung.naechster_versuch)
+            .filter(Bestellung.status.in_(("neu", "wartend")))
+            .all()
+        )
+    finally:
+        db.close()
+    jetzt = datetime.now(timezone.utc)
+    for bestellung_id, status, termin in offen:
+        verzoegerung = 0.0
+        if status == "wartend" and termin is not None:
+            if termin.tzinfo is None:
+                termin = termin.replace(tzinfo=timezone.utc)
+            verzoegerung = max((termin - jetzt).total_seconds(), 0.0)
+        einreihen(_process_order, str(bestellung_id), verzoegerung=verzoegerung)
+    if offen:
+        logger.info("Bestellungen: %d offene wieder eingereiht", len(offen))
+    return len(offen)
+
+
 @router.post("/api/bestellung", response_model=BestellungCreateResponse)
 def create_bestellung(
     data: BestellungRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
-    """Erstellt eine neue Bestellung und startet die Verarbeitung im Hintergrund."""
+    """
+    Erstellt eine neue Bestellung und startet die Verarbeitung im Hintergrund.
+    Mit ort_id oder lat/lon wird der Ort hier aufgelöst (400, wenn unbekannt)
+    und später nicht mehr geocodet.
+    """
     preis = 39.0 if data.version == "normal" else 89.0
+    try:
+        geo = geo_aus_angaben(data.geburtsort, data.ort_id, data.lat, data.lon, data.timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     bestellung = Bestellung(
         name=data.name,
@@ -81,7 +223,12 @@ def create_bestellung(
         geburtsdatum=data.geburtsdatum,
         geburtszeit=data.geburtszeit,
         geburtsort=data.geburtsort,
+        ort_id=data.ort_id,
+        lat=geo["lat"] if geo else None,
+        lon=geo["lon"] if geo else None,
+        timezone=geo["timezone"] if geo else None,
         version=data.version,
+        tierkreis=data.tierkreis,
         preis=preis,
         stripe_session_id=data.stripe_session_id,
         status="neu",
@@ -90,8 +237,8 @@ def create_bestellung(
     db.commit()
     db.refresh(bestellung)
 
-    # Verarbeitung im Hintergrund starten
-    background_tasks.add_task(_process_order, str(bestellung.id))
+    # Verarbeitung im Bestellungs-Pool starten
+    verarbeitung_starten(str(bestellung.id))
 
     return BestellungCreateResponse(id=bestellung.id, status="neu")
 
@@ -4,9 +4,12 @@ import logging
 
 import stripe
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 from app.config import settings
+from app.modules.constellations import TIERKREISE
+from app.schemas import _check_ort
+from app.services.orte import geo_aus_angaben
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -21,6 +24,17 @@ class CheckoutRequest(BaseModel):
     geburtszeit: str  # HH:MM
     geburtsort: str
     version: str = "normal"
+    tierkreis: str = "siderisch"  # oder "konstellationen" (IAU-Sternbilder)
+    # Statt Geocoding: Orts-ID aus /api/orte/suggest oder Koordinaten
+    ort_id: str | None = None
+    lat: float | None = None
+    lon: float | None = None
+    timezone: str | None = None
+
+    @model_validator(mode="after")
+    def validate_ort(self):
+        _check_ort(self.ort_id, self.lat, self.lon, self.timezone)
+        return self
 
 
 @router.post("/api/create-checkout-session")
@@ -32,6 +46,20 @@ def create_checkout_session(data: CheckoutRequest):
     if data.version not in PRICES:
         raise HTTPException(status_code=400, detail="Ungültige Version")
 
+    if data.tierkreis not in TIERKREISE:
+        raise HTTPException(status_code=400, detail="Ungültiger Tierkreis")
+
+    # Gewählten Ort jetzt auflösen — die Bestellung (Webhook) geocodet dann nicht mehr
+    try:
+        geo = geo_aus_angaben(data.geburtsort, data.ort_id, data.lat, data.lon, data.timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    ort_metadata = {}
+    if geo is not None:
+        ort_metadata = {"lat": str(geo["lat"]), "lon": str(geo["lon"]), "timezone": geo["timezone"]}
+        if data.ort_id:
+            ort_metadata["ort_id"] = data.ort_id
+
     stripe.api_key = settings.STRIPE_SECRET_KEY
 
     try:
@@ -58,6 +86,8 @@ def create_checkout_session(data: CheckoutRequest):
                 "geburtszeit": data.geburtszeit,
                 "geburtsort": data.geburtsort,
                 "version": data.version,
+                "tierkreis": data.tierkreis,
+                **ort_metadata,
             },
             customer_email=data.email,
             success_url="https://astro-masters.com/bestaetigung?session_id={CHECKOUT_SESSION_ID}",
@@ -1,20 +1,56 @@
 """AstroMaster Backend — Gratis-Check Endpoint."""
 
+from contextlib import nullcontext
+
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.dependencies import hash_ip, limiter
 from app.models import GratisCheck
+from app.modules.geocoding import get_coordinates
+from app.modules.token_bucket import Gedrosselt
 from app.schemas import GratisCheckRequest, GratisCheckResponse
-from app.services.calculation import gratis_check
+from app.services.admission import Abgewiesen, get_admission
+from app.services.calculation import gratis_check_async, gratis_check_tabelle
+from app.services.ephemeris_pool import PoolUeberlastet
+from app.services.orte import geo_aus_angaben
 
 router = APIRouter()
 
 
+async def _berechnen(data: GratisCheckRequest, geo: dict | None) -> dict:
+    """
+    Berechnung (ohne Tabellen-Treffer) — unter Zulassungskontrolle, falls aktiv.
+
+    Der Ort ist hier schon aufgelöst (bzw. fehlt → Default), damit ein
+    Slot nur die Pool-Berechnung abdeckt und nie auf Nominatim wartet.
+    """
+    controller = get_admission()
+    async with controller.zulassen() if controller else nullcontext():
+        return await gratis_check_async(
+            data.geburtsdatum, data.geburtszeit, data.geburtsort,
+            use_table=False, tierkreis=data.tierkreis, geo=geo,
+        )
+
+
+def _speichern(db: Session, data: GratisCheckRequest, result: dict, ip_hash: str) -> None:
+    """In DB speichern (DSGVO: IP nur als Hash)."""
+    check = GratisCheck(
+        geburtsdatum=data.geburtsdatum,
+        tropisch_sonne=result["tropisch"],
+        siderisch_sonne=result["siderisch"],
+        abweichung=result["abweichung"],
+        ip_hash=ip_hash,
+    )
+    db.add(check)
+    db.commit()
+
+
 @router.post("/api/gratis-check", response_model=GratisCheckResponse)
 @limiter.limit("30/minute")
-def do_gratis_check(
+async def do_gratis_check(
     request: Request,
     data: GratisCheckRequest,
     db: Session = Depends(get_db),
@@ -22,21 +58,47 @@ def do_gratis_check(
     """
     Schneller Vergleich: Tropisch vs. Siderisch Sonnenzeichen.
     Keine Auth, Rate-Limit 30/min/IP.
+
+    Nur-Datum-Anfragen kommen aus der Gratis-Tabelle; alle anderen
+    durchlaufen die globale Zulassungskontrolle (429/503 mit Retry-After,
+    wenn die Warteschlange voll bzw. die Wartezeit abgelaufen ist).
+    Mit ort_id oder lat/lon entfällt das Geocoding des Geburtsorts; sonst
+    wird der Ort vor der Zulassung aufgelöst (503, wenn Nominatim drosselt).
     """
     try:
-        result = gratis_check(data.geburtsdatum, data.geburtszeit, data.geburtsort)
+        geo = None
+        if data.ort_id or data.lat is not None:
+            geo = await run_in_threadpool(
+                geo_aus_angaben, data.geburtsort, data.ort_id, data.lat, data.lon, data.timezone,
+            )
+        result = gratis_check_tabelle(
+            data.geburtsdatum, data.geburtszeit, data.geburtsort, True, data.tierkreis, geo,
+        )
+        if result is None:
+            if geo is None and data.geburtsort:
+                geo = await run_in_threadpool(get_coordinates, data.geburtsort)
+            result = await _berechnen(data, geo)
+    except Abgewiesen as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except PoolUeberlastet:
+        raise HTTPException(
+            status_code=503,
+            detail="Zu viele Anfragen — bitte gleich noch einmal versuchen",
+            headers={"Retry-After": "5"},
+        )
+    except Gedrosselt as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Ortssuche ausgelastet — bitte gleich noch einmal versuchen",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Berechnung fehlgeschlagen: {e}")
 
-    # In DB speichern (DSGVO: IP nur als Hash)
-    check = GratisCheck(
-        geburtsdatum=data.geburtsdatum,
-        tropisch_sonne=result["tropisch"],
-        siderisch_sonne=result["siderisch"],
-        abweichung=result["abweichung"],
-        ip_hash=hash_ip(request),
-    )
-    db.add(check)
-    db.commit()
+    await run_in_threadpool(_speichern, db, data, result, hash_ip(request))
 
     return GratisCheckResponse(**result)
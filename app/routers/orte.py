@@ -0,0 +1,27 @@
+"""AstroMaster Backend — Ortssuche (Autocomplete) Endpoint."""
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.dependencies import limiter
+from app.schemas import OrtVorschlag
+from app.services.orte import get_ort_index
+
+router = APIRouter()
+
+
+@router.get("/api/orte/suggest", response_model=list[OrtVorschlag])
+@limiter.limit("300/minute")
+def suggest_orte(
+    request: Request,
+    q: str = Query(..., max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+):
+    """
+    Ortsvorschläge je Tastendruck (ab 2 Zeichen) aus dem Präfix-Index im
+    Speicher. Die ID eines Vorschlags (oder lat/lon) kann als ort_id mit
+    Gratis-Check, Checkout und Bestellung geschickt werden.
+    """
+    index = get_ort_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Ortssuche nicht verfügbar")
+    return index.suche(q, limit)
@@ -2,12 +2,12 @@
 
 import logging
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Bestellung
-from app.routers.bestellung import _process_order
+from app.routers.bestellung import verarbeitung_starten
 from app.services.stripe_service import extract_order_data, verify_webhook
 
 logger = logging.getLogger(__name__)
@@ -17,7 +17,6 @@ router = APIRouter()
 @router.post("/api/stripe-webhook")
 async def stripe_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
@@ -53,7 +52,12 @@ async def stripe_webhook(
         geburtsdatum=order_data["geburtsdatum"],
         geburtszeit=order_data["geburtszeit"],
         geburtsort=order_data["geburtsort"],
+        ort_id=order_data["ort_id"],
+        lat=order_data["lat"],
+        lon=order_data["lon"],
+        timezone=order_data["timezone"],
         version=order_data["version"],
+        tierkreis=order_data["tierkreis"],
         preis=order_data["preis"],
         stripe_session_id=order_data["stripe_session_id"],
         stripe_payment_id=order_data["stripe_payment_id"],
@@ -63,8 +67,8 @@ async def stripe_webhook(
     db.commit()
     db.refresh(bestellung)
 
-    # Verarbeitung starten
-    background_tasks.add_task(_process_order, str(bestellung.id))
+    # Verarbeitung im Bestellungs-Pool starten
+    verarbeitung_starten(str(bestellung.id))
 
     logger.info("Stripe-Webhook: Bestellung %s erstellt", bestellung.id)
     return {"status": "created", "id": str(bestellung.id)}
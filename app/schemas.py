@@ -2,8 +2,34 @@
 
 import uuid
 from datetime import datetime
+from zoneinfo import ZoneInfo
 
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+
+from app.modules.birth_moment import parse_datum, parse_zeit
+from app.modules.constellations import TIERKREISE
+
+
+def _check_tierkreis(v: str) -> str:
+    """Tierkreis-Modus prüfen ("siderisch" / "konstellationen")."""
+    if v not in TIERKREISE:
+        raise ValueError("Tierkreis muss 'siderisch' oder 'konstellationen' sein")
+    return v
+
+
+def _check_ort(ort_id: str | None, lat: float | None, lon: float | None, timezone: str | None) -> None:
+    """Orts-ID bzw. Koordinaten (statt Geocoding des Geburtsorts) prüfen."""
+    if (lat is None) != (lon is None):
+        raise ValueError("lat und lon nur zusammen angeben")
+    if lat is not None and not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("Ungültige Koordinaten")
+    if timezone is not None:
+        try:
+            ZoneInfo(timezone)
+        except Exception:
+            raise ValueError(f"Unbekannte Zeitzone: {timezone}")
+    if ort_id is not None and not ort_id.startswith(("geonames:", "geocode:")):
+        raise ValueError("Ungültige Orts-ID")
 
 
 # ─── Gratis-Check ───
@@ -12,37 +38,44 @@ class ZeichenVergleich(BaseModel):
     tropisch: str
     siderisch: str
     abweichung: bool
+    grenzfall: bool = False  # Zeichenwechsel innerhalb ±1 Tag
 
 
 class GratisCheckRequest(BaseModel):
     geburtsdatum: str  # DD.MM.YYYY
     geburtszeit: str | None = None  # HH:MM (optional)
     geburtsort: str | None = None  # (optional)
+    tierkreis: str = "siderisch"  # oder "konstellationen" (IAU-Sternbilder)
+    # Statt Geocoding: Orts-ID aus /api/orte/suggest oder Koordinaten
+    ort_id: str | None = None
+    lat: float | None = None
+    lon: float | None = None
+    timezone: str | None = None  # (optional, sonst aus lat/lon)
 
     @field_validator("geburtsdatum")
     @classmethod
     def validate_datum(cls, v: str) -> str:
-        parts = v.split(".")
-        if len(parts) != 3 or len(parts[0]) != 2 or len(parts[1]) != 2 or len(parts[2]) != 4:
-            raise ValueError("Format muss DD.MM.YYYY sein")
-        day, month, year = int(parts[0]), int(parts[1]), int(parts[2])
-        if not (1 <= day <= 31 and 1 <= month <= 12 and 1900 <= year <= 2030):
+        if not 1900 <= parse_datum(v).year <= 2030:
             raise ValueError("Ungültiges Datum")
         return v
 
     @field_validator("geburtszeit")
     @classmethod
     def validate_zeit(cls, v: str | None) -> str | None:
-        if v is None:
-            return v
-        parts = v.split(":")
-        if len(parts) != 2 or not parts[0].isdigit() or not parts[1].isdigit():
-            raise ValueError("Format muss HH:MM sein")
-        h, m = int(parts[0]), int(parts[1])
-        if not (0 <= h <= 23 and 0 <= m <= 59):
-            raise ValueError("Ungültige Uhrzeit")
+        if v is not None:
+            parse_zeit(v)
         return v
 
+    @field_validator("tierkreis")
+    @classmethod
+    def validate_tierkreis(cls, v: str) -> str:
+        return _check_tierkreis(v)
+
+    @model_validator(mode="after")
+    def validate_ort(self):
+        _check_ort(self.ort_id, self.lat, self.lon, self.timezone)
+        return self
+
 
 class GratisCheckResponse(BaseModel):
     # Backward compat (sun only)
@@ -55,6 +88,7 @@ class GratisCheckResponse(BaseModel):
     mond: ZeichenVergleich
     aszendent: ZeichenVergleich | None = None
     hat_uhrzeit: bool = False
+    tierkreis: str = "siderisch"
 
 
 # ─── Bestellung ───
@@ -66,25 +100,24 @@ class BestellungRequest(BaseModel):
     geburtszeit: str  # HH:MM
     geburtsort: str
     version: str = "normal"
+    tierkreis: str = "siderisch"  # oder "konstellationen" (IAU-Sternbilder)
     stripe_session_id: str | None = None
+    # Statt Geocoding: Orts-ID aus /api/orte/suggest oder Koordinaten
+    ort_id: str | None = None
+    lat: float | None = None
+    lon: float | None = None
+    timezone: str | None = None  # (optional, sonst aus lat/lon)
 
     @field_validator("geburtsdatum")
     @classmethod
     def validate_datum(cls, v: str) -> str:
-        parts = v.split(".")
-        if len(parts) != 3 or len(parts[0]) != 2 or len(parts[1]) != 2 or len(parts[2]) != 4:
-            raise ValueError("Format muss DD.MM.YYYY sein")
+        parse_datum(v)
         return v
 
     @field_validator("geburtszeit")
     @classmethod
     def validate_zeit(cls, v: str) -> str:
-        parts = v.split(":")
-        if len(parts) != 2 or not parts[0].isdigit() or not parts[1].isdigit():
-            raise ValueError("Format muss HH:MM sein")
-        h, m = int(parts[0]), int(parts[1])
-        if not (0 <= h <= 23 and 0 <= m <= 59):
-            raise ValueError("Ungültige Uhrzeit")
+        parse_zeit(v)
         return v
 
     @field_validator("version")
@@ -94,6 +127,16 @@ class BestellungRequest(BaseModel):
             raise ValueError("Version muss 'normal' oder 'pro' sein")
         return v
 
+    @field_validator("tierkreis")
+    @classmethod
+    def validate_tierkreis(cls, v: str) -> str:
+        return _check_tierkreis(v)
+
+    @model_validator(mode="after")
+    def validate_ort(self):
+        _check_ort(self.ort_id, self.lat, self.lon, self.timezone)
+        return self
+
 
 class BestellungStatusResponse(BaseModel):
     id: uuid.UUID
@@ -119,6 +162,7 @@ class AdminBestellungResponse(BaseModel):
     geburtszeit: str
     geburtsort: str
     version: str
+    tierkreis: str
     status: str
     preis: float
     stripe_session_id: str | None
@@ -138,6 +182,75 @@ class StatistikResponse(BaseModel):
     umsatz: float
 
 
+class ZulassungStats(BaseModel):
+    limit: int
+    warteschlange: int
+    wartezeit_max_s: float
+    aktiv: int
+    wartend: int
+    max_wartend: int
+    zugelassen: int
+    abgewiesen_voll: int
+    abgewiesen_wartezeit: int
+    mittlere_wartezeit_ms: float
+    mittlere_bearbeitung_ms: float
+
+
+class PoolStats(BaseModel):
+    worker: int
+    warteschlange: int
+    aktiv: int
+    wartend: int
+    abgewiesen: int
+
+
+class LastResponse(BaseModel):
+    gratis_check: ZulassungStats | None
+    ephemeris_pool: PoolStats | None
+
+
+class GeocodingCacheStats(BaseModel):
+    eintraege: int
+    max_eintraege: int
+    negativ: int
+    bytes: int
+    max_bytes: int
+    ttl_s: float
+    ttl_negativ_s: float
+    treffer: int
+    treffer_negativ: int
+    fehlschlaege: int
+    abgelaufen: int
+    verdraengt: int
+    trefferquote: float
+
+
+class UpstreamStats(BaseModel):
+    rate_pro_s: float
+    burst: int
+    zugelassen: int
+    abgewiesen: int
+    wartend: int
+    max_wartezeit_s: float
+    laufend: int
+    koalesziert: int
+
+
+class GeocodingResponse(BaseModel):
+    cache: GeocodingCacheStats
+    nominatim: UpstreamStats
+
+
+# ─── Orte ───
+
+class OrtVorschlag(BaseModel):
+    id: str  # "geonames:<id>" oder "geocode:<schlüssel>"
+    name: str
+    lat: float
+    lon: float
+    timezone: str
+
+
 # ─── Health ───
 
 class HealthResponse(BaseModel):
@@ -0,0 +1,161 @@
+"""AstroMaster Backend — Zulassungskontrolle (Admission Control) für Berechnungen.
+
+slowapi begrenzt nur pro IP. Bei Kampagnen-Spitzen kommen aber viele IPs
+gleichzeitig — ohne globale Grenze stauen sich Anfragen, bis sie alle zu
+spät fertig werden. Der Controller lässt höchstens `limit` Berechnungen
+gleichzeitig zu, hält bis zu `warteschlange` weitere in einer FIFO und
+weist den Rest sofort ab:
+
+    - Warteschlange voll          → 429 mit Retry-After
+    - Wartezeit (Deadline) vorbei → 503 mit Retry-After
+
+Zugelassene Anfragen sehen so auch unter Überlast eine konstante Latenz.
+Gewartet wird im Event-Loop (asyncio), nicht in Threads des Thread-Pools.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# Glättung der gleitenden Mittelwerte (Wartezeit, Bearbeitungszeit)
+_EWMA_ALPHA = 0.1
+
+
+class Abgewiesen(Exception):
+    """Anfrage nicht zugelassen (status_code 429 oder 503, retry_after in Sekunden)."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Begrenzte Parallelität + begrenzte Warteschlange mit Deadline (ein Event-Loop)."""
+
+    def __init__(self, limit: int, warteschlange: int, wartezeit: float):
+        if limit < 1:
+            raise ValueError(f"Limit muss >= 1 sein: {limit}")
+        if warteschlange < 0 or wartezeit < 0:
+            raise ValueError("Warteschlange und Wartezeit müssen >= 0 sein")
+        self.limit = limit
+        self.warteschlange = warteschlange
+        self.wartezeit = wartezeit
+
+        self._aktiv = 0
+        self._wartend: deque[asyncio.Future] = deque()
+
+        # Metriken
+        self.zugelassen = 0
+        self.abgewiesen_voll = 0
+        self.abgewiesen_wartezeit = 0
+        self.max_wartend = 0
+        self._mittel_wartezeit = 0.0
+        self._mittel_bearbeitung = 0.0
+
+    def _retry_after(self) -> int:
+        """Geschätzte Sekunden, bis die aktuelle Warteschlange abgearbeitet ist."""
+        runden = (len(self._wartend) + 1) / self.limit
+        return max(1, math.ceil(runden * self._mittel_bearbeitung))
+
+    def _freigeben(self) -> None:
+        """Platz an den nächsten Wartenden übergeben (oder zurückgeben)."""
+        while self._wartend:
+            future = self._wartend.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self._aktiv -= 1
+
+    async def _warten(self) -> None:
+        if len(self._wartend) >= self.warteschlange:
+            self.abgewiesen_voll += 1
+            raise Abgewiesen(429, "Zu viele Anfragen — bitte gleich noch einmal versuchen", self._retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        self._wartend.append(future)
+        self.max_wartend = max(self.max_wartend, len(self._wartend))
+        try:
+            await asyncio.wait_for(future, self.wartezeit)
+        except asyncio.TimeoutError:
+            self._entfernen(future)
+            self.abgewiesen_wartezeit += 1
+            raise Abgewiesen(503, "Server ausgelastet — bitte gleich noch einmal versuchen", self._retry_after())
+        except BaseException:
+            # Client weg (CancelledError): bereits übergebenen Platz weiterreichen
+            if future.done() and not future.cancelled():
+                self._freigeben()
+            else:
+                self._entfernen(future)
+            raise
+
+    def _entfernen(self, future: asyncio.Future) -> None:
+        try:
+            self._wartend.remove(future)
+        except ValueError:
+            pass
+
+    @asynccontextmanager
+    async def zulassen(self):
+        """
+        async with controller.zulassen(): ... — wartet auf einen freien Platz.
+
+        Raises:
+            Abgewiesen: Warteschlange voll (429) oder Wartezeit abgelaufen (503).
+        """
+        start = time.perf_counter()
+        if self._aktiv < self.limit and not self._wartend:
+            self._aktiv += 1
+        else:
+            await self._warten()
+
+        beginn = time.perf_counter()
+        self.zugelassen += 1
+        self._mittel_wartezeit += _EWMA_ALPHA * (beginn - start - self._mittel_wartezeit)
+        try:
+            yield
+        finally:
+            dauer = time.perf_counter() - beginn
+            self._mittel_bearbeitung += _EWMA_ALPHA * (dauer - self._mittel_bearbeitung)
+            self._freigeben()
+
+    def stats(self) -> dict:
+        """Momentaufnahme für /api/admin/last."""
+        return {
+            "limit": self.limit,
+            "warteschlange": self.warteschlange,
+            "wartezeit_max_s": self.wartezeit,
+            "aktiv": self._aktiv,
+            "wartend": len(self._wartend),
+            "max_wartend": self.max_wartend,
+            "zugelassen": self.zugelassen,
+            "abgewiesen_voll": self.abgewiesen_voll,
+            "abgewiesen_wartezeit": self.abgewiesen_wartezeit,
+            "mittlere_wartezeit_ms": round(self._mittel_wartezeit * 1000, 2),
+            "mittlere_bearbeitung_ms": round(self._mittel_bearbeitung * 1000, 2),
+        }
+
+
+_controller: AdmissionController | None = None
+
+
+def configure_admission(limit: int, warteschlange: int, wartezeit: float) -> AdmissionController:
+    """Legt den globalen Controller an (beim App-Start)."""
+    global _controller
+    _controller = AdmissionController(limit, warteschlange, wartezeit)
+    logger.info(
+        "Zulassungskontrolle: %d parallel, Warteschlange %d, Wartezeit %.1fs",
+        limit, warteschlange, wartezeit,
+    )
+    return _controller
+
+
+def get_admission() -> AdmissionController | None:
+    """Der globale Controller oder None (dann ohne Zulassungskontrolle)."""
+    return _controller
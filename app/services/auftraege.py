@@ -0,0 +1,129 @@
+"""AstroMaster Backend — Hintergrund-Verarbeitung der Bestellungen.
+
+BackgroundTasks von FastAPI laufen im selben Thread-Pool wie die
+sync-Endpoints. Eine Bestellung, die auf den Ephemeriden-Pool, Nominatim
+oder ihren nächsten Versuch wartet, würde dort minutenlang einen Thread
+belegen — gerade unter der Überlast, die Wiederholungen auslöst. Deshalb:
+
+    - Bestellungen laufen in einem eigenen ThreadPoolExecutor
+    - Wiederholungen schlafen nicht: einreihen(..., verzoegerung=s) legt
+      den Auftrag in einen Zeitplan (ein Thread, Heap), der ihn erst zum
+      Termin an den Executor gibt
+
+Geplante Termine leben nur im Speicher; nach einem Neustart holt der
+Start-Sweep (bestellung.offene_bestellungen_einreihen) sie aus der DB.
+Ist nichts gestartet (Skripte), läuft einreihen() direkt im Aufrufer.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class Auftraege:
+    """Eigener Thread-Pool + Zeitplan für verzögerte Aufträge."""
+
+    def __init__(self, worker: int):
+        if worker < 1:
+            raise ValueError(f"Worker muss >= 1 sein: {worker}")
+        self.worker = worker
+        self._executor = ThreadPoolExecutor(worker, thread_name_prefix="bestellung")
+        self._termine: list[tuple[float, int, object, tuple]] = []
+        self._zaehler = itertools.count()
+        self._bedingung = threading.Condition()
+        self._laeuft = True
+        self._zeitplan = threading.Thread(
+            target=self._planen, name="bestellung-zeitplan", daemon=True,
+        )
+        self._zeitplan.start()
+
+    def einreihen(self, funktion, *args, verzoegerung: float = 0.0) -> None:
+        """Führt funktion(*args) im Executor aus — frühestens nach `verzoegerung` Sekunden."""
+        if verzoegerung <= 0:
+            self._executor.submit(self._ausfuehren, funktion, *args)
+            return
+        with self._bedingung:
+            termin = time.monotonic() + verzoegerung
+            heapq.heappush(self._termine, (termin, next(self._zaehler), funktion, args))
+            self._bedingung.notify()
+
+    @property
+    def geplant(self) -> int:
+        """Anzahl Aufträge, die noch auf ihren Termin warten."""
+        with self._bedingung:
+            return len(self._termine)
+
+    def _planen(self) -> None:
+        with self._bedingung:
+            while self._laeuft:
+                if not self._termine:
+                    self._bedingung.wait()
+                    continue
+                rest = self._termine[0][0] - time.monotonic()
+                if rest > 0:
+                    self._bedingung.wait(rest)
+                    continue
+                _, _, funktion, args = heapq.heappop(self._termine)
+                self._executor.submit(self._ausfuehren, funktion, *args)
+
+    @staticmethod
+    def _ausfuehren(funktion, *args) -> None:
+        try:
+            funktion(*args)
+        except Exception:
+            logger.exception("Hintergrund-Auftrag %s fehlgeschlagen", funktion.__name__)
+
+    def shutdown(self) -> int:
+        """Beendet Zeitplan und Executor; gibt die verworfenen Termine zurück."""
+        with self._bedingung:
+            self._laeuft = False
+            verworfen = len(self._termine)
+            self._termine.clear()
+            self._bedingung.notify()
+        self._zeitplan.join()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        return verworfen
+
+
+_auftraege: Auftraege | None = None
+
+
+def start_auftraege(worker: int) -> Auftraege:
+    """Startet den globalen Bestellungs-Pool (z.B. beim App-Start)."""
+    global _auftraege
+    if _auftraege is None:
+        _auftraege = Auftraege(worker)
+        logger.info("Bestellungen: %d Threads", worker)
+    return _auftraege
+
+
+def stop_auftraege() -> None:
+    """Beendet den globalen Bestellungs-Pool (z.B. beim App-Shutdown)."""
+    global _auftraege
+    if _auftraege is not None:
+        verworfen = _auftraege.shutdown()
+        _auftraege = None
+        logger.info("Bestellungen beendet (%d geplante Versuche bis zum Neustart vertagt)", verworfen)
+
+
+def get_auftraege() -> Auftraege | None:
+    """Der laufende Bestellungs-Pool oder None (dann wird direkt ausgeführt)."""
+    return _auftraege
+
+
+def einreihen(funktion, *args, verzoegerung: float = 0.0) -> None:
+    """
+    Führt funktion(*args) im Bestellungs-Pool aus, frühestens nach
+    `verzoegerung` Sekunden. Ohne Pool direkt (nach der Verzögerung).
+    """
+    if _auftraege is None:
+        if verzoegerung > 0:
+            time.sleep(verzoegerung)
+        funktion(*args)
+        return
+    _auftraege.einreihen(funktion, *args, verzoegerung=verzoegerung)
@@ -1,11 +1,28 @@
 """AstroMaster Backend — Berechnungs-Service."""
 
+import asyncio
 import logging
+import time
 
-from app.modules.tropical import calculate_tropical
-from app.modules.sidereal import calculate_sidereal
+from app.config import settings
+from app.modules.ascendant import ascendant
+from app.modules.birth_moment import BirthMoment
+from app.modules.chart_context import ChartContext
+from app.modules.constellations import (
+    TIERKREIS_KONSTELLATIONEN,
+    TIERKREIS_SIDERISCH,
+    calculate_constellations,
+)
+from app.modules.chebyshev import get_cache, nahe_grenze, nahe_raster
+from app.modules.ingress_index import VARIANTE_SIDERISCH, VARIANTE_TROPISCH, get_index
+from app.modules.tropical import SIGN_MAP, calculate_tropical
+from app.modules.sidereal import calculate_sidereal, get_standard_ayanamsa
+from app.modules.zodiac_index import ZEICHEN, get_zodiac_index
 from app.modules.master_calculator import calculate_all
 from app.modules.geocoding import get_coordinates
+from app.modules.token_bucket import Gedrosselt
+from app.services import ephemeris_pool
+from app.services.gratis_table import get_table
 
 logger = logging.getLogger(__name__)
 
@@ -15,70 +32,262 @@ DEFAULT_LON = 13.40
 DEFAULT_TZ = "Europe/Berlin"
 DEFAULT_TIME = "12:00"
 
+# So lange über die Gesamtfrist hinaus wartet full_calculation auf den Pool
+# (calculate_all gibt bei Fristablauf noch Teilergebnisse zurück)
+_NACHLAUF = 5.0
 
-def gratis_check(geburtsdatum: str, geburtszeit: str | None = None, geburtsort: str | None = None) -> dict:
+
+def _zeichen_aus_index(index, moment: BirthMoment) -> tuple[dict, dict] | None:
+    """
+    Sonne/Mond-Zeichen direkt aus dem Ingress-Index (ohne Ephemeride).
+
+    Returns:
+        (tropisch, siderisch) im Format der Module, oder None wenn das
+        Datum außerhalb des Index liegt oder nicht Lahiri der Standard ist
+        (der Index kennt nur Lahiri-Zeichen).
+    """
+    jd = moment.julian_day
+    if not index.deckt(jd) or get_standard_ayanamsa() != "LAHIRI":
+        return None
+
+    tropisch, siderisch = {}, {}
+    for key, body in (("sonne", "sun"), ("mond", "moon")):
+        tropisch[key] = {
+            "zeichen": SIGN_MAP[index.sign(body, jd, VARIANTE_TROPISCH)],
+            "ist_grenzfall": index.ist_grenzfall(body, jd, VARIANTE_TROPISCH),
+        }
+        siderisch[key] = {
+            "zeichen": SIGN_MAP[index.sign(body, jd, VARIANTE_SIDERISCH)],
+            "ist_ophiuchus": index.ist_ophiuchus(body, jd),
+            "ist_grenzfall": index.ist_grenzfall(body, jd, VARIANTE_SIDERISCH),
+        }
+    return tropisch, siderisch
+
+
+def _zeichen_aus_chebyshev(cache, index, moment: BirthMoment, hat_uhrzeit: bool) -> tuple[dict, dict] | None:
+    """
+    Sonne/Mond (und Aszendent) aus der Chebyshev-Ephemeride, ohne swisseph.
+
+    Returns:
+        (tropisch, siderisch) im Format der Module, oder None wenn der
+        Zeitpunkt nicht abgedeckt ist oder eine Position näher als die
+        Toleranz an einer Zeichen-/Dekan-/Ophiuchus-Grenze liegt
+        (dann entscheidet swisseph).
+    """
+    jd = moment.julian_day
+    if not cache.deckt(jd) or get_standard_ayanamsa() != "LAHIRI":
+        return None
+
+    tierkreis = get_zodiac_index()
+    ayanamsa_wert = cache.ayanamsa(jd)
+    positionen = [("sonne", cache.longitude("sun", jd)), ("mond", cache.longitude("moon", jd))]
+    if hat_uhrzeit:
+        positionen.append(("aszendent", ascendant(jd, moment.lat, moment.lon)))
+
+    tropisch, siderisch = {}, {}
+    for key, lon in positionen:
+        sid = (lon - ayanamsa_wert) % 360.0
+        if nahe_raster(lon, 30.0) or nahe_grenze(sid, tierkreis.grenzen):
+            return None
+        eintrag = tierkreis.lookup(sid)
+        tropisch[key] = {"zeichen": ZEICHEN[int(lon // 30.0) % 12]}
+        siderisch[key] = {"zeichen": eintrag.zeichen, "ist_ophiuchus": eintrag.ist_ophiuchus}
+
+    # Grenzfall: wie in den Modulen aus dem Ingress-Index (falls geladen)
+    if index is not None and index.deckt(jd):
+        for key, body in (("sonne", "sun"), ("mond", "moon")):
+            tropisch[key]["ist_grenzfall"] = index.ist_grenzfall(body, jd, VARIANTE_TROPISCH)
+            siderisch[key]["ist_grenzfall"] = index.ist_grenzfall(body, jd, VARIANTE_SIDERISCH)
+    return tropisch, siderisch
+
+
+def gratis_check_tabelle(
+    geburtsdatum: str,
+    geburtszeit: str | None,
+    geburtsort: str | None,
+    use_table: bool,
+    tierkreis: str,
+    geo: dict | None = None,
+) -> dict | None:
+    """
+    Häufigster Fall (Marketing-Funnel): nur Datum → Tabellen-Lookup im Aufrufer.
+    None, wenn gerechnet werden muss.
+    """
+    if not use_table or tierkreis == TIERKREIS_KONSTELLATIONEN or geburtszeit or geburtsort or geo:
+        return None
+    table = get_table()
+    return table.lookup(geburtsdatum) if table is not None else None
+
+
+def _koordinaten(geburtsort: str | None, geo: dict | None = None) -> tuple[float, float, str]:
+    """(lat, lon, timezone) des bereits aufgelösten bzw. des Geburtsorts, sonst Default (Berlin)."""
+    if geo is None:
+        if not geburtsort:
+            return DEFAULT_LAT, DEFAULT_LON, DEFAULT_TZ
+        geo = get_coordinates(geburtsort)
+    return geo["lat"], geo["lon"], geo["timezone"]
+
+
+def gratis_check(
+    geburtsdatum: str,
+    geburtszeit: str | None = None,
+    geburtsort: str | None = None,
+    use_table: bool = True,
+    tierkreis: str = TIERKREIS_SIDERISCH,
+    geo: dict | None = None,
+) -> dict:
     """
     Vergleich: tropisch vs. siderisch — Sonne, Mond, optional Aszendent.
+
+    Mit tierkreis="konstellationen" stehen in den "siderisch"-Feldern die
+    IAU-Sternbilder (Ophiuchus als 13. Zeichen); Tabelle und Ingress-Index
+    gelten nur für den siderischen Tierkreis und werden dann übersprungen.
+
+    Ohne Uhrzeit und Ort hängt die Antwort nur vom Datum ab und kommt
+    direkt aus der vorberechneten Gratis-Tabelle (use_table=False erzwingt
+    die Berechnung, z.B. beim Erzeugen der Tabelle).
+
+    Sonst wird der Ort hier (im aufrufenden Prozess, mit dessen
+    Geocoding-Cache) aufgelöst — entfällt mit geo (Orts-ID / Koordinaten
+    aus dem Formular) — und die Berechnung im Ephemeriden-Pool ausgeführt.
+
+    Raises:
+        PoolUeberlastet: Wenn der Ephemeriden-Pool ausgelastet ist.
+        Gedrosselt: Wenn der Ort nur online gefunden werden kann und
+            Nominatim ausgelastet ist.
     """
     try:
-        # Koordinaten bestimmen
-        if geburtsort:
-            geo = get_coordinates(geburtsort)
-            lat, lon, tz = geo["lat"], geo["lon"], geo["timezone"]
-        else:
-            lat, lon, tz = DEFAULT_LAT, DEFAULT_LON, DEFAULT_TZ
+        result = gratis_check_tabelle(geburtsdatum, geburtszeit, geburtsort, use_table, tierkreis, geo)
+        if result is not None:
+            return result
+        lat, lon, tz = _koordinaten(geburtsort, geo)
+        return ephemeris_pool.call(
+            _gratis_check, geburtsdatum, geburtszeit, lat, lon, tz, tierkreis,
+        )
+    except (ephemeris_pool.PoolUeberlastet, Gedrosselt):
+        raise
+    except Exception as e:
+        logger.error("Gratis-Check fehlgeschlagen: %s", e)
+        raise
 
-        zeit = geburtszeit or DEFAULT_TIME
-        hat_uhrzeit = geburtszeit is not None
 
-        tropisch = calculate_tropical(
-            "Check", geburtsdatum, zeit, lat, lon, tz,
-        )
-        siderisch = calculate_sidereal(
-            "Check", geburtsdatum, zeit, lat, lon, tz,
+async def gratis_check_async(
+    geburtsdatum: str,
+    geburtszeit: str | None = None,
+    geburtsort: str | None = None,
+    use_table: bool = True,
+    tierkreis: str = TIERKREIS_SIDERISCH,
+    geo: dict | None = None,
+) -> dict:
+    """Wie gratis_check(), für async-Endpoints (blockiert den Event-Loop nicht)."""
+    try:
+        result = gratis_check_tabelle(geburtsdatum, geburtszeit, geburtsort, use_table, tierkreis, geo)
+        if result is not None:
+            return result
+        if geo is None:
+            lat, lon, tz = await asyncio.to_thread(_koordinaten, geburtsort)
+        else:
+            lat, lon, tz = _koordinaten(geburtsort, geo)
+        return await ephemeris_pool.call_async(
+            _gratis_check, geburtsdatum, geburtszeit, lat, lon, tz, tierkreis,
         )
+    except (ephemeris_pool.PoolUeberlastet, Gedrosselt):
+        raise
+    except Exception as e:
+        logger.error("Gratis-Check fehlgeschlagen: %s", e)
+        raise
 
-        trop_sonne = tropisch["sonne"]["zeichen"]
-        sid_sonne = siderisch["sonne"]["zeichen"]
-        ophiuchus = siderisch["sonne"].get("ist_ophiuchus", False)
 
-        trop_mond = tropisch["mond"]["zeichen"]
-        sid_mond = siderisch["mond"]["zeichen"]
+def _gratis_check(
+    geburtsdatum: str,
+    geburtszeit: str | None,
+    lat: float,
+    lon: float,
+    tz: str,
+    tierkreis: str,
+) -> dict:
+    """
+    Berechnung des Gratis-Checks (läuft im Ephemeriden-Pool).
 
-        result = {
-            # Backward compat
+    Ohne Uhrzeit (kein Aszendent) kommen die Zeichen aus dem Ingress-Index,
+    sofern er erzeugt wurde — dann ist keine Ephemeriden-Berechnung nötig.
+    Mit Uhrzeit rechnet die Chebyshev-Ephemeride (plus geschlossene
+    Aszendenten-Formel); nur an Grenzen wird swisseph gefragt.
+    """
+    konstellationen = tierkreis == TIERKREIS_KONSTELLATIONEN
+    hat_uhrzeit = geburtszeit is not None
+    moment = BirthMoment.from_strings(
+        geburtsdatum, geburtszeit or DEFAULT_TIME, lat, lon, tz,
+    )
+
+    index = get_index()
+    zeichen = None
+    if index is not None and not hat_uhrzeit and not konstellationen:
+        zeichen = _zeichen_aus_index(index, moment)
+
+    cache = get_cache()
+    if zeichen is None and cache is not None and not konstellationen:
+        zeichen = _zeichen_aus_chebyshev(cache, index, moment, hat_uhrzeit)
+
+    if zeichen is not None:
+        tropisch, siderisch = zeichen
+    else:
+        # Tropisch und Siderisch (bzw. Sternbilder) teilen sich das tropische Chart
+        ctx = ChartContext()
+        tropisch = calculate_tropical("Check", moment, ctx=ctx)
+        if konstellationen:
+            siderisch = calculate_constellations("Check", moment, ctx=ctx)
+        else:
+            siderisch = calculate_sidereal("Check", moment, ctx=ctx)
+
+    trop_sonne = tropisch["sonne"]["zeichen"]
+    sid_sonne = siderisch["sonne"]["zeichen"]
+    ophiuchus = siderisch["sonne"].get("ist_ophiuchus", False)
+
+    trop_mond = tropisch["mond"]["zeichen"]
+    sid_mond = siderisch["mond"]["zeichen"]
+
+    result = {
+        # Backward compat
+        "tropisch": trop_sonne,
+        "siderisch": sid_sonne,
+        "abweichung": trop_sonne != sid_sonne,
+        "ophiuchus": ophiuchus,
+        # Extended
+        "sonne": {
             "tropisch": trop_sonne,
             "siderisch": sid_sonne,
             "abweichung": trop_sonne != sid_sonne,
-            "ophiuchus": ophiuchus,
-            # Extended
-            "sonne": {
-                "tropisch": trop_sonne,
-                "siderisch": sid_sonne,
-                "abweichung": trop_sonne != sid_sonne,
-            },
-            "mond": {
-                "tropisch": trop_mond,
-                "siderisch": sid_mond,
-                "abweichung": trop_mond != sid_mond,
-            },
-            "aszendent": None,
-            "hat_uhrzeit": hat_uhrzeit,
+            "grenzfall": _ist_grenzfall(tropisch, siderisch, "sonne"),
+        },
+        "mond": {
+            "tropisch": trop_mond,
+            "siderisch": sid_mond,
+            "abweichung": trop_mond != sid_mond,
+            "grenzfall": _ist_grenzfall(tropisch, siderisch, "mond"),
+        },
+        "aszendent": None,
+        "hat_uhrzeit": hat_uhrzeit,
+        "tierkreis": tierkreis,
+    }
+
+    if hat_uhrzeit:
+        trop_asc = tropisch["aszendent"]["zeichen"]
+        sid_asc = siderisch["aszendent"]["zeichen"]
+        result["aszendent"] = {
+            "tropisch": trop_asc,
+            "siderisch": sid_asc,
+            "abweichung": trop_asc != sid_asc,
         }
 
-        if hat_uhrzeit:
-            trop_asc = tropisch["aszendent"]["zeichen"]
-            sid_asc = siderisch["aszendent"]["zeichen"]
-            result["aszendent"] = {
-                "tropisch": trop_asc,
-                "siderisch": sid_asc,
-                "abweichung": trop_asc != sid_asc,
-            }
+    return result
 
-        return result
-    except Exception as e:
-        logger.error("Gratis-Check fehlgeschlagen: %s", e)
-        raise
+
+def _ist_grenzfall(tropisch: dict, siderisch: dict, key: str) -> bool:
+    """True wenn ±1 Tag (oder fehlende Uhrzeit) eines der Zeichen ändern könnte."""
+    return bool(
+        tropisch[key].get("ist_grenzfall") or siderisch[key].get("ist_grenzfall")
+    )
 
 
 def full_calculation(
@@ -86,6 +295,68 @@ def full_calculation(
     geburtsdatum: str,
     geburtszeit: str,
     geburtsort: str,
+    version: str = "normal",
+    tierkreis: str = TIERKREIS_SIDERISCH,
+    geo: dict | None = None,
+) -> dict:
+    """
+    Führt die komplette Berechnung durch (alle 7 Module, im Ephemeriden-Pool).
+
+    Der Ort wird vorher hier aufgelöst (Geocoding-Cache des aufrufenden
+    Prozesses); schlägt das fehl, liefert calculate_all direkt das übliche
+    Ergebnis mit Geocoding-Fehler. Mit geo (bei der Bestellung gewählte
+    Orts-ID / Koordinaten) entfällt das Geocoding. Bestellungen haben keine
+    Latenzanforderung: sie warten bis zu BESTELLUNG_NOMINATIM_WARTEZEIT
+    Sekunden in der Nominatim-Warteschlange, statt wie Gratis-Checks
+    abgewiesen zu werden.
+
+    Mit MODULE_PARALLEL laufen Tropisch, Siderisch, Sternbilder und Human
+    Design stattdessen als eigene, gleichzeitige Pool-Aufgaben (lohnt erst,
+    wenn die Module deutlich länger brauchen als der Prozess-Wechsel);
+    ist der Pool dann ausgelastet, steht das betroffene Modul in "fehler".
+
+    Die Gesamtfrist ist BERECHNUNG_FRIST Sekunden ab dem Geocoding; was sie
+    oder sein Modul-Budget verpasst, steht in "fehler" (siehe meta["module"]).
+
+    Raises:
+        PoolUeberlastet: Wenn der Ephemeriden-Pool ausgelastet ist.
+        TimeoutError: Wenn der Pool auch kurz nach der Frist kein Ergebnis
+            liefert (hängendes Modul).
+    """
+    if geo is None:
+        try:
+            geo = get_coordinates(geburtsort, wartezeit=settings.BESTELLUNG_NOMINATIM_WARTEZEIT)
+        except Exception as e:
+            return calculate_all(
+                name, geburtsdatum, geburtszeit, geburtsort,
+                version=version, tierkreis=tierkreis, geo=e,
+            )
+
+    frist_bis = time.time() + settings.BERECHNUNG_FRIST
+    pool = ephemeris_pool.get_pool()
+    if settings.MODULE_PARALLEL and pool is not None:
+        return calculate_all(
+            name, geburtsdatum, geburtszeit, geburtsort,
+            version=version, tierkreis=tierkreis, geo=geo, executor=pool, frist_bis=frist_bis,
+        )
+    return ephemeris_pool.call(
+        calculate_all,
+        name, geburtsdatum, geburtszeit, geburtsort,
+        version=version, tierkreis=tierkreis, geo=geo, frist_bis=frist_bis,
+        timeout=frist_bis - time.time() + _NACHLAUF,
+    )
+
+
+async def full_calculation_async(
+    name: str,
+    geburtsdatum: str,
+    geburtszeit: str,
+    geburtsort: str,
+    version: str = "normal",
+    tierkreis: str = TIERKREIS_SIDERISCH,
+    geo: dict | None = None,
 ) -> dict:
-    """Führt die komplette Berechnung durch (alle 7 Module)."""
-    return calculate_all(name, geburtsdatum, geburtszeit, geburtsort)
+    """Wie full_calculation(), für async-Endpoints (wartet in einem Thread)."""
+    return await asyncio.to_thread(
+        full_calculation, name, geburtsdatum, geburtszeit, geburtsort, version, tierkreis, geo,
+    )
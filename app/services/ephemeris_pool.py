@@ -0,0 +1,240 @@
+"""AstroMaster Backend — Ephemeriden-Prozess-Pool.
+
+swisseph hält prozessglobalen Zustand (Sidereal-Modus, Ephemeriden-Pfad),
+den kerykeion und ayanamsa() pro Chart umstellen. Laufen Gratis-Checks und
+Bestellungen parallel im Thread-Pool von FastAPI, können sie sich diesen
+Zustand gegenseitig verstellen — und teilen sich außerdem den GIL.
+
+Deshalb laufen alle Berechnungen in Worker-Prozessen (spawn, ein
+swisseph pro Prozess):
+    - jeder Worker wärmt beim Start seine Caches auf (Ephemeride,
+      Ingress-Index, Chebyshev, Gratis-Tabelle, Zeitzonen)
+    - die Warteschlange ist begrenzt; ist sie voll, wird nach kurzer
+      Wartezeit PoolUeberlastet geworfen statt unbegrenzt zu puffern
+    - sync: call(funktion, ...)  /  async: await call_async(funktion, ...)
+
+Ist kein Pool gestartet (Skripte, Tabellen-Build, Batch) oder läuft der
+Aufruf bereits in einem Worker, wird die Funktion direkt ausgeführt.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolUeberlastet(RuntimeError):
+    """Warteschlange des Ephemeriden-Pools ist voll."""
+
+
+def _init_worker(konfiguration: dict) -> None:
+    """Initialisiert einen Worker-Prozess: Konfiguration + warme Caches."""
+    from app.modules.chart_context import set_default_engine
+    from app.modules.chebyshev import configure_chebyshev, get_cache
+    from app.modules.ephemeris import configure_ephemeris, preload_ephemeris_files, warm_up
+    from app.modules.ingress_index import get_index
+    from app.modules.timezones import preload_zones
+    from app.modules.zodiac_index import get_zodiac_index
+    from app.services.calculation import DEFAULT_TZ
+    from app.services.gratis_table import get_table
+
+    logging.basicConfig(
+        level=konfiguration["log_level"],
+        format="%(asctime)s [%(levelname)s] %(name)s[%(process)d]: %(message)s",
+    )
+    set_default_engine(konfiguration["engine"])
+    configure_ephemeris(konfiguration["ephemeris_modus"], konfiguration["ephemeris_pfad"])
+    configure_chebyshev(konfiguration["chebyshev_toleranz"])
+    get_zodiac_index()
+    if konfiguration["aufwaermen"]:
+        preload_ephemeris_files()
+        warm_up()
+        get_index()
+        get_cache()
+        get_table()
+        preload_zones([DEFAULT_TZ])
+
+
+def _ping() -> int:
+    """Startet einen Worker (Initializer) und meldet seine PID."""
+    return os.getpid()
+
+
+class EphemerisPool:
+    """ProcessPoolExecutor mit begrenzter Warteschlange."""
+
+    def __init__(self, worker: int, warteschlange: int, wartezeit: float, konfiguration: dict):
+        self.worker = worker
+        self.warteschlange = warteschlange
+        self.wartezeit = wartezeit
+        self._konfiguration = konfiguration
+        # Plätze = laufende + wartende Aufgaben
+        self._plaetze = threading.BoundedSemaphore(worker + warteschlange)
+        self._lock = threading.Lock()
+        self._belegt = 0
+        self.abgewiesen = 0
+        self._executor = self._neuer_executor()
+
+    def _neuer_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.worker,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._konfiguration,),
+        )
+
+    def starten(self) -> list[int]:
+        """Startet alle Worker sofort (statt beim ersten Request) und wartet auf sie."""
+        futures = [self._executor.submit(_ping) for _ in range(self.worker)]
+        return sorted({f.result() for f in futures})
+
+    def _submit(self, funktion, args, kwargs) -> Future:
+        try:
+            future = self._executor.submit(funktion, *args, **kwargs)
+        except BrokenProcessPool:
+            # Ein Worker ist abgestürzt — Pool ersetzen und einmal neu versuchen
+            with self._lock:
+                logger.error("Ephemeriden-Pool defekt — starte Worker neu")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._neuer_executor()
+            future = self._executor.submit(funktion, *args, **kwargs)
+        with self._lock:
+            self._belegt += 1
+        future.add_done_callback(self._fertig)
+        return future
+
+    def _fertig(self, _future: Future) -> None:
+        with self._lock:
+            self._belegt -= 1
+        self._plaetze.release()
+
+    def _voll(self) -> PoolUeberlastet:
+        with self._lock:
+            self.abgewiesen += 1
+        return PoolUeberlastet("Ephemeriden-Pool ausgelastet")
+
+    def submit(self, funktion, *args, **kwargs) -> Future:
+        """Reiht eine Aufgabe ein; wartet höchstens `wartezeit` auf einen freien Platz."""
+        if not self._plaetze.acquire(timeout=self.wartezeit):
+            raise self._voll()
+        try:
+            return self._submit(funktion, args, kwargs)
+        except BaseException:
+            self._plaetze.release()
+            raise
+
+    def submit_nowait(self, funktion, *args, **kwargs) -> Future:
+        """Wie submit(), wartet aber nicht (für den Event-Loop)."""
+        if not self._plaetze.acquire(blocking=False):
+            raise self._voll()
+        try:
+            return self._submit(funktion, args, kwargs)
+        except BaseException:
+            self._plaetze.release()
+            raise
+
+    def stats(self) -> dict:
+        """Momentaufnahme für /api/admin/last."""
+        belegt = self._belegt
+        return {
+            "worker": self.worker,
+            "warteschlange": self.warteschlange,
+            "aktiv": min(belegt, self.worker),
+            "wartend": max(belegt - self.worker, 0),
+            "abgewiesen": self.abgewiesen,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: EphemerisPool | None = None
+
+
+def start_pool(
+    worker: int,
+    warteschlange: int,
+    wartezeit: float,
+    konfiguration: dict,
+) -> EphemerisPool:
+    """
+    Startet den globalen Pool (z.B. beim App-Start).
+
+    Args:
+        worker: Anzahl Prozesse (0 = alle Kerne)
+        warteschlange: maximale Anzahl wartender Aufgaben zusätzlich zu den laufenden
+        wartezeit: Sekunden, die call() auf einen freien Platz wartet
+        konfiguration: engine, ephemeris_modus, ephemeris_pfad,
+            chebyshev_toleranz, aufwaermen, log_level
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+    worker = worker or os.cpu_count() or 1
+    _pool = EphemerisPool(worker, warteschlange, wartezeit, konfiguration)
+    pids = _pool.starten()
+    logger.info(
+        "Ephemeriden-Pool gestartet: %d Worker (PIDs %s), Warteschlange %d",
+        worker, pids, warteschlange,
+    )
+    return _pool
+
+
+def stop_pool() -> None:
+    """Beendet den globalen Pool (z.B. beim App-Shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+        logger.info("Ephemeriden-Pool beendet")
+
+
+def get_pool() -> EphemerisPool | None:
+    """Der laufende Pool oder None (dann wird direkt gerechnet)."""
+    return _pool
+
+
+def call(funktion, *args, timeout: float | None = None, **kwargs):
+    """
+    Führt eine (picklebare, modulweite) Funktion im Pool aus und wartet
+    auf das Ergebnis. Ohne Pool direkt im aufrufenden Prozess.
+
+    Nach `timeout` Sekunden gibt der Aufrufer auf. Eine laufende Aufgabe
+    lässt sich aber nicht abbrechen: hängt sie, belegt sie ihren Worker und
+    Pool-Platz weiter, bis sie endet (ggf. Worker per Neustart freigeben).
+
+    Raises:
+        PoolUeberlastet: Wenn die Warteschlange voll bleibt.
+        TimeoutError: Wenn das Ergebnis nicht innerhalb von `timeout` vorliegt.
+    """
+    if _pool is None:
+        return funktion(*args, **kwargs)
+    future = _pool.submit(funktion, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        if not future.cancel():
+            logger.warning(
+                "Ephemeriden-Pool: %s nach %.1fs ohne Ergebnis — Worker bleibt belegt",
+                getattr(funktion, "__name__", funktion), timeout,
+            )
+        raise TimeoutError(f"Keine Antwort des Ephemeriden-Pools nach {timeout:.1f}s")
+
+
+async def call_async(funktion, *args, **kwargs):
+    """
+    Wie call(), für async-Endpoints: blockiert den Event-Loop nicht.
+    Ohne Pool läuft die Funktion im Default-Thread-Pool.
+
+    Raises:
+        PoolUeberlastet: Sofort, wenn kein Platz in der Warteschlange frei ist.
+    """
+    if _pool is None:
+        return await asyncio.to_thread(funktion, *args, **kwargs)
+    return await asyncio.wrap_future(_pool.submit_nowait(funktion, *args, **kwargs))
@@ -0,0 +1,87 @@
+"""AstroMaster Backend — Persistenter Geocoding-Cache (Tabelle geocode_cache).
+
+Der LRU-Cache in geocoding.py lebt pro Prozess und ist nach jedem Deploy
+leer. Diese Tabelle hält alle online (Nominatim) aufgelösten Orte für alle
+Worker; beim Start werden die häufigsten Geburtsorte aus den Bestellungen
+in den LRU vorgeladen.
+"""
+
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models import Bestellung, GeocodeCache
+from app.modules.geocoding import vorladen
+
+logger = logging.getLogger(__name__)
+
+
+class DatenbankSpeicher:
+    """GeocodeSpeicher (geocoding.configure_geocoding) auf der Tabelle geocode_cache."""
+
+    def laden(self, schluessel: list[str]) -> dict[str, dict]:
+        db = SessionLocal()
+        try:
+            zeilen = db.scalars(select(GeocodeCache).where(GeocodeCache.schluessel.in_(schluessel)))
+            return {
+                z.schluessel: {
+                    "lat": z.lat,
+                    "lon": z.lon,
+                    "timezone": z.timezone,
+                    "ort_vollstaendig": z.ort_vollstaendig,
+                }
+                for z in zeilen
+            }
+        finally:
+            db.close()
+
+    def speichern(self, schluessel: str, ort: str, ergebnis: dict) -> None:
+        db = SessionLocal()
+        try:
+            db.add(GeocodeCache(
+                schluessel=schluessel,
+                ort=ort[:300],
+                lat=ergebnis["lat"],
+                lon=ergebnis["lon"],
+                timezone=ergebnis["timezone"],
+                ort_vollstaendig=ergebnis["ort_vollstaendig"][:500],
+            ))
+            db.commit()
+        except IntegrityError:
+            # Anderer Worker hat denselben Ort gleichzeitig gespeichert
+            db.rollback()
+        finally:
+            db.close()
+
+
+def haeufigste_geburtsorte(anzahl: int) -> list[tuple[str, int]]:
+    """Die `anzahl` häufigsten Geburtsorte aller Bestellungen: [(geburtsort, bestellungen)]."""
+    db = SessionLocal()
+    try:
+        return [
+            (ort, bestellungen)
+            for ort, bestellungen in db.execute(
+                select(Bestellung.geburtsort, func.count())
+                .group_by(Bestellung.geburtsort)
+                .order_by(func.count().desc())
+                .limit(anzahl)
+            )
+        ]
+    finally:
+        db.close()
+
+
+def geocode_cache_vorladen(anzahl: int) -> int:
+    """Lädt die häufigsten Geburtsorte in den LRU-Cache (beim App-Start)."""
+    if anzahl <= 0:
+        return 0
+    try:
+        orte = [ort for ort, _ in haeufigste_geburtsorte(anzahl)]
+    except Exception as e:
+        logger.warning("Geburtsorte nicht lesbar — kein Vorladen: %s", e)
+        return 0
+    geladen = vorladen(orte)
+    logger.info("Geocode-Cache: %d von %d häufigsten Geburtsorten vorgeladen", geladen, len(orte))
+    return geladen
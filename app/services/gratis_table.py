@@ -0,0 +1,173 @@
+"""AstroMaster Backend — Vorberechnete Gratis-Check-Antworten pro Datum.
+
+Ohne Geburtszeit und Geburtsort rechnet der Gratis-Check immer mit
+Berlin, 12:00 — die Antwort hängt dann nur vom Datum ab. Für alle
+~47.800 Daten 1900–2030 wird die komplette Antwort einmal vorberechnet
+und in 3 Bytes pro Datum gespeichert; der Request ist dann ein Array-Zugriff.
+
+Erzeugen (nach dem Ingress-Index, z.B. beim Docker-Build):
+    python -m app.services.gratis_table [pfad]
+
+Dateiformat: b"AMGT" | u32 version | 8 Bytes Konfig-Hash | u32 erster_tag
+             (date.toordinal) | u32 anzahl, danach 3 Bytes pro Datum:
+             Byte 0: tropische Sonne (hi 4 Bit) | siderische Sonne (lo 4 Bit)
+             Byte 1: tropischer Mond (hi 4 Bit) | siderischer Mond (lo 4 Bit)
+             Byte 2: Flags (FLAG_*)
+
+Der Konfig-Hash (config/ayanamsa.yaml + config/ophiuchus.yaml) hält fest,
+mit welchem Standard-Ayanamsa und welchen Ophiuchus-Grenzen die Tabelle
+gebaut wurde; passt er nicht mehr, rechnet der Gratis-Check live.
+"""
+
+import hashlib
+import logging
+import struct
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from app.modules.sidereal import CONFIG_PATH as AYANAMSA_PATH
+from app.modules.tropical import SIGN_MAP
+from app.modules.zodiac_index import OPHIUCHUS_PATH
+
+logger = logging.getLogger(__name__)
+
+TABLE_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "gratis_table.bin"
+
+ERSTES_DATUM = date(1900, 1, 1)
+LETZTES_DATUM = date(2030, 12, 31)
+
+# Deutsche Zeichennamen in Tierkreis-Reihenfolge (Index = 4-Bit-Code)
+ZEICHEN = tuple(SIGN_MAP.values())
+_ZEICHEN_CODE = {name: i for i, name in enumerate(ZEICHEN)}
+
+FLAG_OPHIUCHUS = 0x01
+FLAG_SONNE_GRENZFALL = 0x02
+FLAG_MOND_GRENZFALL = 0x04
+
+_MAGIC = b"AMGT"
+_VERSION = 3  # 2: Ophiuchus-Grenzen aus config/ophiuchus.yaml, 3: Konfig-Hash
+_HEADER = struct.Struct("<4sI8sII")
+_EINTRAG = 3
+
+
+def _konfig_hash() -> bytes:
+    """Fingerabdruck der Konfiguration, die in die Tabelle eingeht."""
+    h = hashlib.sha256()
+    for path in (AYANAMSA_PATH, OPHIUCHUS_PATH):
+        h.update(path.read_bytes())
+    return h.digest()[:8]
+
+
+def _encode(result: dict) -> bytes:
+    """Kodiert eine Gratis-Check-Antwort (ohne Uhrzeit) in 3 Bytes."""
+    sonne, mond = result["sonne"], result["mond"]
+    flags = 0
+    if result["ophiuchus"]:
+        flags |= FLAG_OPHIUCHUS
+    if sonne.get("grenzfall"):
+        flags |= FLAG_SONNE_GRENZFALL
+    if mond.get("grenzfall"):
+        flags |= FLAG_MOND_GRENZFALL
+    return bytes((
+        _ZEICHEN_CODE[sonne["tropisch"]] << 4 | _ZEICHEN_CODE[sonne["siderisch"]],
+        _ZEICHEN_CODE[mond["tropisch"]] << 4 | _ZEICHEN_CODE[mond["siderisch"]],
+        flags,
+    ))
+
+
+def _vergleich(tropisch: str, siderisch: str, grenzfall: bool) -> dict:
+    return {
+        "tropisch": tropisch,
+        "siderisch": siderisch,
+        "abweichung": tropisch != siderisch,
+        "grenzfall": grenzfall,
+    }
+
+
+def _decode(eintrag: bytes) -> dict:
+    """Baut die vollständige Gratis-Check-Antwort aus 3 Bytes."""
+    trop_sonne, sid_sonne = ZEICHEN[eintrag[0] >> 4], ZEICHEN[eintrag[0] & 0x0F]
+    trop_mond, sid_mond = ZEICHEN[eintrag[1] >> 4], ZEICHEN[eintrag[1] & 0x0F]
+    flags = eintrag[2]
+    return {
+        "tropisch": trop_sonne,
+        "siderisch": sid_sonne,
+        "abweichung": trop_sonne != sid_sonne,
+        "ophiuchus": bool(flags & FLAG_OPHIUCHUS),
+        "sonne": _vergleich(trop_sonne, sid_sonne, bool(flags & FLAG_SONNE_GRENZFALL)),
+        "mond": _vergleich(trop_mond, sid_mond, bool(flags & FLAG_MOND_GRENZFALL)),
+        "aszendent": None,
+        "hat_uhrzeit": False,
+    }
+
+
+def build_table(path: Path = TABLE_PATH) -> Path:
+    """Berechnet die Gratis-Check-Antwort für jedes Datum und speichert die Tabelle."""
+    from app.services.calculation import gratis_check  # Zyklus vermeiden
+
+    logging.getLogger("app.modules").setLevel(logging.WARNING)
+    anzahl = (LETZTES_DATUM - ERSTES_DATUM).days + 1
+    daten = bytearray()
+    for i in range(anzahl):
+        datum = ERSTES_DATUM + timedelta(days=i)
+        result = gratis_check(datum.strftime("%d.%m.%Y"), use_table=False)
+        daten += _encode(result)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, _konfig_hash(), ERSTES_DATUM.toordinal(), anzahl))
+        f.write(daten)
+
+    logger.info("Gratis-Tabelle gespeichert: %s (%d Daten)", path, anzahl)
+    return path
+
+
+class GratisTable:
+    """Komplett im Speicher gehaltene Antworttabelle (~140 KB)."""
+
+    def __init__(self, path: Path = TABLE_PATH):
+        raw = path.read_bytes()
+        magic, version, konfig, self._erster, self._anzahl = _HEADER.unpack_from(raw, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Ungültige Gratis-Tabelle: {path}")
+        if konfig != _konfig_hash():
+            raise ValueError(f"Gratis-Tabelle passt nicht zu config/ayanamsa.yaml / ophiuchus.yaml: {path}")
+        self._daten = raw[_HEADER.size:]
+
+    def lookup(self, geburtsdatum: str) -> dict | None:
+        """Antwort für DD.MM.YYYY oder None wenn das Datum nicht enthalten ist."""
+        tag, monat, jahr = (int(t) for t in geburtsdatum.split("."))
+        i = date(jahr, monat, tag).toordinal() - self._erster
+        if not 0 <= i < self._anzahl:
+            return None
+        return _decode(self._daten[i * _EINTRAG:(i + 1) * _EINTRAG])
+
+
+_table: GratisTable | None = None
+_geladen = False
+
+
+def get_table() -> GratisTable | None:
+    """Lädt die Tabelle einmalig; None wenn sie (noch) nicht erzeugt wurde."""
+    global _table, _geladen
+    if _geladen:
+        return _table
+
+    _geladen = True
+    if not TABLE_PATH.exists():
+        logger.warning("Gratis-Tabelle fehlt (%s) — Gratis-Check rechnet live", TABLE_PATH)
+        return None
+
+    try:
+        _table = GratisTable(TABLE_PATH)
+    except ValueError as e:
+        logger.warning("%s — bitte neu erzeugen; Gratis-Check rechnet live", e)
+        return None
+    logger.info("Gratis-Tabelle geladen: %s", TABLE_PATH)
+    return _table
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    build_table(Path(sys.argv[1]) if len(sys.argv) > 1 else TABLE_PATH)
@@ -0,0 +1,133 @@
+"""AstroMaster Backend — Ortssuche (Autocomplete) und kanonische Orts-IDs.
+
+Der Präfix-Index (ort_index.OrtIndex) wird beim Start aus dem
+Ortsverzeichnis (gewichtet nach Einwohnern) und den häufigsten
+Geburtsorten bisheriger Bestellungen aufgebaut:
+
+    geonames:<geonameid>      Ort aus dem Ortsverzeichnis
+    geocode:<cache_schluessel> online aufgelöster Ort (Tabelle geocode_cache)
+
+Wählt der Kunde einen Vorschlag, schickt das Formular dessen ID (oder
+direkt lat/lon) mit — Bestellung und Gratis-Check überspringen dann das
+Geocoding.
+"""
+
+import logging
+import time
+
+from app.modules.gazetteer import get_gazetteer
+from app.modules.geocoding import cache_schluessel, zeitzone_fuer
+from app.modules.ort_index import OrtIndex
+from app.services.geocode_cache import DatenbankSpeicher, haeufigste_geburtsorte
+
+logger = logging.getLogger(__name__)
+
+ID_GEONAMES = "geonames:"
+ID_GEOCODE = "geocode:"
+
+# Eine Bestellung zählt im Ranking wie so viele Einwohner
+_BESTELLUNG_GEWICHT = 1000.0
+
+_index: OrtIndex | None = None
+
+
+def build_ort_index(anzahl_bestellungen: int) -> OrtIndex:
+    """Baut den Präfix-Index aus Ortsverzeichnis und Bestellungen."""
+    index = OrtIndex()
+    gazetteer = get_gazetteer()
+    if gazetteer is not None:
+        for geonameid, name, einwohner, geo in gazetteer.alle_orte():
+            index.hinzufuegen(f"{ID_GEONAMES}{geonameid}", geo, einwohner, [name])
+
+    try:
+        bestellt = haeufigste_geburtsorte(anzahl_bestellungen) if anzahl_bestellungen > 0 else []
+    except Exception as e:
+        logger.warning("Geburtsorte nicht lesbar — Ortssuche nur aus dem Ortsverzeichnis: %s", e)
+        bestellt = []
+
+    online: dict[str, list[tuple[str, int]]] = {}
+    for ort, bestellungen in bestellt:
+        eingabe = ort.split(",", 1)[0]
+        treffer = gazetteer.suche_mit_id(ort) if gazetteer is not None else None
+        if treffer is not None:
+            geonameid, geo = treffer
+            index.hinzufuegen(f"{ID_GEONAMES}{geonameid}", geo, bestellungen * _BESTELLUNG_GEWICHT, [eingabe])
+        else:
+            online.setdefault(cache_schluessel(ort), []).append((eingabe, bestellungen))
+
+    if online:
+        try:
+            gespeichert = DatenbankSpeicher().laden(list(online))
+        except Exception as e:
+            logger.warning("Geocode-Cache nicht lesbar: %s", e)
+            gespeichert = {}
+        for schluessel, geo in gespeichert.items():
+            for eingabe, bestellungen in online[schluessel]:
+                index.hinzufuegen(f"{ID_GEOCODE}{schluessel}", geo, bestellungen * _BESTELLUNG_GEWICHT, [eingabe])
+
+    return index.fertig()
+
+
+def ort_index_laden(anzahl_bestellungen: int) -> OrtIndex:
+    """Baut den Index (beim App-Start) und ersetzt den bisherigen."""
+    global _index
+    start = time.perf_counter()
+    index = build_ort_index(anzahl_bestellungen)
+    _index = index
+    logger.info("Ortssuche: %d Orte indiziert (%.1fs)", len(index), time.perf_counter() - start)
+    return index
+
+
+def get_ort_index() -> OrtIndex | None:
+    """Der geladene Index oder None (Ortssuche nicht verfügbar)."""
+    return _index
+
+
+def ort_aufloesen(ort_id: str) -> dict:
+    """
+    Kanonische Orts-ID → dict mit lat, lon, timezone, ort_vollstaendig
+    (wie get_coordinates) — ohne Geocoding.
+
+    Raises:
+        ValueError: Unbekannte oder ungültige ID.
+    """
+    geo = _index.ort(ort_id) if _index is not None else None
+    if geo is None and ort_id.startswith(ID_GEONAMES):
+        gazetteer = get_gazetteer()
+        geonameid = ort_id[len(ID_GEONAMES):]
+        if gazetteer is not None and geonameid.isdigit():
+            geo = gazetteer.ort(int(geonameid))
+    elif geo is None and ort_id.startswith(ID_GEOCODE):
+        schluessel = ort_id[len(ID_GEOCODE):]
+        geo = DatenbankSpeicher().laden([schluessel]).get(schluessel)
+    if geo is None:
+        raise ValueError(f"Unbekannte Orts-ID: '{ort_id}'")
+    return geo
+
+
+def geo_aus_angaben(
+    geburtsort: str | None,
+    ort_id: str | None = None,
+    lat: float | None = None,
+    lon: float | None = None,
+    timezone: str | None = None,
+) -> dict | None:
+    """
+    Bereits aufgelöster Geburtsort aus den Formularangaben: lat/lon (Zeitzone
+    notfalls per timezonefinder) oder Orts-ID. None = Geburtsort geocoden.
+
+    Raises:
+        ValueError: Nur lat oder nur lon, unbekannte Orts-ID oder keine Zeitzone.
+    """
+    if (lat is None) != (lon is None):
+        raise ValueError("lat und lon nur zusammen angeben")
+    if lat is not None:
+        return {
+            "lat": round(lat, 4),
+            "lon": round(lon, 4),
+            "timezone": timezone or zeitzone_fuer(lat, lon),
+            "ort_vollstaendig": geburtsort or f"{lat:.4f}, {lon:.4f}",
+        }
+    if ort_id:
+        return ort_aufloesen(ort_id)
+    return None
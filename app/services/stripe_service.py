@@ -37,7 +37,8 @@ def extract_order_data(event: dict) -> dict | None:
     """
     Extrahiert Bestelldaten aus einem checkout.session.completed Event.
 
-    Erwartet metadata: name, email, geburtsdatum, geburtszeit, geburtsort, version
+    Erwartet metadata: name, email, geburtsdatum, geburtszeit, geburtsort, version, tierkreis
+    (optional: ort_id, lat, lon, timezone — bereits aufgelöster Ort)
     """
     if event.get("type") != "checkout.session.completed":
         return None
@@ -57,6 +58,11 @@ def extract_order_data(event: dict) -> dict | None:
         "geburtszeit": metadata["geburtszeit"],
         "geburtsort": metadata["geburtsort"],
         "version": metadata.get("version", "normal"),
+        "tierkreis": metadata.get("tierkreis", "siderisch"),
+        "ort_id": metadata.get("ort_id"),
+        "lat": float(metadata["lat"]) if metadata.get("lat") else None,
+        "lon": float(metadata["lon"]) if metadata.get("lon") else None,
+        "timezone": metadata.get("timezone"),
         "stripe_session_id": session.get("id"),
         "stripe_payment_id": session.get("payment_intent"),
         "preis": (session.get("amount_total", 0) / 100),
@@ -29,6 +29,14 @@ from app.modules.content_loader import load_content
 logger = logging.getLogger(__name__)
 
 
+def _gewaehlter_tierkreis(data: dict) -> tuple[dict, bool]:
+    """Positionen des gewählten Tierkreises: (siderisch bzw. IAU-Sternbilder, ist_sternbild)."""
+    sternbilder = data.get("konstellationen")
+    if sternbilder:
+        return sternbilder, True
+    return data.get("siderisch", {}), False
+
+
 def generate(data: dict, output_path: str | Path) -> Path:
     """
     Generiert die Normal-Version PDF.
@@ -166,7 +174,7 @@ def generate(data: dict, output_path: str | Path) -> Path:
     y -= 30
 
     tropisch = data.get("tropisch", {})
-    siderisch = data.get("siderisch", {})
+    siderisch, ist_sternbild = _gewaehlter_tierkreis(data)
 
     # Einleitungstext
     intro = (
@@ -190,7 +198,8 @@ def generate(data: dict, output_path: str | Path) -> Path:
     c.setFillColor(TEXT_SECONDARY)
     c.drawString(col1_x + 10, y - 20, "")
     c.drawString(col2_x + 10, y - 20, "TROPISCH (westlich)")
-    c.drawString(col3_x + 10, y - 20, "SIDERISCH (astronomisch)")
+    c.drawString(col3_x + 10, y - 20,
+                 "STERNBILD (IAU)" if ist_sternbild else "SIDERISCH (astronomisch)")
     y -= 35
 
     # Zeilen: Sonne, Mond, Aszendent
@@ -327,7 +336,9 @@ def generate(data: dict, output_path: str | Path) -> Path:
     y = draw_info_card(c, y, "1-9", "Lebenszahl (Numerologie)", lz_text)
 
     # Siderisches Sonnenzeichen
-    y = draw_info_card(c, y, "SZ", "Siderisches Sonnenzeichen", sid_sonne)
+    y = draw_info_card(c, y, "SZ",
+                       "Sonnen-Sternbild" if ist_sternbild else "Siderisches Sonnenzeichen",
+                       sid_sonne)
 
     # Element
     y = draw_info_card(c, y, "~", "Dein Element", element)
@@ -531,8 +542,8 @@ def _build_analysen(data: dict) -> list[tuple[str, str]]:
         content["text"],
     ))
 
-    # 2. Siderisches Sonnenzeichen
-    siderisch = data.get("siderisch", {})
+    # 2. Siderisches Sonnenzeichen (bzw. Sternbild)
+    siderisch, _ = _gewaehlter_tierkreis(data)
     zeichen = siderisch.get("sonne", {}).get("zeichen", "")
     if zeichen:
         zeichen_key = (
@@ -601,7 +612,7 @@ def _build_analysen(data: dict) -> list[tuple[str, str]]:
 def _build_synthese(data: dict) -> str:
     """Baut den Synthese-Text aus allen Ergebnissen."""
     numerologie = data.get("numerologie", {})
-    siderisch = data.get("siderisch", {})
+    siderisch, ist_sternbild = _gewaehlter_tierkreis(data)
     element_data = data.get("element", {})
     dekan = data.get("dekan", {})
     hd = data.get("human_design", {})
@@ -618,7 +629,8 @@ def _build_synthese(data: dict) -> str:
         meister = f" — eine Meisterzahl, die auf besonderes Potenzial hinweist"
 
     synthese = (
-        f"Mit der Lebenszahl {lz}{meister}, dem siderischen Sonnenzeichen {zeichen} "
+        f"Mit der Lebenszahl {lz}{meister}, "
+        f"{'dem Sonnen-Sternbild' if ist_sternbild else 'dem siderischen Sonnenzeichen'} {zeichen} "
         f"im Element {element}, unter dem Schutz von {gott} und als {hd_typ} im Human Design "
         f"trägst du eine einzigartige kosmische Signatur. "
         f"\n\n"